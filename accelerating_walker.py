@@ -1,12 +1,15 @@
-from walker import Walker
+from walker import Walker, MoveArrays
 from math_functions import MathFunctions
 from custom_types import *
+import numpy as np
 import math
 from typing import Tuple, Callable, Dict
 
 
 class AcceleratingWalker(Walker):
 
+    __slots__ = ["__acceleration_type"]
+
     __ACCELERATION_SCALE = 0.1
     ACCELERATION_TYPES: Dict[str, Callable[[float], float]] = {
         "Linear": lambda x: AcceleratingWalker.__ACCELERATION_SCALE * x,
@@ -29,7 +32,7 @@ class AcceleratingWalker(Walker):
         super().__init__(name, mass)
 
         self._is_3d = is_3d
-        self.__step = 0
+        self._step = 0
         # updating acceleration type
         if acceleration_type in AcceleratingWalker.ACCELERATION_TYPES:
             self.__acceleration_type = acceleration_type
@@ -43,8 +46,8 @@ class AcceleratingWalker(Walker):
         Returns:
             float: The move radius for the current step.
         """
-        self.__step = self.__step + 1
-        return self.ACCELERATION_TYPES[self.__acceleration_type](self.__step)
+        self._step = self._step + 1
+        return self.ACCELERATION_TYPES[self.__acceleration_type](self._step)
 
     def _generate_move_angle(self) -> Tuple[float, float]:
         """
@@ -56,17 +59,40 @@ class AcceleratingWalker(Walker):
         """
         result = None
         if self._is_3d:
-            result = (MathFunctions.random_angle(), MathFunctions.random_angle())
+            result = (MathFunctions.random_angle(self._rng), MathFunctions.random_angle(self._rng))
         else:
-            result = (MathFunctions.random_angle(), 0.0)
+            result = (MathFunctions.random_angle(self._rng), 0.0)
 
         return result
 
+
+    def _generate_moves(self, steps: int, batch: int) -> MoveArrays:
+        """
+        Generates a block of moves in a single draw, every column of a step has the same radius.
+
+        Args:
+            steps (int): The amount of steps.
+            batch (int): The amount of moves in each step.
+
+        Returns:
+            MoveArrays: The (steps, batch) yaw, radius and pitch arrays.
+        """
+        yaw = MathFunctions.random_angles((steps, batch), self._rng)
+        pitch = np.zeros((steps, batch))
+        if self._is_3d:
+            pitch = MathFunctions.random_angles((steps, batch), self._rng)
+        acceleration = self.ACCELERATION_TYPES[self.__acceleration_type]
+        radius = np.array(
+            [acceleration(step) for step in range(self._step + 1, self._step + steps + 1)]
+        )
+        self._step += steps
+        return yaw, np.repeat(radius[:, np.newaxis], batch, axis=1), pitch
+
     def reset(self) -> None:
         """
         Resets the state of the walker and sets the step count to 0.
         """
-        self.__step = 0
+        self._step = 0
         super().reset()
 
     def get_acceleration_type(self) -> str:
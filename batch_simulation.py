@@ -0,0 +1,402 @@
+from grid import Grid
+from obstacle_store import ObstacleStore
+from walker import Walker
+from move import Move
+from math_functions import MathFunctions
+from running_stats import RunningStats
+from random_streams import RandomStreams
+from profiler import Profiler
+from repetition_sums import RepetitionSums
+from custom_types import *
+import numpy as np
+import copy
+from threading import Event
+from typing import List, Dict, Callable, Optional
+
+
+class BatchSimulation:
+
+    __LEAVE_DISTANCE = 10
+    __EPSILON = 0.0001
+    # the amount of steps whose moves are drawn together, the same blocks as Walker.get_move
+    __MOVE_BLOCK = Walker.MOVE_BLOCK
+    # the per step metrics, averaged over the repetitions in the log and streamed into statistics
+    STATISTICS_KEYS = [
+        "distance",
+        "xdistance",
+        "ydistance",
+        "zdistance",
+        "cmdistance",
+        "y_cross_count_list",
+    ]
+
+    def __init__(
+        self,
+        grid: Grid,
+        simulation_count: int = 10,
+        max_steps: int = 10,
+        random_streams: Optional[RandomStreams] = None,
+        first_repetition: int = 0,
+        streaming_statistics: bool = True,
+    ) -> None:
+        """Initializes a BatchSimulation object.
+
+        The batch simulation keeps the position of every repetition of every walker
+        in one (walkers, simulation_count, 3) array and advances all of them together,
+        one step per iteration.
+
+        Args:
+            grid (Grid): A Grid object.
+            simulation_count (int, optional): The amount of repetitions. Defaults to 10.
+            max_steps (int, optional): The amount of steps in each repetition. Defaults to 10.
+            random_streams (Optional[RandomStreams], optional): The random streams of the walkers, unseeded if not provided. Defaults to None.
+            first_repetition (int, optional): The index of the first repetition, for runs that are a slice of a larger run. Defaults to 0.
+            streaming_statistics (bool, optional): Stream the values of every repetition into statistics, they are
+                gathered a block of steps at a time. Defaults to True.
+        """
+        self.__grid = grid
+        self.__simulation_count = simulation_count
+        self.__max_steps = max_steps
+        self.__statistics: List[Dict[str, RunningStats]] = []
+        self.__repetition_sums = RepetitionSums(
+            first_repetition, simulation_count, max_steps, (0, len(self.STATISTICS_KEYS))
+        )
+        self.__time_to_leave = np.zeros((0, simulation_count), np.int64)
+        self.__random_streams = random_streams or RandomStreams()
+        self.__first_repetition = first_repetition
+        self.__streaming_statistics = streaming_statistics
+
+    def get_statistics(self) -> List[Dict[str, RunningStats]]:
+        """Gets the streaming statistics of the last run.
+
+        Returns:
+            List[Dict[str, RunningStats]]: The statistics of each metric in STATISTICS_KEYS for each walker,
+            empty if the statistics are off.
+        """
+        return self.__statistics
+
+    def get_repetition_sums(self) -> RepetitionSums:
+        """Gets the per step metrics of the last run summed over the repetitions, so runs over
+        slices of the repetitions are merged before they are averaged.
+
+        Returns:
+            RepetitionSums: The (steps, walkers, STATISTICS_KEYS) sums.
+        """
+        return self.__repetition_sums
+
+    def get_time_to_leave(self) -> np.ndarray:
+        """Gets the time to leave of every repetition of the last run.
+
+        Returns:
+            np.ndarray: The (walkers, simulation_count) steps, -1 for the repetitions that didn't leave.
+        """
+        return self.__time_to_leave
+
+    @staticmethod
+    def log_data(
+        sums: np.ndarray, time_to_leave: np.ndarray, count: int
+    ) -> List[Dict[str, List[float]]]:
+        """Averages the per step sums into the log data.
+
+        Args:
+            sums (np.ndarray): The (steps, walkers, STATISTICS_KEYS) sums over the repetitions.
+            time_to_leave (np.ndarray): The (walkers, repetitions) time to leave.
+            count (int): The amount of repetitions.
+
+        Returns:
+            List[Dict[str, List[float]]]: The log data of each walker, with the same keys
+            Simulation._save_log_data writes.
+        """
+        means = sums / max(count, 1)
+        return [
+            {
+                **{
+                    key: means[:, walker_index, key_index].tolist()
+                    for key_index, key in enumerate(BatchSimulation.STATISTICS_KEYS)
+                },
+                "time_to_leave": time_to_leave[walker_index].astype(float).tolist(),
+            }
+            for walker_index in range(len(time_to_leave))
+        ]
+
+    def has_streaming_statistics(self) -> bool:
+        """Gets if the runs stream their values into statistics.
+
+        Returns:
+            bool: Are the statistics streamed.
+        """
+        return self.__streaming_statistics
+
+    def _add_statistics(self, block_values: np.ndarray, first_step: int) -> None:
+        """Streams a block of steps into the statistics.
+
+        Args:
+            block_values (np.ndarray): The (walkers, STATISTICS_KEYS, simulation_count, steps) values.
+            first_step (int): The step of the first value.
+        """
+        for walker_values, statistics in zip(block_values, self.__statistics):
+            for key, values in zip(self.STATISTICS_KEYS, walker_values):
+                statistics[key].add(values, first_step, self.__first_repetition)
+
+    def get_simulation_count(self) -> int:
+        """Get the simulation count.
+
+        Returns:
+            int: The simulation count.
+        """
+        return self.__simulation_count
+
+    def get_max_steps(self) -> int:
+        """Gets the max steps.
+
+        Returns:
+            int: The max steps.
+        """
+        return self.__max_steps
+
+    def _step_walker(
+        self,
+        copies: List[Walker],
+        positions: np.ndarray,
+        planned_moves: Optional[np.ndarray] = None,
+        profiler: Optional[Profiler] = None,
+    ) -> np.ndarray:
+        """Moves every repetition of a single walker by one step.
+
+        Args:
+            copies (List[Walker]): The walker copy of each repetition.
+            positions (np.ndarray): The (simulation_count, 3) positions before the step.
+            planned_moves (Optional[np.ndarray], optional): The (simulation_count, 3) yaw, radius and pitch
+                of the step, drawn ahead of time. Defaults to None, which asks every copy for its move.
+            profiler (Optional[Profiler], optional): Times the move generation and
+                collision phases, not timed if not provided. Defaults to None.
+
+        Returns:
+            np.ndarray: The (simulation_count, 3) positions after the step.
+        """
+        overrides_move = type(copies[0]).move is not Walker.move
+        moves: List[Move] = []
+        final: np.ndarray
+
+        started = profiler.start() if profiler is not None else 0.0
+        if planned_moves is not None:
+            final = positions + MathFunctions.vectors_from_angles_and_radii(
+                planned_moves[:, 0], planned_moves[:, 1], planned_moves[:, 2]
+            )
+        else:
+            final = np.empty_like(positions)
+            for index, walker_copy in enumerate(copies):
+                walker_copy.move_to(positions[index])
+                move = walker_copy.get_move()
+                moves.append(move)
+                if overrides_move:
+                    # the walker decides where the move takes it (resets etc.)
+                    walker_copy.move(move)
+                    final[index] = walker_copy.get_location()
+                else:
+                    final[index] = MathFunctions.vector_from_angle_and_radius(
+                        *move.angle_and_radius()
+                    )
+            if not overrides_move:
+                final += positions
+        if profiler is not None:
+            profiler.stop("move_generation", started)
+
+        started = profiler.start() if profiler is not None else 0.0
+        store = self.__grid.get_obstacle_store()
+        if len(store):
+            hits = store.first_hits(positions, final)
+            hit_rows = hits != ObstacleStore.NO_HIT
+            if profiler is not None:
+                profiler.count("collisions", int(np.count_nonzero(hit_rows)))
+            kinds = np.where(hit_rows, store.get_kinds()[hits], ObstacleStore.NO_HIT)
+            # obstacles stop the move and teleporters send the walker to their target
+            blocked = kinds == ObstacleStore.OBSTACLE
+            final[blocked] = positions[blocked]
+            teleported = kinds == ObstacleStore.TELEPORTER
+            final[teleported] = store.get_targets()[hits[teleported]]
+            # speed zones restart the move, so they go through the grid
+            for row in np.flatnonzero(kinds == ObstacleStore.SPEED_ZONE):
+                walker_copy = copies[row]
+                walker_copy.move_to(positions[row])
+                if planned_moves is not None:
+                    move = Move(*planned_moves[row])
+                else:
+                    move = moves[row]
+                self.__grid.move(walker_copy, move, [])
+                final[row] = walker_copy.get_location()
+        if profiler is not None:
+            profiler.stop("collision", started)
+
+        return final
+
+    def run(
+        self,
+        walker_list: List[Walker],
+        stop_event: Optional[Event] = None,
+        progress: Optional[Callable[[float], None]] = None,
+        profiler: Optional[Profiler] = None,
+    ) -> List[Dict[str, List[float]]]:
+        """Runs all the repetitions of all the walkers together.
+
+        Args:
+            walker_list (List[Walker]): The walkers to simulate.
+            stop_event (Optional[Event], optional): Stops the run when set. Defaults to None.
+            progress (Optional[Callable[[float], None]], optional): Called with the progress fraction. Defaults to None.
+            profiler (Optional[Profiler], optional): Times the move generation, collision,
+                gravity and metrics phases of every step, the steps counter counts the steps of every
+                repetition of every walker. Not timed if not provided. Defaults to None.
+
+        Returns:
+            List[Dict[str, List[float]]]: The log data of each walker, in the order of walker_list,
+            with the same keys Simulation._save_log_data writes.
+        """
+        walker_count = len(walker_list)
+        count = self.__simulation_count
+        steps = self.__max_steps
+
+        # a copy of each walker for each repetition, so walker state is not shared
+        copies: List[List[Walker]] = []
+        positions = np.zeros((walker_count, count, 3), np.float64)
+        for walker_index, walker in enumerate(walker_list):
+            walker_copies = [copy.deepcopy(walker) for _ in range(count)]
+            generators = self.__random_streams.generators(
+                walker_index, self.__first_repetition, count
+            )
+            for simulation, walker_copy in enumerate(walker_copies):
+                # every repetition draws from its own stream
+                walker_copy.set_rng(generators[simulation])
+                walker_copy.reset()
+                positions[walker_index, simulation] = walker_copy.get_location()
+            copies.append(walker_copies)
+
+        # walkers whose moves don't depend on their location draw them in blocks
+        planned = [
+            walker.is_vectorizable() and type(walker).move is Walker.move
+            for walker in walker_list
+        ]
+        planned_moves: List[Optional[np.ndarray]] = [None] * walker_count
+
+        masses = np.array([walker.get_mass() for walker in walker_list], np.float64)
+        gravity_solver = self.__grid.get_gravity_solver()
+        is_3d = np.array([walker.is_3d() for walker in walker_list])
+
+        # initializes the data arrays, the per step metrics are summed over the repetitions
+        self.__repetition_sums = RepetitionSums(
+            self.__first_repetition,
+            count,
+            steps,
+            (walker_count, len(self.STATISTICS_KEYS)),
+        )
+        time_to_leave = np.full((walker_count, count), -1, np.int64)
+        cross_count = np.zeros((walker_count, count), np.int64)
+        sign = np.zeros((walker_count, count), np.int64)
+        self.__statistics = [
+            {key: RunningStats(steps) for key in self.STATISTICS_KEYS}
+            for _ in walker_list
+            if self.__streaming_statistics
+        ]
+        # the values of the steps that are not streamed into the statistics yet
+        block_values = np.zeros(
+            (walker_count, len(self.STATISTICS_KEYS), count, self.__MOVE_BLOCK)
+            if self.__streaming_statistics
+            else 0
+        )
+        block_start = 0
+        step_count = 0
+
+        for step in range(steps):
+            if stop_event is not None and stop_event.is_set():
+                break
+            if progress is not None:
+                progress(float(step) / steps)
+
+            started = profiler.start() if profiler is not None else 0.0
+            block_step = step % self.__MOVE_BLOCK
+            if block_step == 0:
+                for walker_index, is_planned in enumerate(planned):
+                    if not is_planned:
+                        continue
+                    # each copy draws from its own stream, (block, count, 3), always a
+                    # whole block so the streams are consumed like get_move does
+                    planned_moves[walker_index] = np.stack(
+                        [
+                            np.concatenate(
+                                walker_copy.get_moves(self.__MOVE_BLOCK), axis=1
+                            )
+                            for walker_copy in copies[walker_index]
+                        ],
+                        axis=1,
+                    )
+            if profiler is not None:
+                profiler.stop("move_generation", started)
+            for walker_index in range(walker_count):
+                walker_moves = planned_moves[walker_index]
+                positions[walker_index] = self._step_walker(
+                    copies[walker_index],
+                    positions[walker_index],
+                    None if walker_moves is None else walker_moves[block_step],
+                    profiler,
+                )
+            # the gravity of all the walkers is solved once per step
+            started = profiler.start() if profiler is not None else 0.0
+            positions += gravity_solver.compute(positions, masses)
+            if profiler is not None:
+                profiler.stop("gravity", started)
+
+            started = profiler.start() if profiler is not None else 0.0
+            # the 3d walkers only track their distance on the xy plane
+            distances = np.where(
+                is_3d[:, np.newaxis],
+                np.linalg.norm(positions[..., :2], axis=-1),
+                np.linalg.norm(positions, axis=-1),
+            )
+            center_mass = positions.mean(axis=0)
+            # tracking y axis crosses
+            y_values = positions[..., 1]
+            above = y_values - self.__EPSILON > 0
+            below = y_values + self.__EPSILON < 0
+            cross_count += (above & (sign == -1)) | (below & (sign == 1))
+            sign[above] = 1
+            sign[below] = -1
+            # tracking time to leave
+            left = (time_to_leave == -1) & (distances > self.__LEAVE_DISTANCE)
+            time_to_leave[left] = step + 1
+            # tracking distances
+            absolute = np.abs(positions)
+            center_mass_distances = np.linalg.norm(positions - center_mass, axis=-1)
+            # the metrics of every repetition, (walkers, STATISTICS_KEYS, count)
+            step_values = np.stack(
+                [
+                    distances,
+                    absolute[..., 0],
+                    absolute[..., 1],
+                    absolute[..., 2],
+                    center_mass_distances,
+                    cross_count,
+                ],
+                axis=1,
+            )
+            self.__repetition_sums.add_step(step, step_values)
+            step_count = step + 1
+            # every repetition is a sample of the step, streamed a block at a time
+            if self.__statistics:
+                block_values[..., step - block_start] = step_values
+                if step_count - block_start == self.__MOVE_BLOCK:
+                    self._add_statistics(block_values, block_start)
+                    block_start = step_count
+            if profiler is not None:
+                profiler.stop("metrics", started)
+                profiler.count("steps", walker_count * count)
+
+        if self.__statistics and step_count > block_start:
+            started = profiler.start() if profiler is not None else 0.0
+            self._add_statistics(block_values[..., : step_count - block_start], block_start)
+            if profiler is not None:
+                profiler.stop("metrics", started)
+
+        if progress is not None:
+            progress(1.0)
+
+        self.__time_to_leave = time_to_leave
+        return self.log_data(self.__repetition_sums.total(), time_to_leave, count)
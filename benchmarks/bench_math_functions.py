@@ -0,0 +1,157 @@
+"""Micro-benchmark of the per-step vector math, the NumPy versions against the scalar ones.
+
+Run from the repository root:
+    python benchmarks/bench_math_functions.py [--number N]
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from math_functions import MathFunctions
+from obstacle import Obstacle
+from move import Move
+from custom_types import *
+import argparse
+import math
+import timeit
+import numpy as np
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+START = (1.0, 2.0, 3.0)
+END = (1.5, 2.5, 2.0)
+OBSTACLE = Obstacle((2.0, 2.0, 2.0), 0.5)
+MOVE = Move(0.3, 1.0, 0.2)
+
+
+def numpy_dist(vec1: Types.vector3, vec2: Types.vector3) -> float:
+    """The NumPy version of MathFunctions.dist."""
+    return float(np.linalg.norm(np.subtract(vec2, vec1)))
+
+
+def numpy_normalize(vec: Types.vector3) -> Types.vector3:
+    """The NumPy version of MathFunctions.normalize, with the norm computed twice."""
+    if len(vec) == 0 or np.linalg.norm(vec) == 0:
+        return vec
+    return Types.cast_to_vector3(np.array(vec) / np.linalg.norm(vec))
+
+
+def numpy_angle_and_radius_from_vector(vec: Types.vector3) -> Types.vector3:
+    """The NumPy version of MathFunctions.angle_and_radius_from_vector."""
+    radius = float(np.linalg.norm(vec))
+    if radius == 0:
+        return (0, 0, 0)
+    return (math.atan2(vec[1], vec[0]), radius, math.asin(vec[2] / radius))
+
+
+def numpy_add_move(location: Types.vector3, move: Move) -> Types.vector3:
+    """The NumPy version of MathFunctions.add_move."""
+    move_vector = MathFunctions.vector_from_angle_and_radius(*move.angle_and_radius())
+    return Types.cast_to_vector3(np.add(location, move_vector))
+
+
+def numpy_detect_colision(
+    location: Types.vector3,
+    radius: float,
+    starting_location: Types.vector3,
+    final_location: Types.vector3,
+) -> bool:
+    """The NumPy version of Obstacle.detect_colision."""
+    movement = np.subtract(final_location, starting_location)
+    obstacle_to_start = np.subtract(starting_location, location)
+    if np.linalg.norm(obstacle_to_start) < radius:
+        return True
+    coef_a = np.dot(movement, movement)
+    coef_b = 2 * np.dot(obstacle_to_start, movement)
+    coef_c = np.dot(obstacle_to_start, obstacle_to_start) - radius**2
+    discriminant = coef_b**2 - 4 * coef_a * coef_c
+    if discriminant < 0:
+        return False
+    elif coef_a > 0:
+        discriminant = np.sqrt(discriminant)
+        solution_1 = (-coef_b - discriminant) / (2 * coef_a)
+        solution_2 = (-coef_b + discriminant) / (2 * coef_a)
+        return bool(
+            0 <= solution_1 <= 1
+            or 0 <= solution_2 <= 1
+            or (solution_1 < 0 and solution_2 > 1)
+        )
+    return False
+
+
+# name -> (NumPy version, scalar version), the calls Grid, Obstacle and Simulation make every step
+CASES: Dict[str, Tuple[Callable[[], object], Callable[[], object]]] = {
+    "dist (Grid.find_closest)": (
+        lambda: numpy_dist(START, END),
+        lambda: MathFunctions.dist(START, END),
+    ),
+    "normalize": (
+        lambda: numpy_normalize(START),
+        lambda: MathFunctions.normalize(START),
+    ),
+    "angle_and_radius_from_vector (gravity)": (
+        lambda: numpy_angle_and_radius_from_vector(START),
+        lambda: MathFunctions.angle_and_radius_from_vector(START),
+    ),
+    "add_move": (
+        lambda: numpy_add_move(START, MOVE),
+        lambda: MathFunctions.add_move(START, MOVE),
+    ),
+    "detect_colision (Obstacle)": (
+        lambda: numpy_detect_colision(
+            OBSTACLE.get_location(), OBSTACLE.get_radius(), START, END
+        ),
+        lambda: OBSTACLE.detect_colision(START, END),
+    ),
+    "distance (Simulation.simulate)": (
+        lambda: float(np.linalg.norm(START)),
+        lambda: MathFunctions.norm(START),
+    ),
+}
+
+
+def run(number: int) -> List[Tuple[str, float, float]]:
+    """
+    Times every case.
+
+    Args:
+        number (int): The amount of calls per timing.
+
+    Returns:
+        List[Tuple[str, float, float]]: The name, NumPy and scalar time per call in microseconds.
+    """
+    results = []
+    for name, (numpy_version, scalar_version) in CASES.items():
+        # the best of a few repeats is the least noisy
+        numpy_time = min(timeit.repeat(numpy_version, number=number, repeat=5))
+        scalar_time = min(timeit.repeat(scalar_version, number=number, repeat=5))
+        results.append((name, numpy_time / number * 1e6, scalar_time / number * 1e6))
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Runs the benchmark and prints the results.
+
+    Args:
+        argv (Optional[List[str]], optional): The command line arguments. Defaults to None.
+
+    Returns:
+        int: The exit code.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=20000, help="calls per timing")
+    args = parser.parse_args(argv)
+
+    print(f"{'function':42} {'numpy us':>10} {'scalar us':>10} {'speedup':>8}")
+    for name, numpy_time, scalar_time in run(args.number):
+        print(
+            f"{name:42} {numpy_time:10.3f} {scalar_time:10.3f} {numpy_time / scalar_time:7.1f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
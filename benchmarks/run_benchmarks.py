@@ -0,0 +1,602 @@
+"""Benchmark suite of the simulation hot paths, across scene sizes and walker counts.
+
+Every case is timed, the results are written as JSON and compared against a
+stored baseline, a case slower than the baseline by more than the threshold is
+reported as a regression and makes the exit code 1.
+
+The comparison tolerates the noise of the machine: every run also times a fixed
+calibration workload and the baseline is scaled by how much faster or slower
+the machine is now, a case is only flagged past its own spread between
+timings on top of the threshold, and a flagged case is timed again so only a
+slowdown that stays is a regression.
+
+Run from the repository root:
+    python benchmarks/run_benchmarks.py [--quick] [--filter NAME] [--update-baseline]
+
+The baseline holds timings of a single machine, a baseline made with another
+machine, Python or NumPy is not compared against, it should be updated with
+--update-baseline when the suite is first run on another machine.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from grid import Grid
+from obstacle import Obstacle
+from math_functions import MathFunctions
+from random_walker import RandomWalker
+from walker import Walker
+from walker_population import WalkerPopulation
+from simulation import Simulation
+from simulation_barrier import SimulationBarrier
+from population_state import PopulationState
+from null_screen import NullScreen
+from null_progress import NullProgress
+from custom_types import *
+import argparse
+import itertools
+import json
+import platform
+import random
+import shutil
+import tempfile
+import threading
+import time
+import timeit
+import numpy as np
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+BENCHMARKS_FOLDER = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(BENCHMARKS_FOLDER, "baseline.json")
+RESULTS_PATH = os.path.join(BENCHMARKS_FOLDER, "results", "latest.json")
+# a case is a regression when it is this much slower than the baseline,
+# on top of the spread between its timings
+THRESHOLD = 0.25
+# the details of the machine that must match for the baseline to be compared
+MACHINE_KEYS = ["python", "numpy", "machine", "platform"]
+# the times a case that looks slower than the baseline is timed again
+RETRIES = 2
+# the obstacles are scattered inside a cube of this half size around the origin
+SCENE_SIZE = 20.0
+# the moves a grid_move case cycles through, so a timing does not depend on its length
+MOVE_CYCLE = 64
+
+# a case builds its scene and returns the call to time, and a cleanup
+Case = Callable[[], Tuple[Callable[[], object], Callable[[], None]]]
+
+
+def make_obstacles(count: int, seed: int = 0) -> List[Obstacle]:
+    """
+    Scatters obstacles around the origin, leaving the starting point free.
+
+    Args:
+        count (int): The amount of obstacles.
+        seed (int, optional): The seed of the scene. Defaults to 0.
+
+    Returns:
+        List[Obstacle]: The obstacles.
+    """
+    rng = random.Random(seed)
+    obstacles: List[Obstacle] = []
+    while len(obstacles) < count:
+        location = (
+            rng.uniform(-SCENE_SIZE, SCENE_SIZE),
+            rng.uniform(-SCENE_SIZE, SCENE_SIZE),
+            rng.uniform(-SCENE_SIZE, SCENE_SIZE),
+        )
+        radius = rng.uniform(0.2, 1.0)
+        if MathFunctions.norm(location) > radius + 1:
+            obstacles.append(Obstacle(location, radius))
+    return obstacles
+
+
+def make_walkers(count: int, is_3d: bool = True, seed: int = 0) -> List[Walker]:
+    """
+    Creates seeded random walkers scattered around the origin.
+
+    Args:
+        count (int): The amount of walkers.
+        is_3d (bool, optional): Whether the walkers move in 3D. Defaults to True.
+        seed (int, optional): The seed of the walkers. Defaults to 0.
+
+    Returns:
+        List[Walker]: The walkers.
+    """
+    rng = np.random.default_rng(seed)
+    walkers: List[Walker] = []
+    for index in range(count):
+        walker = RandomWalker(f"walker{index}", is_3d)
+        walker.set_rng(np.random.default_rng(rng.integers(2**32)))
+        # spreading the walkers so the gravity is not dominated by a single point
+        walker.move_to(Types.cast_to_vector3(rng.uniform(-5, 5, 3)))
+        walkers.append(walker)
+    return walkers
+
+
+def grid_move_case(obstacle_count: int, walker_count: int) -> Case:
+    """Grid.move of one walker through a scene, with the gravity of the population."""
+
+    def build() -> Tuple[Callable[[], object], Callable[[], None]]:
+        grid = Grid()
+        grid.set_obstacles(make_obstacles(obstacle_count))
+        walkers = make_walkers(walker_count)
+        population = WalkerPopulation(walkers)
+        walker = walkers[0]
+        # the same starts and moves every cycle, however many calls a timing makes
+        rng = np.random.default_rng(0)
+        steps = itertools.cycle(
+            list(
+                zip(
+                    rng.uniform(-SCENE_SIZE / 2, SCENE_SIZE / 2, (MOVE_CYCLE, 3)),
+                    [walker.get_move() for _ in range(MOVE_CYCLE)],
+                )
+            )
+        )
+
+        def call() -> None:
+            start, move = next(steps)
+            walker.move_to(start)
+            grid.move(walker, move, population)
+
+        return call, lambda: None
+
+    return build
+
+
+def detect_colision_case(obstacle_count: int) -> Case:
+    """Obstacle.detect_colision of one movement against every obstacle of a scene."""
+
+    def build() -> Tuple[Callable[[], object], Callable[[], None]]:
+        obstacles = make_obstacles(obstacle_count)
+        start = (0.0, 0.0, 0.0)
+        end = (1.0, 0.5, 0.25)
+
+        def call() -> None:
+            for obstacle in obstacles:
+                obstacle.detect_colision(start, end)
+
+        return call, lambda: None
+
+    return build
+
+
+def gravity_effect_case(walker_count: int, container: str) -> Case:
+    """Grid.get_gravity_effect on one walker, from a plain list or a WalkerPopulation."""
+
+    def build() -> Tuple[Callable[[], object], Callable[[], None]]:
+        grid = Grid()
+        walkers = make_walkers(walker_count)
+        walker_list: Sequence[Walker] = walkers
+        if container == "population":
+            walker_list = WalkerPopulation(walkers)
+        walker = walkers[0]
+        return lambda: grid.get_gravity_effect(walker, walker_list), lambda: None
+
+    return build
+
+
+def simulate_case(walker_count: int, simulation_count: int, max_steps: int) -> Case:
+    """Simulation.simulate end to end, a thread per walker like a visual run, without a screen."""
+
+    def build() -> Tuple[Callable[[], object], Callable[[], None]]:
+        logs_folder = tempfile.mkdtemp(prefix="walker-benchmark-")
+        grid = Grid()
+        grid.set_obstacles(make_obstacles(10))
+        simulation = Simulation(grid, NullScreen(), simulation_count, max_steps)
+        simulation.set_logs_folder(f"{logs_folder}/")
+        simulation.set_seed(0)
+
+        def call() -> None:
+            walkers = make_walkers(walker_count, is_3d=False)
+            population = WalkerPopulation(walkers)
+            stop_event = threading.Event()
+            population_state = PopulationState(walkers, max_steps)
+            barrier = SimulationBarrier(
+                walker_count, stop_event, population_state.finish_repetition
+            )
+            threads = [
+                threading.Thread(
+                    target=simulation.simulate,
+                    args=[
+                        walker,
+                        stop_event,
+                        barrier,
+                        population_state,
+                        NullProgress(),
+                        population,
+                    ],
+                )
+                for walker in walkers
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        return call, lambda: shutil.rmtree(logs_folder, ignore_errors=True)
+
+    return build
+
+
+def distance_graph_case(steps: int) -> Case:
+    """graph.distance_graph of a log with the given amount of steps."""
+
+    def build() -> Tuple[Callable[[], object], Callable[[], None]]:
+        import graph
+
+        folder = tempfile.mkdtemp(prefix="walker-benchmark-")
+        log_path = os.path.join(folder, "walker.json")
+        rng = np.random.default_rng(0)
+        with open(log_path, "w") as f:
+            json.dump({"distance": np.cumsum(rng.random(steps)).tolist()}, f)
+        output_path = os.path.join(folder, "walker")
+        return (
+            lambda: graph.distance_graph(log_path, output_path),
+            lambda: shutil.rmtree(folder, ignore_errors=True),
+        )
+
+    return build
+
+
+class OffscreenGL:
+    """
+    A stand-in for the OpenGL modules, so the rendering can be timed without a
+    window or a GPU. Every GL call is counted and does nothing.
+    """
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __getattr__(self, name: str) -> Any:
+        if not name.startswith("gl"):
+            # the constants, like GL_LINES
+            return name
+
+        def call(*args: Any) -> None:
+            self.calls += 1
+
+        return call
+
+
+def render_all_case(walker_count: int, trail_length: int, obstacle_count: int) -> Case:
+    """Screen.render_all of a scene, with the OpenGL calls going to an OffscreenGL."""
+
+    def build() -> Tuple[Callable[[], object], Callable[[], None]]:
+        import screen as screen_module
+
+        original_modules = (getattr(screen_module, "GL"), getattr(screen_module, "GLU"))
+        setattr(screen_module, "GL", OffscreenGL())
+        setattr(screen_module, "GLU", OffscreenGL())
+        screen = screen_module.Screen(800, 600)
+        screen.set_obstacles(make_obstacles(obstacle_count))
+        rng = np.random.default_rng(0)
+        for walker in make_walkers(walker_count):
+            screen.add_walker(walker)
+            for position in np.cumsum(rng.normal(size=(trail_length, 3)), axis=0):
+                screen.add_to_trail(walker, Types.cast_to_vector3(position))
+
+        def cleanup() -> None:
+            setattr(screen_module, "GL", original_modules[0])
+            setattr(screen_module, "GLU", original_modules[1])
+
+        return screen.render_all, cleanup
+
+    return build
+
+
+def cases(quick: bool = False) -> Dict[str, Case]:
+    """
+    Lists the benchmark cases.
+
+    Args:
+        quick (bool, optional): Only the smaller scenes. Defaults to False.
+
+    Returns:
+        Dict[str, Case]: The cases by name, a name holds the scene parameters.
+    """
+    obstacle_counts = [0, 10, 1000]
+    walker_counts = [2, 10, 100] if quick else [2, 10, 100, 1000]
+    steps = [100, 1000] if quick else [100, 1000, 10000]
+    suite: Dict[str, Case] = {}
+    for obstacle_count in obstacle_counts:
+        for walker_count in [2, 100]:
+            suite[f"grid_move[obstacles={obstacle_count},walkers={walker_count}]"] = (
+                grid_move_case(obstacle_count, walker_count)
+            )
+    for obstacle_count in [10, 1000]:
+        suite[f"detect_colision[obstacles={obstacle_count}]"] = detect_colision_case(
+            obstacle_count
+        )
+    for walker_count in walker_counts:
+        for container in ["list", "population"]:
+            suite[f"gravity_effect[walkers={walker_count},{container}]"] = (
+                gravity_effect_case(walker_count, container)
+            )
+    for walker_count, simulation_count, max_steps in [(1, 10, 100), (4, 10, 100)] + (
+        [] if quick else [(4, 10, 1000)]
+    ):
+        suite[
+            f"simulate[walkers={walker_count},repetitions={simulation_count},steps={max_steps}]"
+        ] = simulate_case(walker_count, simulation_count, max_steps)
+    for step_count in steps:
+        suite[f"distance_graph[steps={step_count}]"] = distance_graph_case(step_count)
+    for walker_count, trail_length, obstacle_count in [(1, 100, 10), (10, 1000, 10)] + (
+        [] if quick else [(10, 1000, 1000)]
+    ):
+        suite[
+            f"render_all[walkers={walker_count},trail={trail_length},obstacles={obstacle_count}]"
+        ] = render_all_case(walker_count, trail_length, obstacle_count)
+    return suite
+
+
+def time_case(case: Case, min_time: float, repeat: int) -> Dict[str, float]:
+    """
+    Times a case.
+
+    Args:
+        case (Case): The case.
+        min_time (float): The least time of a timing, the amount of calls is chosen to reach it.
+        repeat (int): The amount of timings, the best is kept.
+
+    Returns:
+        Dict[str, float]: The best time per call in seconds, the amount of calls per timing
+        and the spread of the timings, the worst over the best minus one.
+    """
+    call, cleanup = case()
+    try:
+        timer = timeit.Timer(call)
+        number = 1
+        # the first call also warms up the caches
+        while timer.timeit(number) < min_time:
+            number *= 2
+        timings = timer.repeat(repeat=repeat, number=number)
+    finally:
+        cleanup()
+    best = min(timings)
+    return {
+        "seconds": best / number,
+        "number": number,
+        "spread": max(timings) / best - 1,
+    }
+
+
+def calibrate(repeat: int = 15) -> float:
+    """
+    Times a fixed workload of Python and NumPy calls, how fast the machine is right now.
+
+    Args:
+        repeat (int, optional): The amount of timings, the best is kept. Defaults to 15.
+
+    Returns:
+        float: The best time of the workload in seconds.
+    """
+    rng = np.random.default_rng(0)
+    points = rng.random((256, 3))
+
+    def workload() -> None:
+        total = 0.0
+        for point in points:
+            total += MathFunctions.norm(Types.cast_to_vector3(tuple(point.tolist())))
+        np.linalg.norm(points[:, np.newaxis] - points[np.newaxis], axis=2).sum()
+
+    return min(timeit.Timer(workload).repeat(repeat=repeat, number=20))
+
+
+def run(
+    quick: bool = False, name_filter: str = "", repeat: int = 3
+) -> Iterator[Tuple[str, Dict[str, float]]]:
+    """
+    Runs the suite.
+
+    Args:
+        quick (bool, optional): Only the smaller scenes, with shorter timings. Defaults to False.
+        name_filter (str, optional): Only the cases with this in their name. Defaults to "".
+        repeat (int, optional): The amount of timings of each case. Defaults to 3.
+
+    Returns:
+        Iterator[Tuple[str, Dict[str, float]]]: The name and timing of each case, as it is done.
+    """
+    for name, case in cases(quick).items():
+        if name_filter in name:
+            yield name, time_case(case, min_time(quick), repeat)
+
+
+def min_time(quick: bool = False) -> float:
+    """
+    Gives the least time of a timing.
+
+    Args:
+        quick (bool, optional): The shorter timings of the quick suite. Defaults to False.
+
+    Returns:
+        float: The least time in seconds.
+    """
+    return 0.02 if quick else 0.2
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float = THRESHOLD,
+    speed: float = 1.0,
+) -> List[Tuple[str, float]]:
+    """
+    Finds the regressions against a baseline.
+
+    Args:
+        results (Dict[str, Dict[str, float]]): The timings by case name.
+        baseline (Dict[str, Dict[str, float]]): The baseline timings by case name.
+        threshold (float, optional): The allowed slowdown, as a fraction. Defaults to THRESHOLD.
+        speed (float, optional): The calibration time of the run over the one of the baseline,
+            the baseline timings are scaled by it. Defaults to 1.0.
+
+    Returns:
+        List[Tuple[str, float]]: The name and ratio to the scaled baseline of every regression,
+        the cases missing from the baseline are skipped.
+    """
+    regressions = []
+    for name, result in results.items():
+        if name in baseline:
+            ratio = result["seconds"] / (baseline[name]["seconds"] * speed)
+            # the noisier of the two timings widens the allowed slowdown
+            spread = max(result.get("spread", 0.0), baseline[name].get("spread", 0.0))
+            if ratio > 1 + threshold + spread:
+                regressions.append((name, ratio))
+    return regressions
+
+
+def read_details(path: str) -> Dict[str, Any]:
+    """
+    Reads the details of the machine and the calibration time of a results file.
+
+    Args:
+        path (str): The path of the file.
+
+    Returns:
+        Dict[str, Any]: The details, empty if the file does not exist.
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r") as f:
+        data = dict(json.load(f))
+    data.pop("results", None)
+    return data
+
+
+def read_results(path: str) -> Dict[str, Dict[str, float]]:
+    """
+    Reads the timings of a results file.
+
+    Args:
+        path (str): The path of the file.
+
+    Returns:
+        Dict[str, Dict[str, float]]: The timings by case name, empty if the file does not exist.
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r") as f:
+        return dict(json.load(f)["results"])
+
+
+def machine_details() -> Dict[str, str]:
+    """
+    Describes the machine the suite runs on.
+
+    Returns:
+        Dict[str, str]: The value of each of the MACHINE_KEYS.
+    """
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+    }
+
+
+def write_results(
+    path: str, results: Dict[str, Dict[str, float]], calibration: float
+) -> None:
+    """
+    Writes timings with the details of the machine that made them.
+
+    Args:
+        path (str): The path of the file.
+        results (Dict[str, Dict[str, float]]): The timings by case name.
+        calibration (float): The calibration time of the machine when the timings were made.
+    """
+    folder = os.path.dirname(path)
+    if folder and not os.path.isdir(folder):
+        os.makedirs(folder)
+    data = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        **machine_details(),
+        "calibration": calibration,
+        "results": results,
+    }
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Runs the suite, compares the results against the baseline and writes them.
+
+    Args:
+        argv (Optional[List[str]], optional): The command line arguments. Defaults to None.
+
+    Returns:
+        int: The exit code, 1 if there are regressions.
+    """
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--quick", action="store_true", help="only the smaller scenes")
+    parser.add_argument("--filter", default="", help="only the cases with this in their name")
+    parser.add_argument("--repeat", type=int, default=3, help="timings of each case")
+    parser.add_argument("--output", default=RESULTS_PATH, help="the results file")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="the baseline file")
+    parser.add_argument(
+        "--threshold", type=float, default=THRESHOLD, help="the allowed slowdown, as a fraction"
+    )
+    parser.add_argument(
+        "--update-baseline", action="store_true", help="save the results as the baseline"
+    )
+    args = parser.parse_args(argv)
+
+    baseline = read_results(args.baseline)
+    baseline_details = read_details(args.baseline)
+    # how much faster or slower the machine is than when the baseline was made
+    calibration = calibrate()
+    baseline_calibration = baseline_details.get("calibration", calibration)
+    speed = calibration / baseline_calibration
+    results: Dict[str, Dict[str, float]] = {}
+    print(f"{'case':62} {'time us':>12} {'baseline':>9}")
+    for name, result in run(args.quick, args.filter, args.repeat):
+        results[name] = result
+        ratio = (
+            f"{result['seconds'] / (baseline[name]['seconds'] * speed):8.2f}x"
+            if name in baseline
+            else f"{'-':>9}"
+        )
+        print(f"{name:62} {result['seconds'] * 1e6:12.1f} {ratio}")
+
+    machine = machine_details()
+    same_machine = all(
+        baseline_details.get(key) == machine[key] for key in MACHINE_KEYS
+    )
+    if args.update_baseline:
+        write_results(args.output, results, calibration)
+        # keeping the baseline of the cases that were not run, if it is of this machine
+        kept = baseline if same_machine else {}
+        write_results(args.baseline, {**kept, **results}, calibration)
+        print(f"baseline saved to {args.baseline}")
+        return 0
+    if baseline and not same_machine:
+        write_results(args.output, results, calibration)
+        print("the baseline is of another machine, run with --update-baseline")
+        return 0
+    regressions = compare(results, baseline, args.threshold, speed)
+    # a busy moment of the machine passes, the best of the timings is kept and
+    # the machine is as slow as it was at its slowest calibration
+    for _ in range(RETRIES):
+        if not regressions:
+            break
+        speed = max(speed, calibrate() / baseline_calibration)
+        suite = cases(args.quick)
+        for name, _ in regressions:
+            retimed = time_case(suite[name], min_time(args.quick), args.repeat)
+            if retimed["seconds"] < results[name]["seconds"]:
+                results[name] = retimed
+        regressions = compare(results, baseline, args.threshold, speed)
+    write_results(args.output, results, calibration)
+    for name, slowdown in regressions:
+        print(f"REGRESSION {name}: {slowdown:.2f}x the baseline")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
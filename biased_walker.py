@@ -1,14 +1,15 @@
-from walker import Walker
+from walker import Walker, MoveArrays
 from math_functions import MathFunctions
 from custom_types import *
 import math
 import numpy as np
-import random
-from typing import Tuple
+from typing import Optional, Tuple
 
 
 class BiasedWalker(Walker):
 
+    __slots__ = ["bias", "bias_scale"]
+
     BIAS_DICT = {
         "Left": (0.5 * math.pi, 0),
         "Right": (-0.5 * math.pi, 0),
@@ -25,6 +26,7 @@ class BiasedWalker(Walker):
         mass: float = 1.0,
         bias: str = "",
         bias_scale: int = 1,
+        rng: Optional[np.random.Generator] = None,
     ) -> None:
         """
         Initialize a BiasedWalker object.
@@ -35,6 +37,8 @@ class BiasedWalker(Walker):
             mass (float, optional): The mass of the walker. Defaults to 1.0.
             bias (str, optional): The bias of the walker. Defaults to an empty string.
             bias_scale (int, optional): The scale of the bias. Defaults to 1.
+            rng (Optional[np.random.Generator], optional): Draws the bias when it is not given.
+                Defaults to None, which draws it from the walker's own stream.
 
         Returns:
             None
@@ -46,7 +50,8 @@ class BiasedWalker(Walker):
         if bias in self.BIAS_DICT or bias == "Origin":
             self.bias = bias
         else:
-            self.bias = random.choice(list(self.BIAS_DICT.keys()))
+            rng = rng or self._rng
+            self.bias = str(rng.choice(list(self.BIAS_DICT.keys())))
 
     def _generate_move_radius(self) -> float:
         """
@@ -67,8 +72,8 @@ class BiasedWalker(Walker):
         result = None
 
         # generating a normally distributed change in angle from the bias direction
-        change_direction = MathFunctions.random_angle()
-        changee_magnitude = np.random.normal(scale=self.bias_scale)  # change in radians
+        change_direction = MathFunctions.random_angle(self._rng)
+        changee_magnitude = self._rng.normal(scale=self.bias_scale)  # change in radians
 
         # finding the bias direction from the bias dictionary
         if self.bias in self.BIAS_DICT:
@@ -77,7 +82,7 @@ class BiasedWalker(Walker):
         elif self.bias == "Origin":
             yaw = math.atan2(self._location[1], self._location[0])
             pitch = (
-                math.atan2(self._location[2], np.linalg.norm(self._location[:2]))  # type: ignore[no-untyped-call]
+                math.atan2(self._location[2], MathFunctions.norm(self._location[:2]))
                 + math.pi
             )
 
@@ -92,3 +97,44 @@ class BiasedWalker(Walker):
             result = (yaw + changee_magnitude + math.pi, 0)
 
         return (result[0] % (2 * math.pi), result[1] % (2 * math.pi))
+
+    def _generate_moves(self, steps: int, batch: int) -> MoveArrays:
+        """
+        Generates a block of moves in a single draw, walkers biased to the origin
+        depend on their location so they use the step by step version.
+
+        Args:
+            steps (int): The amount of steps.
+            batch (int): The amount of moves in each step.
+
+        Returns:
+            MoveArrays: The (steps, batch) yaw, radius and pitch arrays.
+        """
+        if self.bias not in self.BIAS_DICT:
+            return super()._generate_moves(steps, batch)
+
+        # generating a normally distributed change in angle from the bias direction
+        change_direction = MathFunctions.random_angles((steps, batch), self._rng)
+        change_magnitude = self._rng.normal(scale=self.bias_scale, size=(steps, batch))
+        yaw, pitch = self.BIAS_DICT[self.bias]
+
+        if self._is_3d:
+            new_yaw = yaw + np.cos(change_direction) * change_magnitude
+            new_pitch = pitch + np.sin(change_direction) * change_magnitude
+        else:
+            new_yaw = yaw + change_magnitude + math.pi
+            new_pitch = np.zeros((steps, batch))
+        return (
+            new_yaw % (2 * math.pi),
+            np.ones((steps, batch)),
+            new_pitch % (2 * math.pi),
+        )
+
+    def is_vectorizable(self) -> bool:
+        """
+        Returns True if the walker generates its moves in bulk and they don't depend on its location.
+
+        Returns:
+            bool: False for walkers biased to the origin.
+        """
+        return self.bias in self.BIAS_DICT
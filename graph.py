@@ -2,12 +2,13 @@ import matplotlib.pyplot as plt  # type: ignore[import]
 import matplotlib
 import numpy as np
 import json
-from typing import Dict, Any
+from log_store import LogStore
+from typing import Dict, Any, List, Sequence
 
 matplotlib.use("Agg")
 
-import json
-from typing import Dict, Any
+# the distance axes of every log, "cm" is the distance from the center of mass
+DISTANCE_AXES = ["", "x", "y", "cm"]
 
 
 def read_json(path: str) -> Dict[str, Any]:
@@ -24,6 +25,20 @@ def read_json(path: str) -> Dict[str, Any]:
         return dict(json.load(f))
 
 
+def read_columns(path: str, columns: List[str]) -> Dict[str, np.ndarray]:
+    """
+    Reads only the given columns of a log, a JSON log or an .npz columnar log.
+
+    Args:
+        path (str): The path to the log file.
+        columns (List[str]): The names of the columns.
+
+    Returns:
+        Dict[str, np.ndarray]: The columns by name.
+    """
+    return LogStore.load(path, columns)
+
+
 def distance_graph(data_path: str, output_path: str, axis: str = "") -> None:
     """
     Generate a distance graph based on the logged data.
@@ -34,20 +49,55 @@ def distance_graph(data_path: str, output_path: str, axis: str = "") -> None:
         axis (str): The axis to plot the distance against. Default is an empty string.
     """
     # reads the data
-    data = read_json(data_path)[f"{axis}distance"]
+    data = read_columns(data_path, [f"{axis}distance"])[f"{axis}distance"]
+    _plot_distance(data, output_path, axis)
+
+
+def _plot_distance(data: np.ndarray, output_path: str, axis: str) -> str:
+    """
+    Draws and saves a distance graph.
+
+    Parameters:
+        data (np.ndarray): The average distance of every step.
+        output_path (str): The path to save the generated graph.
+        axis (str): The axis of the distance.
+
+    Returns:
+        str: The path of the saved picture.
+    """
+    return _plot(
+        data,
+        f"{output_path}-{axis}distance.png",
+        "Steps",
+        "Distance",
+        f"Average {axis}-distance as a function of steps",
+    )
+
+
+def _plot(data: np.ndarray, path: str, xlabel: str, ylabel: str, title: str) -> str:
+    """
+    Draws a column as a function of its index and saves the figure.
+
+    Parameters:
+        data (np.ndarray): The values.
+        path (str): The path of the picture.
+        xlabel (str): The label of the x axis.
+        ylabel (str): The label of the y axis.
+        title (str): The title.
+
+    Returns:
+        str: The path of the saved picture.
+    """
     # draws the graph
     fig, ax = plt.subplots()
     ax.plot(range(len(data)), data)
     # sets the labels and title
-    ax.set(
-        xlabel="Steps",
-        ylabel="Distance",
-        title=f"Average {axis}-distance as a function of steps",
-    )
+    ax.set(xlabel=xlabel, ylabel=ylabel, title=title)
     ax.grid()
     # saves the graph
-    fig.savefig(f"{output_path}-{axis}distance.png")
+    fig.savefig(path)
     plt.close(fig)
+    return path
 
 
 def cross_count_graph(data_path: str, output_path: str) -> None:
@@ -60,21 +110,29 @@ def cross_count_graph(data_path: str, output_path: str) -> None:
     None
     """
     # reads the data
-    data = read_json(data_path)["y_cross_count_list"]
-    # draws the graph
-    fig, ax = plt.subplots()
-    ax.plot(range(len(data)), data)
-    # sets the labels and title
-    ax.set(
-        xlabel="Steps",
-        ylabel="Y cross count",
-        title="Average Y axis cross count as a function of steps",
+    data = read_columns(data_path, ["y_cross_count_list"])["y_cross_count_list"]
+    _plot_cross_count(data, output_path)
+
+
+def _plot_cross_count(data: np.ndarray, output_path: str) -> str:
+    """
+    Draws and saves a cross count graph.
+
+    Parameters:
+        data (np.ndarray): The average cross count of every step.
+        output_path (str): The path to save the generated graph.
+
+    Returns:
+        str: The path of the saved picture.
+    """
+    return _plot(
+        data,
+        f"{output_path}-cross-count.png",
+        "Steps",
+        "Y cross count",
+        "Average Y axis cross count as a function of steps",
     )
-    ax.grid()
-    # saves the graph
-    fig.savefig(f"{output_path}-cross-count.png")
-    plt.close(fig)
-    
+
 
 def time_to_leave_graph(data_path: str, output_path: str) -> None:
     """
@@ -86,17 +144,49 @@ def time_to_leave_graph(data_path: str, output_path: str) -> None:
     None
     """
     # reads the data
-    data = read_json(data_path)["time_to_leave"]
-    # draws the graph
-    fig, ax = plt.subplots()
-    ax.plot(range(len(data)), data)
-    # sets the labels and title
-    ax.set(
-        xlabel="Simulation index",
-        ylabel="Time to leave",
-        title="Time to leave as a function of the simulation index",
+    data = read_columns(data_path, ["time_to_leave"])["time_to_leave"]
+    _plot_time_to_leave(data, output_path)
+
+
+def _plot_time_to_leave(data: np.ndarray, output_path: str) -> str:
+    """
+    Draws and saves a time to leave graph.
+
+    Parameters:
+        data (np.ndarray): The time to leave of every repetition.
+        output_path (str): The path to save the generated graph.
+
+    Returns:
+        str: The path of the saved picture.
+    """
+    return _plot(
+        data,
+        f"{output_path}-time-to-leave.png",
+        "Simulation index",
+        "Time to leave",
+        "Time to leave as a function of the simulation index",
     )
-    ax.grid()
-    # saves the graph
-    fig.savefig(f"{output_path}-time-to-leave.png")
-    plt.close(fig)
+
+
+def render_graphs(data_path: str, output_path: str, is_3d: bool) -> List[str]:
+    """
+    Generate all the graphs of a log, reading it once.
+
+    Parameters:
+        data_path (str): The path to the log file.
+        output_path (str): The path prefix of the generated graphs.
+        is_3d (bool): Also draw the z distance graph.
+
+    Returns:
+        List[str]: The paths of the saved pictures.
+    """
+    axes: Sequence[str] = DISTANCE_AXES + ["z"] if is_3d else DISTANCE_AXES
+    # reads every column the graphs need in a single pass over the log
+    data = read_columns(
+        data_path,
+        [f"{axis}distance" for axis in axes] + ["y_cross_count_list", "time_to_leave"],
+    )
+    paths = [_plot_distance(data[f"{axis}distance"], output_path, axis) for axis in axes]
+    paths.append(_plot_cross_count(data["y_cross_count_list"], output_path))
+    paths.append(_plot_time_to_leave(data["time_to_leave"], output_path))
+    return paths
@@ -0,0 +1,152 @@
+import logging
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from threading import Lock
+from typing import Callable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _render(log_path: str, output_path: str, is_3d: bool) -> List[str]:
+    """Renders all the graphs of a log in a worker process.
+
+    Args:
+        log_path (str): The data log path.
+        output_path (str): The path prefix of the graphs.
+        is_3d (bool): Also draw the z distance graph.
+
+    Returns:
+        List[str]: The paths of the saved pictures.
+    """
+    # matplotlib is only loaded by the workers
+    import graph
+
+    return graph.render_graphs(log_path, output_path, is_3d)
+
+
+class GraphPipeline:
+
+    def __init__(self, max_workers: Optional[int] = None) -> None:
+        """Initializes a GraphPipeline object.
+
+        The pipeline renders the graphs of the walker logs in a process pool, every log
+        is read once and all its figures are drawn by one worker, and the logs of
+        different walkers are drawn in parallel. matplotlib is not thread safe, so the
+        figures are never drawn on the simulation threads. The pool is started by the
+        first submit and kept for the next runs. A render that fails is logged and kept
+        until it is taken, so the caller can report it.
+
+        Args:
+            max_workers (Optional[int], optional): The amount of worker processes. Defaults to None, which uses all the cores.
+        """
+        self.__max_workers = max_workers or multiprocessing.cpu_count()
+        self.__executor: Optional[ProcessPoolExecutor] = None
+        self.__pending: Set[Future[List[str]]] = set()
+        self.__lock = Lock()
+        self.__callback: Optional[Callable[[str], None]] = None
+        # the path prefix and the error of the renders that failed
+        self.__failures: List[Tuple[str, BaseException]] = []
+
+    def set_callback(self, callback: Optional[Callable[[str], None]]) -> None:
+        """Sets the function called when the graphs of a log are saved.
+
+        The callback runs on a pool thread, so a GUI has to hand the call over to its own thread.
+
+        Args:
+            callback (Optional[Callable[[str], None]]): Called with the path prefix of the saved graphs, None for no callback.
+        """
+        self.__callback = callback
+
+    def submit(self, log_path: str, output_path: str, is_3d: bool) -> "Future[List[str]]":
+        """Queues the graphs of a log.
+
+        Args:
+            log_path (str): The data log path.
+            output_path (str): The path prefix of the graphs.
+            is_3d (bool): Also draw the z distance graph.
+
+        Returns:
+            Future[List[str]]: The paths of the saved pictures, once they are saved.
+        """
+        with self.__lock:
+            if self.__executor is None:
+                # spawning so the workers don't inherit the GUI threads
+                context = multiprocessing.get_context("spawn")
+                self.__executor = ProcessPoolExecutor(
+                    self.__max_workers, mp_context=context
+                )
+            future = self.__executor.submit(_render, log_path, output_path, is_3d)
+            self.__pending.add(future)
+        future.add_done_callback(lambda done: self._finish(done, output_path))
+        return future
+
+    def _finish(self, future: "Future[List[str]]", output_path: str) -> None:
+        """Reports the graphs of a log as done.
+
+        Args:
+            future (Future[List[str]]): The finished render.
+            output_path (str): The path prefix of the graphs.
+        """
+        error = None if future.cancelled() else future.exception()
+        with self.__lock:
+            self.__pending.discard(future)
+            if error is not None:
+                self.__failures.append((output_path, error))
+        if error is not None:
+            logger.error(
+                "could not draw the graphs of %s", output_path, exc_info=error
+            )
+            return
+        callback = self.__callback
+        if callback is not None and not future.cancelled():
+            callback(output_path)
+
+    def take_failures(self) -> List[Tuple[str, BaseException]]:
+        """Takes the renders that failed since the last call.
+
+        Returns:
+            List[Tuple[str, BaseException]]: The path prefix and the error of every failed render.
+        """
+        with self.__lock:
+            failures = self.__failures
+            self.__failures = []
+        return failures
+
+    def get_pending(self) -> int:
+        """Gets the amount of logs that are not rendered yet.
+
+        Returns:
+            int: The amount of queued and running renders.
+        """
+        with self.__lock:
+            return len(self.__pending)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Waits for the queued graphs.
+
+        Args:
+            timeout (Optional[float], optional): The most seconds to wait. Defaults to None, which waits for all of them.
+
+        Raises:
+            Exception: The error of the first render that failed and was not taken yet,
+                the renders that failed are taken.
+
+        Returns:
+            bool: True if all the graphs are saved.
+        """
+        with self.__lock:
+            pending = set(self.__pending)
+        _, not_done = wait(pending, timeout)
+        # a render that failed before the wait is reported too
+        failures = self.take_failures()
+        if failures:
+            raise failures[0][1]
+        return not not_done
+
+    def shutdown(self) -> None:
+        """Waits for the queued graphs and stops the worker processes."""
+        with self.__lock:
+            executor = self.__executor
+            self.__executor = None
+        if executor is not None:
+            executor.shutdown(wait=True)
@@ -0,0 +1,283 @@
+from custom_types import *
+import numpy as np
+from typing import List, Optional, Union
+
+
+class GravitySolver(object):
+
+    def __init__(self, gravity_constant: float = 1) -> None:
+        """
+        Initializes an exact gravity solver.
+
+        Every walker with mass is pulled toward every other walker by
+        other_mass / (max(distance, 1) * total_mass), all the pairs are computed
+        together with NumPy.
+
+        Args:
+            gravity_constant (float, optional): The gravity constant. Defaults to 1.
+        """
+        self._gravity_constant = gravity_constant
+
+    def get_gravity_constant(self) -> float:
+        """
+        Returns the gravity constant.
+
+        Returns:
+            float: The gravity constant.
+        """
+        return self._gravity_constant
+
+    def effect_on(
+        self,
+        position: Union[Types.vector3, np.ndarray],
+        positions: np.ndarray,
+        masses: np.ndarray,
+        total_mass: float,
+    ) -> np.ndarray:
+        """
+        Calculates the gravity effect of a group of walkers on a single position.
+
+        Args:
+            position (Union[Types.vector3, np.ndarray]): The position that is pulled.
+            positions (np.ndarray): The (n, 3) positions of the pulling walkers.
+            masses (np.ndarray): The (n,) masses of the pulling walkers.
+            total_mass (float): The total mass the effect is scaled down by.
+
+        Returns:
+            np.ndarray: The (3,) gravity move.
+        """
+        if len(masses) == 0 or total_mass == 0:
+            return np.zeros(3)
+        offsets = positions - np.asarray(position, np.float64)
+        distances = np.linalg.norm(offsets, axis=-1, keepdims=True)
+        directions = offsets / np.where(distances == 0, 1, distances)
+        effect: np.ndarray = np.sum(
+            directions * masses[:, np.newaxis] / (np.maximum(distances, 1) * total_mass),
+            axis=0,
+        )
+        return effect * self._gravity_constant
+
+    def compute(self, positions: np.ndarray, masses: np.ndarray) -> np.ndarray:
+        """
+        Calculates the gravity effect of every walker on every other walker.
+
+        Args:
+            positions (np.ndarray): The (n, 3) positions, or (n, repetitions, 3) to solve each repetition separately.
+            masses (np.ndarray): The (n,) masses.
+
+        Returns:
+            np.ndarray: The gravity moves, in the shape of positions.
+        """
+        total_mass = masses.sum()
+        if total_mass == 0 or len(masses) < 2:
+            return np.zeros_like(positions)
+        batch = positions if positions.ndim == 3 else positions[:, np.newaxis, :]
+        # [i, j] is the vector from walker i to walker j
+        offsets = batch[np.newaxis, :, :, :] - batch[:, np.newaxis, :, :]
+        distances = np.linalg.norm(offsets, axis=-1, keepdims=True)
+        directions = offsets / np.where(distances == 0, 1, distances)
+        scale = masses[np.newaxis, :, np.newaxis, np.newaxis] / (
+            np.maximum(distances, 1) * total_mass
+        )
+        # a walker does not pull itself
+        diagonal = np.arange(len(masses))
+        scale[diagonal, diagonal] = 0
+        effect = np.sum(directions * scale, axis=1) * self._gravity_constant
+        # only walkers with mass are affected
+        effect[masses <= 0] = 0
+        result: np.ndarray = effect.reshape(positions.shape)
+        return result
+
+
+class _OctreeNode(object):
+
+    __slots__ = ["low", "size", "mass", "center_mass", "indices", "children"]
+
+    def __init__(self, low: np.ndarray, size: float) -> None:
+        """
+        Initializes an octree node.
+
+        Args:
+            low (np.ndarray): The minimum corner of the node cube.
+            size (float): The side length of the node cube.
+        """
+        self.low = low
+        self.size = size
+        self.mass = 0.0
+        self.center_mass = low
+        self.indices: Optional[np.ndarray] = None
+        self.children: List["_OctreeNode"] = []
+
+
+class BarnesHutGravity(GravitySolver):
+
+    __MIN_SIZE = 1e-9
+
+    def __init__(
+        self, theta: float = 0.5, leaf_size: int = 8, gravity_constant: float = 1
+    ) -> None:
+        """
+        Initializes an approximate Barnes-Hut gravity solver.
+
+        An octree over the walkers is built once per step. A group of walkers that is
+        far enough away (node size / distance < theta) pulls as a single mass at its
+        center of mass, so each step costs O(n log n) instead of O(n^2).
+
+        Args:
+            theta (float, optional): The opening angle, 0 is exact. Defaults to 0.5.
+            leaf_size (int, optional): The most walkers kept in a leaf. Defaults to 8.
+            gravity_constant (float, optional): The gravity constant. Defaults to 1.
+        """
+        super().__init__(gravity_constant)
+        self.__theta = theta
+        self.__leaf_size = leaf_size
+
+    def get_theta(self) -> float:
+        """
+        Returns the opening angle.
+
+        Returns:
+            float: The opening angle.
+        """
+        return self.__theta
+
+    def _build(
+        self,
+        indices: np.ndarray,
+        positions: np.ndarray,
+        masses: np.ndarray,
+        low: np.ndarray,
+        size: float,
+    ) -> _OctreeNode:
+        """
+        Builds the octree node containing the given walkers.
+
+        Args:
+            indices (np.ndarray): The indices of the walkers in the node.
+            positions (np.ndarray): The (n, 3) positions of all the walkers.
+            masses (np.ndarray): The (n,) masses of all the walkers.
+            low (np.ndarray): The minimum corner of the node cube.
+            size (float): The side length of the node cube.
+
+        Returns:
+            _OctreeNode: The node.
+        """
+        node = _OctreeNode(low, size)
+        node_masses = masses[indices]
+        node.mass = float(node_masses.sum())
+        if node.mass > 0:
+            node.center_mass = (
+                np.sum(positions[indices] * node_masses[:, np.newaxis], axis=0)
+                / node.mass
+            )
+
+        if len(indices) <= self.__leaf_size or size <= self.__MIN_SIZE:
+            node.indices = indices
+            return node
+
+        half = size / 2
+        # the octant of each walker, one bit per axis
+        octants = np.sum(
+            (positions[indices] >= low + half) * np.array([1, 2, 4]), axis=1
+        )
+        for octant in range(8):
+            child_indices = indices[octants == octant]
+            if len(child_indices) > 0:
+                offset = np.array([octant & 1, (octant >> 1) & 1, (octant >> 2) & 1])
+                node.children.append(
+                    self._build(
+                        child_indices, positions, masses, low + offset * half, half
+                    )
+                )
+        return node
+
+    def _accumulate(
+        self,
+        node: _OctreeNode,
+        targets: np.ndarray,
+        positions: np.ndarray,
+        masses: np.ndarray,
+        total_mass: float,
+        effect: np.ndarray,
+    ) -> None:
+        """
+        Adds the pull of a node on a group of walkers, opening the node for the walkers that are too close.
+
+        Args:
+            node (_OctreeNode): The pulling node.
+            targets (np.ndarray): The indices of the pulled walkers.
+            positions (np.ndarray): The (n, 3) positions of all the walkers.
+            masses (np.ndarray): The (n,) masses of all the walkers.
+            total_mass (float): The total mass the effect is scaled down by.
+            effect (np.ndarray): The (n, 3) effect array to add to.
+        """
+        if node.mass == 0 or len(targets) == 0:
+            return
+
+        if node.indices is not None:
+            # leaves are summed exactly
+            members = node.indices
+            offsets = positions[members][np.newaxis, :, :] - positions[targets][:, np.newaxis, :]
+            distances = np.linalg.norm(offsets, axis=-1, keepdims=True)
+            directions = offsets / np.where(distances == 0, 1, distances)
+            scale = masses[members][np.newaxis, :, np.newaxis] / (
+                np.maximum(distances, 1) * total_mass
+            )
+            scale[targets[:, np.newaxis] == members[np.newaxis, :]] = 0
+            effect[targets] += np.sum(directions * scale, axis=1)
+            return
+
+        target_positions = positions[targets]
+        offsets = node.center_mass - target_positions
+        distances = np.linalg.norm(offsets, axis=-1)
+        inside = np.all(
+            (target_positions >= node.low) & (target_positions <= node.low + node.size),
+            axis=1,
+        )
+        far = ~inside & (node.size < self.__theta * distances)
+        if np.any(far):
+            far_distances = distances[far][:, np.newaxis]
+            effect[targets[far]] += (
+                offsets[far]
+                / far_distances
+                * node.mass
+                / (np.maximum(far_distances, 1) * total_mass)
+            )
+        near = targets[~far]
+        for child in node.children:
+            self._accumulate(child, near, positions, masses, total_mass, effect)
+
+    def compute(self, positions: np.ndarray, masses: np.ndarray) -> np.ndarray:
+        """
+        Calculates the approximate gravity effect of every walker on every other walker.
+
+        Args:
+            positions (np.ndarray): The (n, 3) positions, or (n, repetitions, 3) to solve each repetition separately.
+            masses (np.ndarray): The (n,) masses.
+
+        Returns:
+            np.ndarray: The gravity moves, in the shape of positions.
+        """
+        if positions.ndim == 3:
+            return np.stack(
+                [
+                    self.compute(positions[:, repetition], masses)
+                    for repetition in range(positions.shape[1])
+                ],
+                axis=1,
+            )
+
+        effect = np.zeros_like(positions, dtype=np.float64)
+        total_mass = float(masses.sum())
+        if total_mass == 0 or len(masses) < 2:
+            return effect
+
+        low = positions.min(axis=0)
+        size = max(float(np.max(positions.max(axis=0) - low)), self.__MIN_SIZE)
+        # the tree is built once and shared by all the walkers
+        root = self._build(np.arange(len(masses)), positions, masses, low, size)
+        self._accumulate(
+            root, np.flatnonzero(masses > 0), positions, masses, total_mass, effect
+        )
+        result: np.ndarray = effect * self._gravity_constant
+        return result
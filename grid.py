@@ -4,14 +4,20 @@ from obstacle import Obstacle
 from speed_zone import SpeedZone
 from typing import List
 from walker import Walker
+from walker_population import WalkerPopulation
 from move import Move
 from math_functions import MathFunctions
+from spatial_hash import SpatialHash
+from obstacle_store import ObstacleStore
+from grid_scene import GridScene
+from scene_config import SceneConfig
+from gravity import GravitySolver
+from profiler import Profiler
 import math
 from custom_types import *
 import os
 import numpy as np
-import copy
-from typing import Optional
+from typing import Optional, Sequence, Set, Union
 
 
 class Grid(object):
@@ -22,13 +28,76 @@ class Grid(object):
         """
         Initializes a new instance of the Grid class.
         """
-        self._obstacles: List[Obstacle] = []
+        # replaced as a whole, never changed, so a move reads it once
+        self.__scene = GridScene([])
+        self.__gravity_solver = GravitySolver(self.__GRAVITY_CONSTANT)
 
     def clear_obstacles(self) -> None:
         """
         Clears all obstacles from the grid.
         """
-        self._obstacles = []
+        self.__scene = GridScene([])
+
+    def _extend_obstacles(self, obstacles: Sequence[Obstacle]) -> None:
+        """
+        Adds obstacles to the grid, replacing the scene with one that also holds them.
+
+        Args:
+            obstacles (Sequence[Obstacle]): The obstacles to add.
+        """
+        self.__scene = self.__scene.extended(obstacles)
+
+    def get_scene(self) -> GridScene:
+        """
+        Returns the current scene of the grid.
+
+        Returns:
+            GridScene: The obstacles with their spatial hash and store.
+        """
+        return self.__scene
+
+    def get_obstacle_store(self) -> ObstacleStore:
+        """
+        Returns the obstacles of the grid compiled into contiguous arrays.
+
+        Returns:
+            ObstacleStore: The obstacle store, in the same order as get_obstacles.
+        """
+        return self.__scene.get_store()
+
+    def set_scene(self, scene: SceneConfig) -> None:
+        """
+        Replaces all the obstacles in the grid with a validated scene.
+
+        The new obstacles, spatial hash and store are all built before they replace
+        the old ones at once, and the store is the scene's own arrays.
+
+        Args:
+            scene (SceneConfig): The scene.
+        """
+        self.__scene = GridScene(scene.to_obstacles(), scene.get_store())
+
+    def set_store(self, store: ObstacleStore) -> None:
+        """
+        Replaces all the obstacles in the grid with a store, without making obstacle objects,
+        like a store opened from a binary scene file.
+
+        get_obstacles is empty until obstacles are set or added again, and the
+        collision candidates are found by the store itself.
+
+        Args:
+            store (ObstacleStore): The obstacle store.
+        """
+        self.__scene = GridScene([], store)
+
+    def get_spatial_hash(self) -> SpatialHash[Obstacle]:
+        """
+        Returns the spatial hash over the obstacles in the grid.
+
+        Returns:
+            SpatialHash[Obstacle]: The spatial hash.
+        """
+        return self.__scene.get_spatial_hash()
 
     def add_teleporters(self, path: str) -> bool:
         """
@@ -62,7 +131,7 @@ class Grid(object):
 
         # return the success of the operation
         if success:
-            self._obstacles.extend(teleporter_list)
+            self._extend_obstacles(teleporter_list)
         return success
 
     def add_obstacles(self, path: str) -> bool:
@@ -93,7 +162,7 @@ class Grid(object):
 
         # return the success of the operation
         if success:
-            self._obstacles.extend(obstacle_list)
+            self._extend_obstacles(obstacle_list)
         return success
 
     def add_speed_zones(self, path: str) -> bool:
@@ -127,7 +196,7 @@ class Grid(object):
                 success = False
         # return the success of the operation
         if success:
-            self._obstacles.extend(speed_zone_list)
+            self._extend_obstacles(speed_zone_list)
         return success
 
     def find_closest(
@@ -160,98 +229,208 @@ class Grid(object):
 
         return closest
 
-    def get_gravity_effect(self, walker: Walker, walker_list: List[Walker]) -> Move:
+    def _gravity_vector(
+        self, walker: Walker, walker_list: Sequence[Walker]
+    ) -> np.ndarray:
+        """
+        Calculates the gravity vector on a given walker based on the other walkers in the list.
+
+        A WalkerPopulation is read straight from its arrays.
+
+        Args:
+            walker (Walker): The walker for which to calculate the gravity effect.
+            walker_list (Sequence[Walker]): The list of other walkers.
+
+        Returns:
+            np.ndarray: The (3,) gravity vector.
+        """
+        if walker.get_mass() <= 0:
+            return np.zeros(3)
+        if isinstance(walker_list, WalkerPopulation):
+            masses = walker_list.get_masses()
+            others = np.arange(len(walker_list)) != walker_list.index_of(walker)
+            if not others.any():
+                return np.zeros(3)
+            return self.__gravity_solver.effect_on(
+                walker.get_position(),
+                walker_list.get_positions()[others],
+                masses[others],
+                float(masses.sum()),
+            )
+
+        total_mass = sum([other_walker.get_mass() for other_walker in walker_list])
+        other_walker_list = [
+            other_walker for other_walker in walker_list if other_walker != walker
+        ]
+        if not other_walker_list:
+            return np.zeros(3)
+        return self.__gravity_solver.effect_on(
+            walker.get_location(),
+            np.array(
+                [other_walker.get_location() for other_walker in other_walker_list],
+                np.float64,
+            ),
+            np.array(
+                [other_walker.get_mass() for other_walker in other_walker_list],
+                np.float64,
+            ),
+            total_mass,
+        )
+
+    def get_gravity_effect(self, walker: Walker, walker_list: Sequence[Walker]) -> Move:
         """
         Calculates the gravity effect on a given walker based on the other walkers in the list.
 
         Args:
             walker (Walker): The walker for which to calculate the gravity effect.
-            walker_list (List[Walker]): The list of other walkers.
+            walker_list (Sequence[Walker]): The list of other walkers.
 
         Returns:
             Move: The resulting move representing the gravity effect.
 
         """
-        addition_sum = np.array((0, 0, 0), np.float64)
-        total_mass = sum([other_walker.get_mass() for other_walker in walker_list])
-        # if gravity should be affecting
-        if walker.get_mass() > 0:
-            for other_walker in walker_list:
-                if other_walker != walker:
-                    # calculating the gravity effect
-                    distance = MathFunctions.dist(
-                        walker.get_location(), other_walker.get_location()
-                    )
-                    walker_to_other_walker = np.subtract(
-                        other_walker.get_location(), walker.get_location()
-                    )
-                    direction = MathFunctions.normalize(
-                        Types.cast_to_vector3(walker_to_other_walker)
-                    )
-                    addition = Types.cast_to_vector3(
-                        (
-                            np.array(direction)
-                            * other_walker.get_mass()
-                            * self.__GRAVITY_CONSTANT
-                        )
-                        / (max(distance, 1) * total_mass)
-                    )
-                    # adding the gravity effect to the total move
-                    addition_sum += addition
-
+        addition_sum = self._gravity_vector(walker, walker_list)
         return Move(
             *MathFunctions.angle_and_radius_from_vector(Types.cast_to_vector3(addition_sum))
         )
 
+    def get_gravity_solver(self) -> GravitySolver:
+        """
+        Returns the solver used for the gravity between the walkers.
+
+        Returns:
+            GravitySolver: The gravity solver.
+        """
+        return self.__gravity_solver
+
+    def set_gravity_solver(self, gravity_solver: GravitySolver) -> None:
+        """
+        Sets the solver used for the gravity between the walkers,
+        for example a BarnesHutGravity for large walker populations.
+
+        Args:
+            gravity_solver (GravitySolver): The gravity solver.
+        """
+        self.__gravity_solver = gravity_solver
+
     def move(
         self,
         walker: Walker,
         move: Move,
-        walker_list: List[Walker],
+        walker_list: Sequence[Walker],
         obstacles: Optional[List[Obstacle]] = None,
+        consumed: Optional[Set[int]] = None,
+        profiler: Optional[Profiler] = None,
     ) -> None:
         """
         Moves the walker according to the given move and handles collisions with obstacles.
 
+        The gravity of the other walkers is applied once, after the move and every
+        move a speed zone restarted, like the batch engine does it once per step.
+
         Args:
             walker (Walker): The walker object to move.
             move (Move): The move to apply to the walker.
-            walker_list (List[Walker]): A list of all walkers in the grid.
-            obstacles (Optional[List[Obstacle]]): The remaining obstacles, if not provided it will use all of the obstacles in the grid.
+            walker_list (Sequence[Walker]): A list of all walkers in the grid, or their WalkerPopulation.
+            obstacles (Optional[List[Obstacle]]): The obstacles to check, if not provided it will use all of the obstacles in the grid.
+            consumed (Optional[Set[int]]): The obstacles already hit during this move, they are skipped.
+                By store index, or by id when the obstacles are provided.
+            profiler (Optional[Profiler]): Times the collision and gravity phases of the walker, not timed if not provided.
 
         Returns:
             None
         """
+        self._move(self.__scene, walker, move, obstacles, consumed, profiler)
+        started = profiler.start() if profiler is not None else 0.0
+        walker.translate(self._gravity_vector(walker, walker_list))
+        if profiler is not None:
+            profiler.stop("gravity", started)
+
+    def _move(
+        self,
+        scene: GridScene,
+        walker: Walker,
+        move: Move,
+        obstacles: Optional[List[Obstacle]],
+        consumed: Optional[Set[int]],
+        profiler: Optional[Profiler],
+    ) -> None:
+        """
+        Moves the walker against a scene without gravity, the whole move, speed zones
+        included, sees the same scene.
+
+        Args:
+            scene (GridScene): The scene read at the start of the move.
+            walker (Walker): The walker object to move.
+            move (Move): The move to apply to the walker.
+            obstacles (Optional[List[Obstacle]]): The obstacles to check, if not provided it will use the obstacles of the scene.
+            consumed (Optional[Set[int]]): The obstacles already hit during this move, they are skipped.
+            profiler (Optional[Profiler]): Times the collision phase of the walker, not timed if None.
+        """
+        started = profiler.start() if profiler is not None else 0.0
         # calculating the uninterrupted move
         starting_location = walker.get_location()
         walker.move(move)
         final_location = walker.get_location()
 
+        if consumed is None:
+            consumed = set()
+        # the type code, target and speed factor of the closest hit
+        hit_kind = ObstacleStore.NO_HIT
+        target: Union[Types.vector3, np.ndarray] = (0, 0, 0)
+        speed_factor = 1.0
         if obstacles is None:
-            obstacles = copy.deepcopy(self._obstacles)
-
-        # getting all hit obstacles
-        hit_obstacles = [
-            obstacle
-            for obstacle in obstacles
-            if obstacle.detect_colision(starting_location, final_location)
-        ]
-        # finding the closest hit
-        closest_hit = self.find_closest(hit_obstacles, starting_location)
-
-        if closest_hit:
+            # only the obstacles near the movement can be hit
+            store = scene.get_store()
+            if scene.is_store_only():
+                nearby = store.query_segment(starting_location, final_location).tolist()
+            else:
+                store_indices = scene.get_store_indices()
+                nearby = [
+                    store_indices[obstacle]
+                    for obstacle in scene.get_spatial_hash().query_segment(
+                        starting_location, final_location
+                    )
+                ]
+            closest_index = store.first_hit(
+                starting_location,
+                final_location,
+                [index for index in nearby if index not in consumed],
+            )
+            if closest_index != ObstacleStore.NO_HIT:
+                consumed.add(closest_index)
+                hit_kind = int(store.get_kinds()[closest_index])
+                target = store.get_targets()[closest_index]
+                speed_factor = float(store.get_speed_factors()[closest_index])
+        else:
+            # getting all hit obstacles, skipping the ones already hit during this move
+            hit_obstacles = [
+                obstacle
+                for obstacle in obstacles
+                if id(obstacle) not in consumed
+                and obstacle.detect_colision(starting_location, final_location)
+            ]
+            # finding the closest hit
+            closest_hit = self.find_closest(hit_obstacles, starting_location)
+            if closest_hit:
+                consumed.add(id(closest_hit))
+                hit_kind, target, speed_factor = ObstacleStore.record_of(closest_hit)
+        if profiler is not None:
+            profiler.stop("collision", started)
+
+        if hit_kind != ObstacleStore.NO_HIT:
+            if profiler is not None:
+                profiler.count("collisions")
             # performing an action based on the type of obstacle hit
-            obstacles.remove(closest_hit)
-            if type(closest_hit) == SpeedZone:
+            if hit_kind == ObstacleStore.SPEED_ZONE:
                 walker.move_to(starting_location)
                 scaled_move = move
-                scaled_move.scale_radius(closest_hit.get_speed_factor())
-                self.move(walker, scaled_move, walker_list, obstacles)
-            if type(closest_hit) == Teleporter:
-                walker.move_to(closest_hit.get_target())
-            elif type(closest_hit) == Obstacle:
+                scaled_move.scale_radius(speed_factor)
+                self._move(scene, walker, scaled_move, obstacles, consumed, profiler)
+            elif hit_kind == ObstacleStore.TELEPORTER:
+                walker.move_to(target)
+            else:
                 walker.move_to(starting_location)
-        walker.move(self.get_gravity_effect(walker, walker_list))
 
     def get_obstacles(self) -> List[Obstacle]:
         """
@@ -260,7 +439,7 @@ class Grid(object):
         Returns:
             List[Obstacle]: A list of obstacles in the grid.
         """
-        return self._obstacles
+        return self.__scene.get_obstacles()
 
     def set_obstacles(self, obstacles: List[Obstacle]) -> None:
         """
@@ -269,4 +448,5 @@ class Grid(object):
         Args:
             obstacles (List[Obstacle]): A list of obstacles to be set on the grid.
         """
-        self._obstacles = obstacles
+        # only the obstacles that changed are hashed and compiled
+        self.__scene = self.__scene.replaced(obstacles)
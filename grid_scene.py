@@ -0,0 +1,159 @@
+from obstacle import Obstacle
+from obstacle_store import ObstacleStore
+from spatial_hash import SpatialHash
+import numpy as np
+from typing import Dict, List, Optional, Sequence
+
+
+class GridScene(object):
+
+    def __init__(
+        self,
+        obstacles: Sequence[Obstacle],
+        store: Optional[ObstacleStore] = None,
+        spatial_hash: Optional[SpatialHash[Obstacle]] = None,
+    ) -> None:
+        """
+        Initializes a GridScene object, the obstacles of a grid with everything
+        that is built from them.
+
+        A scene is never changed once it is built, the grid replaces its scene as a
+        whole, so a move that read the scene sees obstacles, a spatial hash, a store
+        and store indices that all belong together.
+
+        A store with other records than the obstacles, like a store opened from a
+        binary scene file without obstacle objects, is searched by itself instead of
+        through the spatial hash.
+
+        A scene loaded from a config is built whole, while extended and replaced
+        build the next scene from this one, hashing and compiling only the obstacles
+        that changed.
+
+        Args:
+            obstacles (Sequence[Obstacle]): The obstacles.
+            store (Optional[ObstacleStore], optional): The obstacles as arrays. Defaults to None, which compiles the obstacles.
+            spatial_hash (Optional[SpatialHash[Obstacle]], optional): The spatial hash over exactly the obstacles,
+                not changed afterwards. Defaults to None, which hashes the obstacles.
+        """
+        self.__obstacles = list(obstacles)
+        if spatial_hash is None:
+            spatial_hash = SpatialHash()
+            for obstacle in self.__obstacles:
+                spatial_hash.insert(
+                    obstacle, obstacle.get_location(), obstacle.get_radius()
+                )
+        self.__spatial_hash = spatial_hash
+        self.__store = (
+            ObstacleStore.from_obstacles(self.__obstacles) if store is None else store
+        )
+        self.__store_indices: Dict[Obstacle, int] = {
+            obstacle: index for index, obstacle in enumerate(self.__obstacles)
+        }
+        self.__store_only = len(self.__store) != len(self.__obstacles)
+
+    def extended(self, obstacles: Sequence[Obstacle]) -> "GridScene":
+        """
+        Builds the scene with more obstacles, after the ones of this scene.
+
+        Only the new obstacles are hashed, into a copy of the spatial hash, and
+        compiled, after the arrays of the store. A store searched by itself has no
+        obstacle objects to keep, so the new scene only holds the new obstacles.
+
+        Args:
+            obstacles (Sequence[Obstacle]): The obstacles to add.
+
+        Returns:
+            GridScene: The new scene, this one is left as it is.
+        """
+        if self.__store_only:
+            return GridScene(obstacles)
+        spatial_hash = self.__spatial_hash.copy()
+        for obstacle in obstacles:
+            spatial_hash.insert(obstacle, obstacle.get_location(), obstacle.get_radius())
+        store = ObstacleStore.concatenate(
+            [self.__store, ObstacleStore.from_obstacles(obstacles)]
+        )
+        return GridScene([*self.__obstacles, *obstacles], store, spatial_hash)
+
+    def replaced(self, obstacles: Sequence[Obstacle]) -> "GridScene":
+        """
+        Builds the scene with other obstacles, like a reload that swaps the obstacle set.
+
+        The obstacles that are not in this scene are hashed into a copy of the
+        spatial hash, the ones that are gone are removed from it, and the kept
+        obstacles take their records from the store, so only the changes are compiled.
+
+        Args:
+            obstacles (Sequence[Obstacle]): The obstacles of the new scene.
+
+        Returns:
+            GridScene: The new scene, this one is left as it is.
+        """
+        if self.__store_only:
+            return GridScene(obstacles)
+        kept = set(obstacles)
+        spatial_hash = self.__spatial_hash.copy()
+        for obstacle in self.__obstacles:
+            if obstacle not in kept:
+                spatial_hash.remove(obstacle)
+        added = [
+            obstacle for obstacle in obstacles if obstacle not in self.__store_indices
+        ]
+        for obstacle in added:
+            spatial_hash.insert(obstacle, obstacle.get_location(), obstacle.get_radius())
+
+        # the kept records are taken from this store, the new ones are appended
+        indices = np.array(
+            [self.__store_indices.get(obstacle, -1) for obstacle in obstacles], np.int64
+        )
+        new = indices < 0
+        indices[new] = len(self.__store) + np.arange(int(new.sum()))
+        store = ObstacleStore.concatenate(
+            [self.__store, ObstacleStore.from_obstacles(added)]
+        ).take(indices)
+        return GridScene(obstacles, store, spatial_hash)
+
+    def get_obstacles(self) -> List[Obstacle]:
+        """
+        Returns the obstacles of the scene.
+
+        Returns:
+            List[Obstacle]: The obstacles, in the same order as the store.
+        """
+        return self.__obstacles
+
+    def get_spatial_hash(self) -> SpatialHash[Obstacle]:
+        """
+        Returns the spatial hash over the obstacles.
+
+        Returns:
+            SpatialHash[Obstacle]: The spatial hash.
+        """
+        return self.__spatial_hash
+
+    def get_store(self) -> ObstacleStore:
+        """
+        Returns the obstacles as arrays.
+
+        Returns:
+            ObstacleStore: The obstacle store.
+        """
+        return self.__store
+
+    def get_store_indices(self) -> Dict[Obstacle, int]:
+        """
+        Returns the store index of every obstacle.
+
+        Returns:
+            Dict[Obstacle, int]: The store indices.
+        """
+        return self.__store_indices
+
+    def is_store_only(self) -> bool:
+        """
+        Returns whether the store is searched by itself, without the obstacles.
+
+        Returns:
+            bool: True if the store has other records than the obstacles.
+        """
+        return self.__store_only
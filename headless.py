@@ -0,0 +1,235 @@
+from grid import Grid
+from gravity import BarnesHutGravity
+from simulation import Simulation
+from log_store import LogStore
+from null_screen import NullScreen
+from null_progress import NullProgress
+from random_streams import RandomStreams
+from walker import Walker
+from threading import Event
+from typing import Callable, Dict, List, Optional
+import argparse
+import os
+import importlib
+import sys
+
+
+HELP_STRING = """
+Runs the simulation without the GUI, for batch runs on machines without a display.
+
+Walkers are given as TYPE[:key=value,...], for example
+    python headless.py --walker straight --walker biased:name=b,3d=true,bias=Up
+The available keys are name, 3d, mass, bias, bias_scale and acceleration.
+"""
+
+# walker type -> (module, class), the modules are only imported when used
+WALKER_TYPES: Dict[str, List[str]] = {
+    "straight": ["straight_walker", "StraightWalker"],
+    "random": ["random_walker", "RandomWalker"],
+    "random-angle": ["random_angle_walker", "RandomAngleWalker"],
+    "resetable": ["resetable_walker", "ResetableWalker"],
+    "biased": ["biased_walker", "BiasedWalker"],
+    "accelerating": ["accelerating_walker", "AcceleratingWalker"],
+    "stocks": ["stock_walker", "StockWalker"],
+}
+GRAVITY_SOLVERS = ["exact", "barnes-hut"]
+
+
+def _parse_bool(value: str) -> bool:
+    """
+    Parses a boolean walker option.
+
+    Args:
+        value (str): The option value.
+
+    Raises:
+        ValueError: If the value is not a boolean.
+
+    Returns:
+        bool: The parsed value.
+    """
+    if value.lower() in ["1", "true", "yes", "y"]:
+        return True
+    if value.lower() in ["0", "false", "no", "n"]:
+        return False
+    raise ValueError(f"invalid boolean: {value}")
+
+
+def parse_walker(
+    spec: str, index: int, random_streams: Optional[RandomStreams] = None
+) -> Walker:
+    """
+    Creates a walker from a command line spec.
+
+    Args:
+        spec (str): The spec, TYPE[:key=value,...].
+        index (int): The index of the walker, used for the default name and its setup stream.
+        random_streams (Optional[RandomStreams], optional): Draws the settings that are
+            not given, like a random bias. Defaults to None, which uses fresh entropy.
+
+    Raises:
+        ValueError: If the spec is not valid.
+
+    Returns:
+        Walker: The walker.
+    """
+    walker_type, _, option_string = spec.partition(":")
+    walker_type = walker_type.strip().lower()
+    if walker_type not in WALKER_TYPES:
+        raise ValueError(f"unknown walker type: {walker_type}")
+
+    options: Dict[str, str] = {}
+    for option in filter(None, option_string.split(",")):
+        key, separator, value = option.partition("=")
+        if not separator:
+            raise ValueError(f"invalid walker option: {option}")
+        options[key.strip().lower()] = value.strip()
+
+    unknown = set(options) - {"name", "3d", "mass", "bias", "bias_scale", "acceleration"}
+    if unknown:
+        raise ValueError(f"unknown walker options: {', '.join(sorted(unknown))}")
+
+    name = options.get("name", f"{walker_type}{index}")
+    is_3d = _parse_bool(options.get("3d", "false"))
+    mass = float(options.get("mass", "1"))
+
+    module_name, class_name = WALKER_TYPES[walker_type]
+    walker_class = getattr(importlib.import_module(module_name), class_name)
+    if walker_type == "biased":
+        walker: Walker = walker_class(
+            name,
+            is_3d,
+            mass,
+            options.get("bias", ""),
+            int(options.get("bias_scale", "1")),
+            (random_streams or RandomStreams()).setup_generator(index),
+        )
+    elif walker_type == "accelerating":
+        walker = walker_class(
+            name, is_3d, mass, options.get("acceleration", "Linear")
+        )
+    elif walker_type == "stocks":
+        walker = walker_class(name, mass)
+    else:
+        walker = walker_class(name, is_3d, mass)
+    return walker
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Builds the command line parser.
+
+    Returns:
+        argparse.ArgumentParser: The parser.
+    """
+    parser = argparse.ArgumentParser(
+        description=HELP_STRING, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "-w",
+        "--walker",
+        action="append",
+        required=True,
+        help=f"a walker spec, can be repeated. types: {', '.join(WALKER_TYPES)}",
+    )
+    parser.add_argument("-c", "--config", default="", help="an obstacle config JSON file or binary scene file")
+    parser.add_argument("-n", "--simulation-count", type=int, default=10)
+    parser.add_argument("-s", "--max-steps", type=int, default=10)
+    parser.add_argument(
+        "-o", "--output", default="output", help="the folder for the logs and graphs"
+    )
+    parser.add_argument("--backend", choices=Simulation.BACKENDS, default="Batch")
+    parser.add_argument(
+        "--log-format",
+        choices=LogStore.FORMATS,
+        default="json",
+        help="JSON lists, or typed npz columns for long runs",
+    )
+    parser.add_argument("--gravity", choices=GRAVITY_SOLVERS, default="exact")
+    parser.add_argument(
+        "--theta", type=float, default=0.5, help="the Barnes-Hut opening angle"
+    )
+    parser.add_argument(
+        "--seed", type=int, default=None, help="seeds the walkers for a reproducible run"
+    )
+    parser.add_argument("--no-graphs", action="store_true", help="only write the logs")
+    parser.add_argument(
+        "--no-statistics",
+        action="store_true",
+        help="don't stream the std, confidence intervals and quantiles into the logs",
+    )
+    return parser
+
+
+def main(
+    argv: Optional[List[str]] = None,
+    progress_callback: Optional[Callable[[float], None]] = None,
+) -> int:
+    """
+    Runs a headless simulation.
+
+    Args:
+        argv (Optional[List[str]], optional): The command line arguments, sys.argv if not provided. Defaults to None.
+        progress_callback (Optional[Callable[[float], None]], optional): Called with the progress. Defaults to None.
+
+    Returns:
+        int: The exit code.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.simulation_count <= 0 or args.max_steps <= 0:
+        parser.error("the simulation count and max steps must be positive")
+
+    # the seed also draws the random biases, so a seeded run is reproduced whole
+    random_streams = RandomStreams(args.seed)
+    try:
+        walker_list = [
+            parse_walker(spec, index, random_streams)
+            for index, spec in enumerate(args.walker)
+        ]
+    except ValueError as error:
+        parser.error(str(error))
+    if len({walker.get_name() for walker in walker_list}) != len(walker_list):
+        parser.error("the walker names must be unique")
+
+    grid = Grid()
+    if args.gravity == "barnes-hut":
+        grid.set_gravity_solver(
+            BarnesHutGravity(
+                args.theta,
+                gravity_constant=grid.get_gravity_solver().get_gravity_constant(),
+            )
+        )
+    simulation = Simulation(
+        grid, NullScreen(), args.simulation_count, args.max_steps
+    )
+    if args.config and not simulation.config(args.config):
+        print(f"invalid config file: {args.config}", file=sys.stderr)
+        return 1
+    simulation.set_backend(args.backend)
+    simulation.set_log_format(args.log_format)
+    simulation.set_seed(args.seed)
+    simulation.set_streaming_statistics(not args.no_statistics)
+
+    output = args.output.rstrip("/")
+    simulation.set_logs_folder(f"{output}/logs/")
+    graph_output_folder = "" if args.no_graphs else f"{output}/graphs"
+    if graph_output_folder:
+        os.makedirs(graph_output_folder, exist_ok=True)
+    simulation.simulate_batch(
+        walker_list,
+        Event(),
+        NullProgress(progress_callback),
+        graph_output_folder,
+    )
+    # the graphs are drawn in their own processes, waiting for them before exiting
+    try:
+        simulation.wait_for_graphs()
+    except Exception as error:
+        print(f"could not draw the graphs: {error}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
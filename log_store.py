@@ -0,0 +1,166 @@
+import json
+import numpy as np
+from typing import Any, Dict, Mapping, Optional, Sequence
+
+
+class LogStore(object):
+
+    FORMATS = ["json", "npz"]
+    # the columns that are not float64
+    __COLUMN_TYPES: Dict[str, Any] = {"time_to_leave": np.int64}
+    # the nested statistics are flattened into columns named statistics.<metric>.<field>
+    __STATISTICS_PREFIX = "statistics."
+
+    def __init__(self, log_format: str = "json") -> None:
+        """
+        Initializes a LogStore object, the reader and writer of the walker logs.
+
+        A log is a set of named columns, a value for every step or every repetition.
+        The json format keeps them as lists in a JSON object, like the logs always
+        were. The npz format keeps every column as a typed array in its own member
+        of an .npz archive, so a reader only loads the columns it asks for, and the
+        writer never turns the values into text.
+
+        Args:
+            log_format (str, optional): The format of the written logs, one of FORMATS. Defaults to "json".
+
+        Raises:
+            ValueError: If the format is not one of FORMATS.
+        """
+        if log_format not in self.FORMATS:
+            raise ValueError(f"the log format must be one of {self.FORMATS}")
+        self.__format = log_format
+
+    def get_format(self) -> str:
+        """
+        Returns the format of the written logs.
+
+        Returns:
+            str: The format.
+        """
+        return self.__format
+
+    def path(self, folder: str, name: str) -> str:
+        """
+        Returns the path of a walker's log.
+
+        Args:
+            folder (str): The logs folder, ending with a slash.
+            name (str): The walker name.
+
+        Returns:
+            str: The path, with the extension of the format.
+        """
+        return f"{folder}{name}.{self.__format}"
+
+    def save(
+        self,
+        path: str,
+        columns: Mapping[str, Sequence[float]],
+        statistics: Optional[Mapping[str, Mapping[str, Sequence[float]]]] = None,
+    ) -> None:
+        """
+        Writes a log.
+
+        Args:
+            path (str): The path of the log.
+            columns (Mapping[str, Sequence[float]]): The columns by name.
+            statistics (Optional[Mapping[str, Mapping[str, Sequence[float]]]], optional): The summary of
+                the streaming statistics of every metric, saved under "statistics". Defaults to None.
+        """
+        if self.__format == "json":
+            data: Dict[str, Any] = {
+                key: values.tolist() if isinstance(values, np.ndarray) else list(values)
+                for key, values in columns.items()
+            }
+            if statistics is not None:
+                data["statistics"] = {
+                    metric: {field: list(values) for field, values in summary.items()}
+                    for metric, summary in statistics.items()
+                }
+            with open(path, "w") as f:
+                json.dump(data, f)
+            return
+
+        arrays = {
+            key: np.asarray(values, self.__COLUMN_TYPES.get(key, np.float64))
+            for key, values in columns.items()
+        }
+        for metric, summary in (statistics or {}).items():
+            for field, values in summary.items():
+                arrays[f"{self.__STATISTICS_PREFIX}{metric}.{field}"] = np.asarray(
+                    values, np.float64
+                )
+        # writing through a file object keeps the path as it is, without an added extension
+        with open(path, "wb") as f:
+            np.savez(f, **arrays)  # type: ignore[arg-type]
+
+    @staticmethod
+    def load(path: str, columns: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """
+        Reads the columns of a log, in either format.
+
+        Args:
+            path (str): The path of the log, an .npz log is read as columns and any other as JSON.
+            columns (Optional[Sequence[str]], optional): The columns to read, all the top level
+                columns if not provided. Defaults to None.
+
+        Raises:
+            KeyError: If a column is not in the log.
+
+        Returns:
+            Dict[str, np.ndarray]: The columns by name.
+        """
+        if path.endswith(".npz"):
+            # the members are only read when they are accessed
+            with np.load(path) as archive:
+                names = (
+                    [
+                        name
+                        for name in archive.files
+                        if not name.startswith(LogStore.__STATISTICS_PREFIX)
+                    ]
+                    if columns is None
+                    else list(columns)
+                )
+                return {name: archive[name] for name in names}
+
+        with open(path, "r") as f:
+            data = json.load(f)
+        names = (
+            [name for name in data if name != "statistics"]
+            if columns is None
+            else list(columns)
+        )
+        return {name: np.asarray(data[name], np.float64) for name in names}
+
+    @staticmethod
+    def load_statistics(path: str) -> Dict[str, Dict[str, np.ndarray]]:
+        """
+        Reads the summary of the streaming statistics of a log, in either format.
+
+        Args:
+            path (str): The path of the log.
+
+        Returns:
+            Dict[str, Dict[str, np.ndarray]]: The fields (mean, std, ...) of every metric,
+            empty if the log has no statistics.
+        """
+        statistics: Dict[str, Dict[str, np.ndarray]] = {}
+        if path.endswith(".npz"):
+            with np.load(path) as archive:
+                for name in archive.files:
+                    if name.startswith(LogStore.__STATISTICS_PREFIX):
+                        metric, field = name[len(LogStore.__STATISTICS_PREFIX) :].rsplit(
+                            ".", 1
+                        )
+                        statistics.setdefault(metric, {})[field] = archive[name]
+            return statistics
+
+        with open(path, "r") as f:
+            data = json.load(f)
+        for metric, summary in data.get("statistics", {}).items():
+            statistics[metric] = {
+                field: np.asarray(values, np.float64) for field, values in summary.items()
+            }
+        return statistics
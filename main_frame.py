@@ -4,7 +4,12 @@ from start_frame import StartFrame
 from config_choose_frame import ConfigChooseFrame
 from walker_config_frame import WalkerConfigFrame
 from simulation import Simulation
+from simulation_barrier import SimulationBarrier
+from population_state import PopulationState
+from walker_population import WalkerPopulation
 import threading
+import queue
+from tkinter import messagebox
 from straight_walker import StraightWalker
 import os
 import shutil
@@ -15,6 +20,7 @@ from typing import Optional
 class MainFrame(ctk.CTkFrame):  # type: ignore[misc]
 
     __FOLDER_PREFIX = "GRAPHS"
+    __GRAPHS_POLL_MS = 200
 
     def __init__(
         self, tab_master: ctk.CTkFrame, master: ctk.CTkFrame, simulation: Simulation
@@ -39,6 +45,10 @@ class MainFrame(ctk.CTkFrame):  # type: ignore[misc]
 
         self.stop_event = threading.Event()
         self.simulation = simulation
+        # the graph processes report every saved walker here, the GUI thread reads it
+        self.__saved_graphs: "queue.Queue[str]" = queue.Queue()
+        self.simulation.set_graphs_callback(self.__saved_graphs.put)
+        self.__running = False
 
         self.start_frame = StartFrame(self)
         self.config_choose_frame = ConfigChooseFrame(self)
@@ -83,6 +93,7 @@ class MainFrame(ctk.CTkFrame):  # type: ignore[misc]
             graph_output_folder (str, optional): Folder path to save the output graphs. Defaults to "".
         """
         self.stop_event.clear()
+        self.__running = True
 
         if graph_output_folder:
             # adding the folder prefix to the output folder
@@ -92,6 +103,8 @@ class MainFrame(ctk.CTkFrame):  # type: ignore[misc]
                 shutil.rmtree(graph_output_folder)
             # making the folder
             os.mkdir(graph_output_folder)
+            # showing the graphs as the graph processes save them
+            self.after(self.__GRAPHS_POLL_MS, self.check_graphs)
         # setting the simulation count and max steps if they are provided
         if simulation_count:
             self.simulation.set_simulation_count(simulation_count)
@@ -103,31 +116,47 @@ class MainFrame(ctk.CTkFrame):  # type: ignore[misc]
                 target=self.simulation.run_visual, args=[self.stop_event]
             )
             visual_thread.start()
-        # getting the events to detect when each walker is done
         walker_thread_list: List[threading.Thread] = []
         walker_list = self.walker_config_frame.get_walkers()
-        run_event_dict = {walker: threading.Event() for walker in walker_list}
-        # starting the simulation for each walker
-        for walker in walker_list:
-            output_path = None
-            if graph_output_folder:
-                output_path = f"{graph_output_folder}/{walker.get_name()}"
-
-            walker_thread = threading.Thread(
-                target=self.simulation.simulate,
-                args=[
-                    walker,
-                    self.stop_event,
-                    run_event_dict,
-                    progress_var,
-                    walker_list,
-                    visual,
-                    output_path,
-                ],
+        if visual:
+            # the walkers move inside one set of arrays that the gravity reads directly
+            walker_population = WalkerPopulation(walker_list)
+            # the barrier keeps the walkers on the same repetition
+            population_state = PopulationState(walker_list, self.simulation.get_max_steps())
+            barrier = SimulationBarrier(
+                len(walker_list), self.stop_event, population_state.finish_repetition
+            )
+            # starting the simulation for each walker
+            for walker in walker_list:
+                output_path = None
+                if graph_output_folder:
+                    output_path = f"{graph_output_folder}/{walker.get_name()}"
+
+                walker_thread = threading.Thread(
+                    target=self.simulation.simulate,
+                    args=[
+                        walker,
+                        self.stop_event,
+                        barrier,
+                        population_state,
+                        progress_var,
+                        walker_population,
+                        visual,
+                        output_path,
+                    ],
+                )
+                walker_thread.start()
+
+                walker_thread_list.append(walker_thread)
+        else:
+            # without a screen to draw on, all the walkers run together in the batch engine
+            batch_thread = threading.Thread(
+                target=self.simulation.simulate_batch,
+                args=[walker_list, self.stop_event, progress_var, graph_output_folder],
             )
-            walker_thread.start()
+            batch_thread.start()
 
-            walker_thread_list.append(walker_thread)
+            walker_thread_list.append(batch_thread)
         # waiting for all walkers to finish
         self.wait_to_stop(walker_thread_list)
 
@@ -143,12 +172,43 @@ class MainFrame(ctk.CTkFrame):  # type: ignore[misc]
         """
         if all([not walker_thread.is_alive() for walker_thread in walker_thread_list]):
             # if all walkers are done, stop the simulation and the start frame
+            self.__running = False
             self.simulation.stop()
             self.start_frame.stop()
         else:
             # if the walkers are still running, wait for 50 ms and check again
             self.after(50, self.wait_to_stop, walker_thread_list)
 
+    def check_graphs(self) -> List[str]:
+        """
+        Shows the graphs that were saved since the last check in the graph viewer,
+        reports the ones that could not be drawn, and keeps checking while graphs
+        are still being drawn.
+
+        Returns:
+            List[str]: The path prefixes of the walkers whose graphs were saved.
+        """
+        saved: List[str] = []
+        while not self.__saved_graphs.empty():
+            saved.append(self.__saved_graphs.get())
+        if saved:
+            graph_viewer_frame = self.main_master.graph_viewer_frame
+            graph_viewer_frame.update_folders_list()
+            graph_viewer_frame.update_paths()
+        failures = self.simulation.take_graph_failures()
+        if failures:
+            messagebox.showerror(
+                "Graphs",
+                "\n".join(
+                    f"could not draw the graphs of {path}: {error}"
+                    for path, error in failures
+                ),
+            )
+        # the walkers queue their graphs before their threads end
+        if self.__running or self.simulation.get_pending_graphs():
+            self.after(self.__GRAPHS_POLL_MS, self.check_graphs)
+        return saved
+
     def update_speed(self, value: float) -> None:
         """
         Updates the speed of the simulation.
@@ -188,6 +248,24 @@ class MainFrame(ctk.CTkFrame):  # type: ignore[misc]
         """
         self.simulation.set_max_steps(value)
 
+    def update_backend(self, value: str) -> None:
+        """
+        Updates the backend used for the non-visual runs.
+
+        Args:
+            value (str): The new backend.
+        """
+        self.simulation.set_backend(value)
+
+    def get_backend(self) -> str:
+        """
+        Returns the backend used for the non-visual runs.
+
+        Returns:
+            str: The backend.
+        """
+        return self.simulation.get_backend()
+
     def get_max_steps(self) -> int:
         """
         Returns the maximum number of steps for the simulation.
@@ -2,21 +2,43 @@ import random
 import math
 from custom_types import *
 import numpy as np
-from typing import TYPE_CHECKING
+from typing import Optional, Sequence, Tuple, Union, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from move import Move
 
 class MathFunctions():
     @staticmethod
-    def random_angle() -> float:
+    def random_angle(rng: Optional[np.random.Generator] = None) -> float:
         """
         Generate a random angle between 0 and 2pi.
 
+        Args:
+            rng (Optional[np.random.Generator], optional): The generator to draw from, the random module if not provided. Defaults to None.
+
         Returns:
             float: A random angle between 0 and 2pi.
         """
-        return random.random() * 2 * math.pi
+        if rng is None:
+            return random.random() * 2 * math.pi
+        return float(rng.random()) * 2 * math.pi
+
+    @staticmethod
+    def random_angles(
+        size: Union[int, Tuple[int, ...]], rng: np.random.Generator
+    ) -> np.ndarray:
+        """
+        Generate a block of random angles between 0 and 2pi in one draw.
+
+        Args:
+            size (Union[int, Tuple[int, ...]]): The shape of the block.
+            rng (np.random.Generator): The generator to draw from.
+
+        Returns:
+            np.ndarray: The random angles.
+        """
+        angles: np.ndarray = rng.random(size) * 2 * math.pi
+        return angles
 
     @staticmethod
     def normalize(vec: Types.vector3) -> Types.vector3:
@@ -30,10 +52,13 @@ class MathFunctions():
             Types.vector3: The normalized vector.
 
         """
-        if len(vec) == 0 or np.linalg.norm(vec) == 0:  # type: ignore[no-untyped-call]
+        if len(vec) == 0:
             return vec
-        # casting back to a Types.vector3
-        return Types.cast_to_vector3(np.array(vec) / np.linalg.norm(vec))  # type: ignore[no-untyped-call]
+        # the norm is only computed once
+        length = math.hypot(*vec)
+        if length == 0:
+            return vec
+        return (vec[0] / length, vec[1] / length, vec[2] / length)
 
     @staticmethod
     def angle_and_radius_from_vector(vec: Types.vector3) -> Types.vector3:
@@ -46,7 +71,7 @@ class MathFunctions():
         Returns:
             Types.vector3: A tuple containing the yaw, radius, and pitch values.
         """
-        radius = np.linalg.norm(vec)  # type: ignore[no-untyped-call]
+        radius = math.hypot(*vec)
         if radius == 0:
             return (0, 0, 0)
         pitch = math.asin(vec[2] / radius)
@@ -74,6 +99,27 @@ class MathFunctions():
 
         return (x, y, z)
 
+    @staticmethod
+    def vectors_from_angles_and_radii(
+        yaw: np.ndarray, radius: np.ndarray, pitch: np.ndarray
+    ) -> np.ndarray:
+        """
+        Calculates the 3D vectors of arrays of yaw, radius, and pitch values.
+
+        Args:
+            yaw (np.ndarray): The yaw angles in radians.
+            radius (np.ndarray): The radii of the vectors.
+            pitch (np.ndarray): The pitch angles in radians.
+
+        Returns:
+            np.ndarray: The vectors, in the shape of the inputs with an extra axis of 3.
+        """
+        floor_radius = radius * np.cos(pitch)
+        return np.stack(
+            [floor_radius * np.cos(yaw), floor_radius * np.sin(yaw), radius * np.sin(pitch)],
+            axis=-1,
+        )
+
     @staticmethod
     def add_move(location: Types.vector3, move: "Move") -> Types.vector3:
         """
@@ -87,7 +133,11 @@ class MathFunctions():
             Types.vector3: The new location after adding the move.
         """
         move_vector = MathFunctions.vector_from_angle_and_radius(*move.angle_and_radius())
-        return Types.cast_to_vector3(np.add(location, move_vector))
+        return (
+            location[0] + move_vector[0],
+            location[1] + move_vector[1],
+            location[2] + move_vector[2],
+        )
 
     @staticmethod
     def dist(vec1: Types.vector3, vec2: Types.vector3) -> float:
@@ -101,4 +151,104 @@ class MathFunctions():
         Returns:
             float: The Euclidean distance between the two vectors.
         """
-        return float(np.linalg.norm(np.subtract(vec2, vec1)))  # type: ignore[no-untyped-call]
+        return math.dist(vec1, vec2)
+
+    @staticmethod
+    def norm(vec: Sequence[float]) -> float:
+        """
+        Calculate the length of a vector, without the overhead of a NumPy call.
+
+        Args:
+            vec (Sequence[float]): The vector.
+
+        Returns:
+            float: The length of the vector.
+        """
+        return math.hypot(*vec)
+
+    @staticmethod
+    def subtract(vec1: Types.vector3, vec2: Types.vector3) -> Types.vector3:
+        """
+        Subtract a 3D vector from another.
+
+        Args:
+            vec1 (Types.vector3): The first 3D vector.
+            vec2 (Types.vector3): The 3D vector to subtract.
+
+        Returns:
+            Types.vector3: vec1 - vec2.
+        """
+        return (vec1[0] - vec2[0], vec1[1] - vec2[1], vec1[2] - vec2[2])
+
+    @staticmethod
+    def dot(vec1: Types.vector3, vec2: Types.vector3) -> float:
+        """
+        Calculate the dot product of two 3D vectors.
+
+        Args:
+            vec1 (Types.vector3): The first 3D vector.
+            vec2 (Types.vector3): The second 3D vector.
+
+        Returns:
+            float: The dot product.
+        """
+        return vec1[0] * vec2[0] + vec1[1] * vec2[1] + vec1[2] * vec2[2]
+
+    @staticmethod
+    def norms(vectors: np.ndarray) -> np.ndarray:
+        """
+        Calculate the lengths of an array of vectors.
+
+        Args:
+            vectors (np.ndarray): The (..., 3) vectors.
+
+        Returns:
+            np.ndarray: The (...) lengths.
+        """
+        lengths: np.ndarray = np.sqrt(np.einsum("...i,...i->...", vectors, vectors))
+        return lengths
+
+    @staticmethod
+    def dists(vectors1: np.ndarray, vectors2: np.ndarray) -> np.ndarray:
+        """
+        Calculate the Euclidean distances between two arrays of vectors.
+
+        Args:
+            vectors1 (np.ndarray): The (..., 3) first vectors.
+            vectors2 (np.ndarray): The (..., 3) second vectors, broadcast against the first.
+
+        Returns:
+            np.ndarray: The (...) distances.
+        """
+        return MathFunctions.norms(np.subtract(vectors2, vectors1))
+
+    @staticmethod
+    def normalize_vectors(vectors: np.ndarray) -> np.ndarray:
+        """
+        Normalize an array of vectors, zero vectors are left as they are.
+
+        Args:
+            vectors (np.ndarray): The (..., 3) vectors.
+
+        Returns:
+            np.ndarray: The (..., 3) normalized vectors.
+        """
+        lengths = MathFunctions.norms(vectors)[..., np.newaxis]
+        return vectors / np.where(lengths == 0, 1, lengths)
+
+    @staticmethod
+    def angles_and_radii_from_vectors(vectors: np.ndarray) -> np.ndarray:
+        """
+        Calculates the yaw, radius and pitch of an array of vectors.
+
+        Args:
+            vectors (np.ndarray): The (..., 3) vectors.
+
+        Returns:
+            np.ndarray: The (..., 3) yaw, radius and pitch values, zero for zero vectors.
+        """
+        radius = MathFunctions.norms(vectors)
+        safe_radius = np.where(radius == 0, 1, radius)
+        pitch = np.arcsin(np.clip(vectors[..., 2] / safe_radius, -1, 1))
+        yaw = np.where(radius == 0, 0, np.arctan2(vectors[..., 1], vectors[..., 0]))
+        return np.stack([yaw, radius, pitch], axis=-1)
@@ -0,0 +1,66 @@
+from typing import Any, Dict
+
+
+class NullProfiler:
+
+    def __init__(self) -> None:
+        """
+        Initializes a NullProfiler object, a profiler that records nothing.
+
+        It has the interface of Profiler and every hook returns at once without
+        reading the clock. The simulation loops do not call it, they take no profiler
+        when profiling is disabled and skip their hooks.
+        """
+
+    def is_enabled(self) -> bool:
+        """
+        Returns if the profiler records anything.
+
+        Returns:
+            bool: Always False.
+        """
+        return False
+
+    def start(self) -> float:
+        """
+        Does nothing.
+
+        Returns:
+            float: Always 0.
+        """
+        return 0.0
+
+    def stop(self, phase: str, started: float) -> None:
+        """
+        Does nothing.
+
+        Args:
+            phase (str): The phase name.
+            started (float): The value start returned.
+        """
+
+    def count(self, counter: str, amount: int = 1) -> None:
+        """
+        Does nothing.
+
+        Args:
+            counter (str): The counter name.
+            amount (int, optional): The amount to add. Defaults to 1.
+        """
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Returns an empty summary.
+
+        Returns:
+            Dict[str, Any]: An empty dictionary.
+        """
+        return {}
+
+    def write(self, path: str) -> None:
+        """
+        Does nothing.
+
+        Args:
+            path (str): The path of the file.
+        """
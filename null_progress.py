@@ -0,0 +1,36 @@
+from typing import Callable, Optional
+
+
+class NullProgress:
+
+    def __init__(self, callback: Optional[Callable[[float], None]] = None) -> None:
+        """
+        Initializes a NullProgress object, a progress sink for headless runs.
+
+        It has the interface Simulation uses from customtkinter.DoubleVar.
+
+        Args:
+            callback (Optional[Callable[[float], None]], optional): Called with every progress update. Defaults to None.
+        """
+        self.__value = 0.0
+        self.__callback = callback
+
+    def set(self, value: float) -> None:
+        """
+        Sets the progress.
+
+        Args:
+            value (float): The progress fraction.
+        """
+        self.__value = value
+        if self.__callback is not None:
+            self.__callback(value)
+
+    def get(self) -> float:
+        """
+        Gets the progress.
+
+        Returns:
+            float: The progress fraction.
+        """
+        return self.__value
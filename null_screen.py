@@ -0,0 +1,104 @@
+from custom_types import *
+from walker import Walker
+from obstacle import Obstacle
+from threading import Event
+from typing import List
+
+
+class NullScreen:
+
+    def __init__(self) -> None:
+        """
+        Initializes a NullScreen object, a screen that draws nothing.
+
+        Used for headless runs, it has the interface Simulation uses from Screen
+        without importing pygame or OpenGL.
+        """
+        self.__walkers: List[Walker] = []
+        self.__obstacles: List[Obstacle] = []
+        self.__run = False
+
+    def get_walkers(self) -> List[Walker]:
+        """
+        Returns the walkers added to the screen.
+
+        Returns:
+            List[Walker]: The walkers.
+        """
+        return self.__walkers
+
+    def add_walker(self, walker: Walker) -> None:
+        """
+        Adds a walker to the screen.
+
+        Args:
+            walker (Walker): The walker.
+        """
+        self.__walkers.append(walker)
+
+    def remove_walker(self, walker: Walker) -> None:
+        """
+        Removes a walker from the screen.
+
+        Args:
+            walker (Walker): The walker.
+        """
+        self.__walkers.remove(walker)
+
+    def reset_trail(self, walker: Walker) -> None:
+        """
+        Ignores a trail reset.
+
+        Args:
+            walker (Walker): The walker.
+        """
+
+    def add_to_trail(self, walker: Walker, position: Types.vector3) -> None:
+        """
+        Ignores a trail position.
+
+        Args:
+            walker (Walker): The walker.
+            position (Types.vector3): The position.
+        """
+
+    def set_obstacles(self, obstacles: List[Obstacle]) -> None:
+        """
+        Sets the obstacle list on the screen.
+
+        Args:
+            obstacles (List[Obstacle]): The obstacles.
+        """
+        self.__obstacles = obstacles
+
+    def get_obstacles(self) -> List[Obstacle]:
+        """
+        Returns the obstacle list on the screen.
+
+        Returns:
+            List[Obstacle]: The obstacles.
+        """
+        return self.__obstacles
+
+    def run(self, stop_event: Event) -> None:
+        """
+        Returns right away, there is no window to run.
+
+        Args:
+            stop_event (Event): The stop event, left untouched.
+        """
+
+    def close(self) -> None:
+        """Closes the screen."""
+
+    def stop(self) -> None:
+        """Stops the screen."""
+        self.__run = False
+
+    def get_stop(self) -> bool:
+        """Return if the screen is stopped.
+
+        Returns:
+            bool: Is the screen stopped, always True.
+        """
+        return self.__run == False
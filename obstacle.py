@@ -1,6 +1,7 @@
 from custom_types import *
 from move import Move
-import numpy as np
+from math_functions import MathFunctions
+import math
 
 
 class Obstacle(object):
@@ -29,23 +30,24 @@ class Obstacle(object):
         Returns:
             bool: True if there is a collision, False otherwise.
         """
-        movement = np.subtract(final_location, starting_location)
-        obstacle_to_start = np.subtract(starting_location, self.__location)
+        # plain float math, NumPy calls cost more than the arithmetic on 3 values
+        movement = MathFunctions.subtract(final_location, starting_location)
+        obstacle_to_start = MathFunctions.subtract(starting_location, self.__location)
         # completely inside
-        if np.linalg.norm(obstacle_to_start) < self.__radius:  # type: ignore[no-untyped-call]
+        if MathFunctions.norm(obstacle_to_start) < self.__radius:
             return True
         
         # finding the coefficients for the quadratic equation
-        coef_a = np.dot(movement, movement)  # type: ignore[no-untyped-call]
-        coef_b = 2 * np.dot(obstacle_to_start, movement)  # type: ignore[no-untyped-call]
-        coef_c = np.dot(obstacle_to_start, obstacle_to_start) - self.__radius**2  # type: ignore[no-untyped-call]
+        coef_a = MathFunctions.dot(movement, movement)
+        coef_b = 2 * MathFunctions.dot(obstacle_to_start, movement)
+        coef_c = MathFunctions.dot(obstacle_to_start, obstacle_to_start) - self.__radius**2
 
         discriminant = coef_b**2 - 4 * coef_a * coef_c
         if discriminant < 0:
             # no intersection
             return False
         elif coef_a > 0:
-            discriminant = np.sqrt(discriminant)
+            discriminant = math.sqrt(discriminant)
             # cheking to see if the solutions are on the correct part of the line
             solution_1 = (-coef_b - discriminant) / (2 * coef_a)
             solution_2 = (-coef_b + discriminant) / (2 * coef_a)
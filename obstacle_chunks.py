@@ -0,0 +1,255 @@
+from custom_types import *
+from spatial_hash import SpatialHash
+import math
+import numpy as np
+from typing import List, Optional, Tuple
+
+
+class ObstacleChunks:
+
+    # the level of detail of a chunk drawn as points
+    POINTS = -1
+    # the smallest screen radius in pixels that is drawn at all, and as a sphere
+    MIN_PIXELS = 0.5
+    POINT_PIXELS = 3.0
+    # the screen radius in pixels below which every sphere detail level is used
+    DETAIL_PIXELS = [60.0, 20.0]
+
+    # the hash cells a frustum query spans along an axis, at most
+    __QUERY_CELLS = 3
+    # the average amount of obstacles in a chunk, when the chunk size is not given
+    __CHUNK_OBSTACLES = 16
+
+    def __init__(
+        self,
+        centers: np.ndarray,
+        radii: np.ndarray,
+        projection: np.ndarray,
+        height: float,
+        chunk_size: Optional[float] = None,
+    ) -> None:
+        """
+        Initializes an ObstacleChunks object, the obstacles of the screen grouped
+        into chunks for culling.
+
+        Every obstacle belongs to the chunk of the cube of chunk_size its center is
+        in, and every chunk keeps a bounding sphere of its obstacles. The chunks are
+        indexed by a SpatialHash, so a frame only tests the chunks near the view
+        frustum: the frustum is cut at the distance where the biggest obstacle is
+        smaller than MIN_PIXELS, the hash is queried with the bounding box of what
+        is left, and the candidate chunks are tested against the frustum planes.
+        The hash cells are sized from that distance, so a query touches a bounded
+        amount of cells however large the scene is.
+
+        The visible chunks get a level of detail from the screen size of their
+        biggest obstacle at their nearest point: a sphere detail level of the screen,
+        or POINTS when the obstacles are only a few pixels.
+
+        Args:
+            centers (np.ndarray): The (n, 3) centers of the obstacles.
+            radii (np.ndarray): The (n,) radii of the obstacles.
+            projection (np.ndarray): The (4, 4) projection matrix of perspective, row major.
+            height (float): The height of the screen in pixels.
+            chunk_size (Optional[float], optional): The side length of a chunk. Defaults to None, which
+                sizes the chunks to hold about 16 obstacles on average over the extent of the obstacles.
+        """
+        self.__projection = np.asarray(projection, np.float64)
+        # the pixels per unit of size at a distance of one unit
+        self.__pixels = self.__projection[1, 1] * height / 2
+        centers = np.asarray(centers, np.float64).reshape(-1, 3)
+        radii = np.asarray(radii, np.float64).reshape(-1)
+        if chunk_size is None:
+            extent = float(np.max(np.ptp(centers, axis=0))) if len(radii) else 0.0
+            chunk_size = max(
+                extent / np.cbrt(max(len(radii) / self.__CHUNK_OBSTACLES, 1.0)), 1.0
+            )
+        cells = np.floor(centers / chunk_size).astype(np.int64)
+        _, chunk_of, counts = np.unique(
+            cells, axis=0, return_inverse=True, return_counts=True
+        )
+        chunk_of = chunk_of.reshape(-1)
+        order = np.argsort(chunk_of, kind="stable")
+        # the obstacle indices of every chunk, in the order of the obstacles
+        self.__members: List[np.ndarray] = np.split(order, np.cumsum(counts)[:-1])
+        if not len(radii):
+            self.__members = []
+
+        self.__max_radius = float(radii.max()) if len(radii) else 0.0
+        # past this distance even the biggest obstacle is too small to draw
+        self.__reach = float(self.__max_radius * self.__pixels / self.MIN_PIXELS)
+
+        # the bounding spheres of the chunks, reduced over the sorted obstacles
+        starts = np.cumsum(counts) - counts if len(radii) else np.zeros(0, np.int64)
+        sorted_centers = centers[order]
+        sorted_radii = radii[order]
+        if len(radii):
+            low = np.minimum.reduceat(sorted_centers - sorted_radii[:, np.newaxis], starts)
+            high = np.maximum.reduceat(sorted_centers + sorted_radii[:, np.newaxis], starts)
+        else:
+            low = high = np.zeros((0, 3))
+        self.__centers = (low + high) / 2
+        reaches = (
+            np.linalg.norm(sorted_centers - self.__centers[chunk_of[order]], axis=1)
+            + sorted_radii
+        )
+        self.__radii = np.maximum.reduceat(reaches, starts) if len(radii) else np.zeros(0)
+        self.__max_radii = (
+            np.maximum.reduceat(sorted_radii, starts) if len(radii) else np.zeros(0)
+        )
+        self.__spatial_hash: SpatialHash[int] = SpatialHash(
+            max(chunk_size, 2 * self.__reach / self.__QUERY_CELLS)
+        )
+        for chunk, (center, radius) in enumerate(
+            zip(self.__centers.tolist(), self.__radii.tolist())
+        ):
+            self.__spatial_hash.insert(chunk, Types.cast_to_vector3(center), radius)
+
+    def __len__(self) -> int:
+        """
+        Returns the amount of chunks.
+
+        Returns:
+            int: The amount of chunks.
+        """
+        return len(self.__members)
+
+    def get_members(self, chunk: int) -> np.ndarray:
+        """
+        Returns the obstacles of a chunk.
+
+        Args:
+            chunk (int): The chunk index.
+
+        Returns:
+            np.ndarray: The obstacle indices.
+        """
+        return self.__members[chunk]
+
+    @staticmethod
+    def perspective(
+        field_of_view: float, aspect: float, near: float, far: float
+    ) -> np.ndarray:
+        """
+        Builds the matrix of gluPerspective.
+
+        Args:
+            field_of_view (float): The vertical field of view in degrees.
+            aspect (float): The width to height ratio.
+            near (float): The near plane distance.
+            far (float): The far plane distance.
+
+        Returns:
+            np.ndarray: The (4, 4) projection matrix, row major.
+        """
+        focal = 1 / math.tan(math.radians(field_of_view) / 2)
+        return np.array(
+            [
+                [focal / aspect, 0, 0, 0],
+                [0, focal, 0, 0],
+                [0, 0, (far + near) / (near - far), 2 * far * near / (near - far)],
+                [0, 0, -1, 0],
+            ]
+        )
+
+    @staticmethod
+    def look_at(
+        eye: Types.vector3, target: Types.vector3, up: Types.vector3
+    ) -> np.ndarray:
+        """
+        Builds the matrix of gluLookAt.
+
+        Args:
+            eye (Types.vector3): The camera location.
+            target (Types.vector3): The point the camera looks at.
+            up (Types.vector3): The up direction.
+
+        Returns:
+            np.ndarray: The (4, 4) view matrix, row major.
+        """
+        forward = np.subtract(target, eye, dtype=np.float64)
+        forward /= np.linalg.norm(forward)
+        side = np.cross(forward, up)
+        side /= np.linalg.norm(side)
+        true_up = np.cross(side, forward)
+        view = np.identity(4)
+        view[0, :3], view[1, :3], view[2, :3] = side, true_up, -forward
+        view[:3, 3] = -view[:3, :3] @ np.asarray(eye, np.float64)
+        return view
+
+    def get_reach(self) -> float:
+        """
+        Returns the distance past which no obstacle is drawn.
+
+        Returns:
+            float: The distance.
+        """
+        return self.__reach
+
+    def visible(self, view: np.ndarray) -> List[Tuple[int, int]]:
+        """
+        Finds the chunks in the view frustum and their level of detail.
+
+        Args:
+            view (np.ndarray): The (4, 4) view matrix, row major.
+
+        Returns:
+            List[Tuple[int, int]]: The visible chunks with their level of detail, the
+            index of a sphere detail level or POINTS.
+        """
+        if not len(self.__members):
+            return []
+        projection = self.__projection
+        pixels = self.__pixels
+        clip = projection @ view
+        planes = np.array(
+            [
+                clip[3] + clip[0],
+                clip[3] - clip[0],
+                clip[3] + clip[1],
+                clip[3] - clip[1],
+                clip[3] + clip[2],
+                clip[3] - clip[2],
+            ]
+        )
+        planes /= np.linalg.norm(planes[:, :3], axis=1)[:, np.newaxis]
+
+        rotation = view[:3, :3]
+        eye = -rotation.T @ view[:3, 3]
+        reach = self.__reach
+        # the corners of the frustum cut at that distance
+        half_height = reach / projection[1, 1]
+        half_width = reach / projection[0, 0]
+        corners = [eye] + [
+            eye
+            + rotation.T
+            @ np.array([x * half_width, y * half_height, -reach])
+            for x in [-1, 1]
+            for y in [-1, 1]
+        ]
+        low = np.min(corners, axis=0)
+        high = np.max(corners, axis=0)
+        candidates = np.array(
+            self.__spatial_hash.query_box(
+                Types.cast_to_vector3(tuple(low)), Types.cast_to_vector3(tuple(high))
+            ),
+            np.int64,
+        )
+        if not len(candidates):
+            return []
+
+        centers = self.__centers[candidates]
+        radii = self.__radii[candidates]
+        inside = np.all(
+            centers @ planes[:, :3].T + planes[:, 3] >= -radii[:, np.newaxis], axis=1
+        )
+        distance = np.maximum(
+            np.linalg.norm(centers - eye, axis=1) - radii, 1 / pixels
+        )
+        screen_radius = self.__max_radii[candidates] * pixels / distance
+        inside &= screen_radius >= self.MIN_PIXELS
+
+        detail = np.full(len(candidates), self.POINTS)
+        detail[screen_radius >= self.POINT_PIXELS] = len(self.DETAIL_PIXELS)
+        for level, threshold in reversed(list(enumerate(self.DETAIL_PIXELS))):
+            detail[screen_radius >= threshold] = level
+        return list(zip(candidates[inside].tolist(), detail[inside].tolist()))
@@ -0,0 +1,683 @@
+from custom_types import *
+import os
+from obstacle import Obstacle
+from teleporter import Teleporter
+from speed_zone import SpeedZone
+import numpy as np
+from typing import Any, List, Optional, Sequence, Tuple
+
+# the cell size, the obstacles sorted by cell, their cell keys, the first cell,
+# the amount of cells along each axis and the large obstacles
+CellGrid = Tuple[float, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+class ObstacleStore(object):
+
+    OBSTACLE = 0
+    TELEPORTER = 1
+    SPEED_ZONE = 2
+    NO_HIT = -1
+    __MAX_PAIRS = 1 << 20
+    # below this many (segment, obstacle) pairs every pair is checked
+    __DENSE_PAIRS = 1 << 12
+    # the obstacles bigger than this many times the median radius are paired with every segment
+    __LARGE_RADIUS = 4
+    # the most cells a segment may touch along the three axes, past it every pair is checked
+    __MAX_SEGMENT_CELLS = 64
+    # the segments whose pairs are gathered at once
+    __SEGMENT_CHUNK = 1 << 14
+    # the binary scene format, a header with the record count and fixed-width records
+    __MAGIC = b"WSCENE01"
+    __HEADER = np.dtype([("magic", "S8"), ("count", "<u8")])
+    RECORD = np.dtype(
+        [
+            ("center", "<f8", (3,)),
+            ("radius", "<f8"),
+            ("target", "<f8", (3,)),
+            ("speed_factor", "<f8"),
+            ("kind", "i1"),
+            ("padding", "V7"),
+        ]
+    )
+
+    def __init__(
+        self,
+        centers: np.ndarray,
+        radii: np.ndarray,
+        kinds: np.ndarray,
+        targets: np.ndarray,
+        speed_factors: np.ndarray,
+        source: Optional[str] = None,
+    ) -> None:
+        """
+        Initializes an ObstacleStore object.
+
+        Keeps all the obstacles of a scene in contiguous arrays, so collisions can be
+        checked against all of them, or against many segments, in a few NumPy calls.
+
+        Args:
+            centers (np.ndarray): The (n, 3) centers of the obstacles.
+            radii (np.ndarray): The (n,) radii of the obstacles.
+            kinds (np.ndarray): The (n,) type codes (OBSTACLE, TELEPORTER or SPEED_ZONE).
+            targets (np.ndarray): The (n, 3) teleporter targets, zero for the other types.
+            speed_factors (np.ndarray): The (n,) speed factors, one for the other types.
+            source (Optional[str], optional): The scene file the arrays are mapped from. Defaults to None.
+        """
+        self.__centers = centers
+        self.__radii = radii
+        self.__kinds = kinds
+        self.__targets = targets
+        self.__speed_factors = speed_factors
+        self.__source = source
+        self.__max_radius: Optional[float] = None
+        self.__sorted: Optional[bool] = None
+        self.__cell_grid: Optional[CellGrid] = None
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """
+        Pickles the store, a store mapped from a scene file is pickled as its path,
+        so the worker processes map the same pages instead of copying the arrays.
+
+        Returns:
+            Tuple[Any, ...]: The function that recreates the store and its arguments.
+        """
+        if self.__source is not None:
+            return (ObstacleStore.open, (self.__source,))
+        return (
+            ObstacleStore,
+            (
+                self.__centers,
+                self.__radii,
+                self.__kinds,
+                self.__targets,
+                self.__speed_factors,
+            ),
+        )
+
+    @staticmethod
+    def record_of(obstacle: Obstacle) -> Tuple[int, Types.vector3, float]:
+        """
+        Returns the type code, teleporter target and speed factor of an obstacle.
+
+        Args:
+            obstacle (Obstacle): The obstacle.
+
+        Returns:
+            Tuple[int, Types.vector3, float]: The type code, the target (zero for the
+            other types) and the speed factor (one for the other types).
+        """
+        if isinstance(obstacle, Teleporter):
+            return ObstacleStore.TELEPORTER, obstacle.get_target(), 1.0
+        if isinstance(obstacle, SpeedZone):
+            return ObstacleStore.SPEED_ZONE, (0, 0, 0), obstacle.get_speed_factor()
+        return ObstacleStore.OBSTACLE, (0, 0, 0), 1.0
+
+    @staticmethod
+    def from_obstacles(obstacles: Sequence[Obstacle]) -> "ObstacleStore":
+        """
+        Compiles a list of obstacle objects into a store.
+
+        Args:
+            obstacles (Sequence[Obstacle]): The obstacles.
+
+        Returns:
+            ObstacleStore: The store, with the obstacles in the same order.
+        """
+        count = len(obstacles)
+        centers = np.zeros((count, 3), np.float64)
+        radii = np.zeros(count, np.float64)
+        kinds = np.zeros(count, np.int8)
+        targets = np.zeros((count, 3), np.float64)
+        speed_factors = np.ones(count, np.float64)
+
+        for index, obstacle in enumerate(obstacles):
+            centers[index] = obstacle.get_location()
+            radii[index] = obstacle.get_radius()
+            kinds[index], targets[index], speed_factors[index] = ObstacleStore.record_of(
+                obstacle
+            )
+
+        return ObstacleStore(centers, radii, kinds, targets, speed_factors)
+
+    @staticmethod
+    def concatenate(stores: Sequence["ObstacleStore"]) -> "ObstacleStore":
+        """
+        Joins stores into one, without compiling their obstacles again.
+
+        Args:
+            stores (Sequence[ObstacleStore]): The stores, at least one.
+
+        Returns:
+            ObstacleStore: The store, with the obstacles of the stores in order.
+        """
+        return ObstacleStore(
+            np.concatenate([store.get_centers() for store in stores]),
+            np.concatenate([store.get_radii() for store in stores]),
+            np.concatenate([store.get_kinds() for store in stores]),
+            np.concatenate([store.get_targets() for store in stores]),
+            np.concatenate([store.get_speed_factors() for store in stores]),
+        )
+
+    def take(self, indices: np.ndarray) -> "ObstacleStore":
+        """
+        Copies some of the obstacles into a new store.
+
+        Args:
+            indices (np.ndarray): The indices of the obstacles, in the order of the new store.
+
+        Returns:
+            ObstacleStore: The store.
+        """
+        return ObstacleStore(
+            self.__centers[indices],
+            self.__radii[indices],
+            self.__kinds[indices],
+            self.__targets[indices],
+            self.__speed_factors[indices],
+        )
+
+    @staticmethod
+    def is_scene_file(path: str) -> bool:
+        """
+        Checks if a file is in the binary scene format.
+
+        Args:
+            path (str): The path to the file.
+
+        Returns:
+            bool: True if the file starts like a binary scene.
+        """
+        try:
+            with open(path, "rb") as f:
+                return f.read(len(ObstacleStore.__MAGIC)) == ObstacleStore.__MAGIC
+        except OSError:
+            return False
+
+    def save(self, path: str) -> None:
+        """
+        Writes the store to a binary scene file.
+
+        The records are written sorted by the x of their centers, so the opened
+        store can find the obstacles near a point with a binary search.
+
+        Args:
+            path (str): The path to the file.
+        """
+        order = np.argsort(self.__centers[:, 0], kind="stable")
+        records = np.zeros(len(self), ObstacleStore.RECORD)
+        records["center"] = self.__centers[order]
+        records["radius"] = self.__radii[order]
+        records["target"] = self.__targets[order]
+        records["speed_factor"] = self.__speed_factors[order]
+        records["kind"] = self.__kinds[order]
+        header = np.array([(ObstacleStore.__MAGIC, len(self))], ObstacleStore.__HEADER)
+        with open(path, "wb") as f:
+            f.write(header.tobytes())
+            f.write(records.tobytes())
+
+    @staticmethod
+    def open(path: str) -> "ObstacleStore":
+        """
+        Maps a binary scene file into a store without copying it.
+
+        The arrays are read-only views of the mapped file, so a scene costs no
+        Python objects, and the processes that open the same file share its pages.
+
+        Args:
+            path (str): The path to the file.
+
+        Raises:
+            OSError: If the file can not be read.
+            ValueError: If the file is not a binary scene or its size does not match its header.
+
+        Returns:
+            ObstacleStore: The store, in the order of the file.
+        """
+        header = np.fromfile(path, ObstacleStore.__HEADER, count=1)
+        if len(header) == 0 or header["magic"][0] != ObstacleStore.__MAGIC:
+            raise ValueError(f"{path} is not a binary scene file")
+        count = int(header["count"][0])
+        expected_size = ObstacleStore.__HEADER.itemsize + count * ObstacleStore.RECORD.itemsize
+        if os.path.getsize(path) != expected_size:
+            raise ValueError(f"{path} is truncated or has trailing data")
+        if count == 0:
+            # an empty file can not be mapped
+            records = np.zeros(0, ObstacleStore.RECORD)
+        else:
+            records = np.memmap(
+                path,
+                ObstacleStore.RECORD,
+                "r",
+                offset=ObstacleStore.__HEADER.itemsize,
+                shape=(count,),
+            ).view(np.ndarray)
+        return ObstacleStore(
+            records["center"],
+            records["radius"],
+            records["kind"],
+            records["target"],
+            records["speed_factor"],
+            path,
+        )
+
+    def get_source(self) -> Optional[str]:
+        """
+        Returns the scene file the store is mapped from.
+
+        Returns:
+            Optional[str]: The path, None for a store in memory.
+        """
+        return self.__source
+
+    def __len__(self) -> int:
+        """
+        Returns the amount of obstacles in the store.
+
+        Returns:
+            int: The amount of obstacles.
+        """
+        return len(self.__radii)
+
+    def get_centers(self) -> np.ndarray:
+        """
+        Returns the centers of the obstacles.
+
+        Returns:
+            np.ndarray: The (n, 3) centers.
+        """
+        return self.__centers
+
+    def get_radii(self) -> np.ndarray:
+        """
+        Returns the radii of the obstacles.
+
+        Returns:
+            np.ndarray: The (n,) radii.
+        """
+        return self.__radii
+
+    def get_kinds(self) -> np.ndarray:
+        """
+        Returns the type codes of the obstacles.
+
+        Returns:
+            np.ndarray: The (n,) type codes.
+        """
+        return self.__kinds
+
+    def get_targets(self) -> np.ndarray:
+        """
+        Returns the teleporter targets.
+
+        Returns:
+            np.ndarray: The (n, 3) targets.
+        """
+        return self.__targets
+
+    def get_speed_factors(self) -> np.ndarray:
+        """
+        Returns the speed zone factors.
+
+        Returns:
+            np.ndarray: The (n,) speed factors.
+        """
+        return self.__speed_factors
+
+    def get_max_radius(self) -> float:
+        """
+        Returns the radius of the largest obstacle.
+
+        Returns:
+            float: The largest radius, 0 for an empty store.
+        """
+        if self.__max_radius is None:
+            self.__max_radius = float(self.__radii.max()) if len(self) else 0.0
+        max_radius: float = self.__max_radius
+        return max_radius
+
+    def is_sorted(self) -> bool:
+        """
+        Returns if the obstacles are sorted by the x of their centers, like the stores
+        opened from a binary scene file.
+
+        Returns:
+            bool: True if the obstacles are sorted.
+        """
+        if self.__sorted is None:
+            x = self.__centers[:, 0]
+            self.__sorted = bool(np.all(x[1:] >= x[:-1]))
+        return self.__sorted
+
+    def query_segment(self, start: Types.vector3, end: Types.vector3) -> np.ndarray:
+        """
+        Finds the obstacles whose bounding box touches the bounding box of a segment,
+        the candidates for a collision.
+
+        When the obstacles are sorted by x, only the ones within reach along x are
+        looked at, found with a binary search, so no index has to be built.
+
+        Args:
+            start (Types.vector3): The starting point of the segment.
+            end (Types.vector3): The final point of the segment.
+
+        Returns:
+            np.ndarray: The indices of the candidates, in increasing order.
+        """
+        low = np.minimum(start, end)
+        high = np.maximum(start, end)
+        first, last = 0, len(self)
+        if self.is_sorted():
+            reach = self.get_max_radius()
+            x = self.__centers[:, 0]
+            first = int(np.searchsorted(x, low[0] - reach, "left"))
+            last = int(np.searchsorted(x, high[0] + reach, "right"))
+        centers = self.__centers[first:last]
+        radii = self.__radii[first:last]
+        box_center = (low + high) / 2
+        box_half_size = (high - low) / 2
+        # comparing axis by axis is faster than reducing the (n, 3) comparisons
+        near = np.ones(last - first, bool)
+        for axis in range(3):
+            distance = np.abs(centers[:, axis] - box_center[axis])
+            near &= distance <= radii + box_half_size[axis]
+        result: np.ndarray = np.flatnonzero(near) + first
+        return result
+
+    @staticmethod
+    def _hit_matrix(
+        starts: np.ndarray, ends: np.ndarray, centers: np.ndarray, radii: np.ndarray
+    ) -> np.ndarray:
+        """
+        Checks every (segment, sphere) pair for a collision, like Obstacle.detect_colision.
+
+        Args:
+            starts (np.ndarray): The (n, 3) starting points of the segments.
+            ends (np.ndarray): The (n, 3) final points of the segments.
+            centers (np.ndarray): The (m, 3) centers of the spheres.
+            radii (np.ndarray): The (m,) radii of the spheres.
+
+        Returns:
+            np.ndarray: A (n, m) boolean array, True where the segment hit the sphere.
+        """
+        return ObstacleStore._hit_pairs(
+            starts[:, np.newaxis, :],
+            ends[:, np.newaxis, :],
+            centers[np.newaxis, :, :],
+            radii[np.newaxis, :],
+        )
+
+    @staticmethod
+    def _hit_pairs(
+        starts: np.ndarray, ends: np.ndarray, centers: np.ndarray, radii: np.ndarray
+    ) -> np.ndarray:
+        """
+        Checks (segment, sphere) pairs for a collision, like Obstacle.detect_colision.
+
+        Args:
+            starts (np.ndarray): The (..., 3) starting points of the segments.
+            ends (np.ndarray): The (..., 3) final points of the segments.
+            centers (np.ndarray): The (..., 3) centers of the spheres, broadcast with the segments.
+            radii (np.ndarray): The (...) radii of the spheres.
+
+        Returns:
+            np.ndarray: A (...) boolean array, True where the segment hit the sphere.
+        """
+        movement = ends - starts
+        sphere_to_start = starts - centers
+        # finding the coefficients for the quadratic equation
+        coef_a = np.sum(movement * movement, axis=-1)
+        coef_b = 2 * np.sum(sphere_to_start * movement, axis=-1)
+        coef_c = np.sum(sphere_to_start * sphere_to_start, axis=-1) - radii**2
+
+        # completely inside
+        inside = coef_c < 0
+        discriminant = coef_b**2 - 4 * coef_a * coef_c
+        valid = (discriminant >= 0) & (coef_a > 0)
+        root = np.sqrt(np.where(valid, discriminant, 0))
+        denominator = np.where(valid, 2 * coef_a, 1)
+        solution_1 = (-coef_b - root) / denominator
+        solution_2 = (-coef_b + root) / denominator
+
+        touched = (
+            ((solution_1 >= 0) & (solution_1 <= 1))
+            | ((solution_2 >= 0) & (solution_2 <= 1))
+            | ((solution_1 < 0) & (solution_2 > 1))
+        )
+        hit: np.ndarray = inside | (valid & touched)
+        return hit
+
+    def first_hits(
+        self,
+        starts: np.ndarray,
+        ends: np.ndarray,
+        exclude: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Finds the obstacle hit by each movement segment.
+
+        Like Grid.find_closest, when a segment hits several obstacles the one whose
+        surface is closest to the starting point is returned.
+
+        Every segment is only checked against the obstacles in the cells of a
+        uniform grid its bounding box touches, so segments spread over a large
+        scene don't make every pair a candidate. Small inputs, and segments much
+        longer than the obstacles, check every pair instead, which finds the same hits.
+
+        Args:
+            starts (np.ndarray): The (n, 3) starting points of the segments.
+            ends (np.ndarray): The (n, 3) final points of the segments.
+            exclude (Optional[np.ndarray], optional): A (n, obstacles) boolean array of obstacles to skip. Defaults to None.
+
+        Returns:
+            np.ndarray: The (n,) index of the hit obstacle of each segment, NO_HIT if there is none.
+        """
+        result = np.full(len(starts), self.NO_HIT, np.int64)
+        if len(self) == 0 or len(starts) == 0:
+            return result
+        if len(self) * len(starts) > self.__DENSE_PAIRS:
+            for first in range(0, len(starts), self.__SEGMENT_CHUNK):
+                rows = slice(first, first + self.__SEGMENT_CHUNK)
+                chunk_result = self._first_hits_in_cells(
+                    starts[rows],
+                    ends[rows],
+                    None if exclude is None else exclude[rows],
+                )
+                if chunk_result is None:
+                    break
+                result[rows] = chunk_result
+            else:
+                return result
+        return self._first_hits_dense(starts, ends, exclude)
+
+    def _get_cell_grid(self) -> Optional["CellGrid"]:
+        """
+        Sorts the obstacles into the cells of a uniform grid, built once.
+
+        The cells are as wide as the largest obstacle, leaving out the ones bigger
+        than __LARGE_RADIUS times the median radius, which are kept apart.
+
+        Returns:
+            Optional[CellGrid]: The cell size, the obstacle indices sorted by cell, their cell
+            keys, the first cell, the amount of cells along each axis and the large obstacles.
+            None if the scene spans too many cells to number them.
+        """
+        if self.__cell_grid is None:
+            large_mask = self.__radii > self.__LARGE_RADIUS * np.median(self.__radii)
+            small = np.flatnonzero(~large_mask)
+            small_radius = float(self.__radii[small].max()) if len(small) else 0.0
+            cell_size = 2 * small_radius if small_radius > 0 else 1.0
+            cells = np.floor(self.__centers[small] / cell_size).astype(np.int64)
+            first_cell = cells.min(axis=0) if len(small) else np.zeros(3, np.int64)
+            shape = (
+                cells.max(axis=0) - first_cell + 1 if len(small) else np.ones(3, np.int64)
+            )
+            if float(np.prod(shape.astype(np.float64))) > 2.0**62:
+                return None
+            keys = np.asarray(np.ravel_multi_index((cells - first_cell).T, shape))
+            order = np.argsort(keys, kind="stable")
+            self.__cell_grid = (
+                cell_size,
+                small[order],
+                keys[order],
+                first_cell,
+                shape,
+                np.flatnonzero(large_mask),
+            )
+        return self.__cell_grid
+
+    def _first_hits_in_cells(
+        self, starts: np.ndarray, ends: np.ndarray, exclude: Optional[np.ndarray]
+    ) -> Optional[np.ndarray]:
+        """
+        Finds the obstacle hit by each segment, checking only the obstacles in the
+        cells its bounding box touches and the large obstacles.
+
+        Args:
+            starts (np.ndarray): The (n, 3) starting points of the segments.
+            ends (np.ndarray): The (n, 3) final points of the segments.
+            exclude (Optional[np.ndarray]): A (n, obstacles) boolean array of obstacles to skip.
+
+        Returns:
+            Optional[np.ndarray]: The (n,) index of the hit obstacle of each segment, NO_HIT if
+            there is none. None if the segments touch too many cells for the grid to pay off.
+        """
+        cell_grid = self._get_cell_grid()
+        if cell_grid is None:
+            return None
+        cell_size, indices, keys, first_cell, shape, large = cell_grid
+        small_radius = cell_size / 2
+        low_cells = (
+            np.floor((np.minimum(starts, ends) - small_radius) / cell_size).astype(np.int64)
+            - first_cell
+        )
+        high_cells = (
+            np.floor((np.maximum(starts, ends) + small_radius) / cell_size).astype(np.int64)
+            - first_cell
+        )
+        span = (high_cells - low_cells).max(axis=0) + 1
+        if int(np.prod(span)) > self.__MAX_SEGMENT_CELLS:
+            return None
+
+        segment_list: List[np.ndarray] = []
+        obstacle_list: List[np.ndarray] = []
+        for offset in np.ndindex(*span):
+            cells = low_cells + np.array(offset, np.int64)
+            valid = np.flatnonzero(
+                np.all((cells <= high_cells) & (cells >= 0) & (cells < shape), axis=1)
+            )
+            if not len(valid):
+                continue
+            cell_keys = np.ravel_multi_index(cells[valid].T, shape)
+            lows = np.searchsorted(keys, cell_keys, "left")
+            counts = np.searchsorted(keys, cell_keys, "right") - lows
+            # every (segment, obstacle in the cell) pair, without a loop over the segments
+            pair_starts = np.cumsum(counts) - counts
+            positions = np.arange(int(counts.sum())) + np.repeat(lows - pair_starts, counts)
+            segment_list.append(np.repeat(valid, counts))
+            obstacle_list.append(indices[positions])
+        if len(large):
+            segment_list.append(np.repeat(np.arange(len(starts)), len(large)))
+            obstacle_list.append(np.tile(large, len(starts)))
+
+        result = np.full(len(starts), self.NO_HIT, np.int64)
+        if not segment_list:
+            return result
+        segments = np.concatenate(segment_list)
+        obstacles = np.concatenate(obstacle_list)
+        if exclude is not None:
+            kept = ~exclude[segments, obstacles]
+            segments, obstacles = segments[kept], obstacles[kept]
+        centers = self.__centers[obstacles]
+        radii = self.__radii[obstacles]
+        hit = self._hit_pairs(starts[segments], ends[segments], centers, radii)
+        segments, obstacles = segments[hit], obstacles[hit]
+        if not len(segments):
+            return result
+        surface_distance = (
+            np.linalg.norm(centers[hit] - starts[segments], axis=-1) - radii[hit]
+        )
+        # the closest hit of every segment, the lowest index on a tie like argmin
+        order = np.lexsort((obstacles, surface_distance, segments))
+        segments, obstacles = segments[order], obstacles[order]
+        first = np.ones(len(segments), bool)
+        first[1:] = segments[1:] != segments[:-1]
+        result[segments[first]] = obstacles[first]
+        return result
+
+    def _first_hits_dense(
+        self, starts: np.ndarray, ends: np.ndarray, exclude: Optional[np.ndarray]
+    ) -> np.ndarray:
+        """
+        Finds the obstacle hit by each segment, checking every pair near the segments.
+
+        Args:
+            starts (np.ndarray): The (n, 3) starting points of the segments.
+            ends (np.ndarray): The (n, 3) final points of the segments.
+            exclude (Optional[np.ndarray]): A (n, obstacles) boolean array of obstacles to skip.
+
+        Returns:
+            np.ndarray: The (n,) index of the hit obstacle of each segment, NO_HIT if there is none.
+        """
+        result = np.full(len(starts), self.NO_HIT, np.int64)
+
+        # skipping the obstacles that are not near any of the segments
+        low = np.minimum(starts, ends).min(axis=0)
+        high = np.maximum(starts, ends).max(axis=0)
+        near = np.flatnonzero(
+            np.all(self.__centers + self.__radii[:, np.newaxis] >= low, axis=1)
+            & np.all(self.__centers - self.__radii[:, np.newaxis] <= high, axis=1)
+        )
+        if len(near) == 0:
+            return result
+        centers = self.__centers[near]
+        radii = self.__radii[near]
+
+        # splitting the segments so the pair arrays stay small
+        chunk = max(1, self.__MAX_PAIRS // len(near))
+        for first in range(0, len(starts), chunk):
+            rows = slice(first, first + chunk)
+            hit = self._hit_matrix(starts[rows], ends[rows], centers, radii)
+            if exclude is not None:
+                hit &= ~exclude[rows][:, near]
+            surface_distance = (
+                np.linalg.norm(
+                    centers[np.newaxis, :, :] - starts[rows][:, np.newaxis, :], axis=-1
+                )
+                - radii
+            )
+            closest = np.argmin(np.where(hit, surface_distance, np.inf), axis=1)
+            result[rows] = np.where(hit.any(axis=1), near[closest], self.NO_HIT)
+
+        return result
+
+    def first_hit(
+        self,
+        start: Types.vector3,
+        end: Types.vector3,
+        candidates: Optional[Sequence[int]] = None,
+    ) -> int:
+        """
+        Finds the obstacle hit by a single movement segment.
+
+        Args:
+            start (Types.vector3): The starting point of the segment.
+            end (Types.vector3): The final point of the segment.
+            candidates (Optional[Sequence[int]], optional): The indices to check, all of them if not provided. Defaults to None.
+
+        Returns:
+            int: The index of the hit obstacle, NO_HIT if there is none.
+        """
+        if candidates is None:
+            indices = np.arange(len(self))
+        else:
+            indices = np.asarray(candidates, np.int64)
+        if len(indices) == 0:
+            return self.NO_HIT
+
+        start_array = np.array([start], np.float64)
+        centers = self.__centers[indices]
+        radii = self.__radii[indices]
+        hit = self._hit_matrix(start_array, np.array([end], np.float64), centers, radii)[0]
+        if not hit.any():
+            return self.NO_HIT
+        surface_distance = np.linalg.norm(centers - start_array, axis=1) - radii
+        return int(indices[np.argmin(np.where(hit, surface_distance, np.inf))])
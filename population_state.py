@@ -0,0 +1,70 @@
+from walker import Walker
+from custom_types import *
+import numpy as np
+from typing import Dict, Sequence
+
+
+class PopulationState:
+
+    def __init__(self, walker_list: Sequence[Walker], max_steps: int) -> None:
+        """Initializes a PopulationState object.
+
+        Holds the location of every walker at every step of the current repetition.
+        Each walker thread only writes its own row, so recording needs no lock, and the
+        population aggregates are computed once per step when the repetition ends.
+
+        Args:
+            walker_list (Sequence[Walker]): The list of all walkers.
+            max_steps (int): The amount of steps in each repetition.
+        """
+        self.__indices: Dict[Walker, int] = {
+            walker: index for index, walker in enumerate(walker_list)
+        }
+        self.__locations = np.zeros((len(walker_list), max_steps, 3), np.float64)
+        self.__center_mass = np.zeros((max_steps, 3), np.float64)
+        self.__total_mass = float(sum(walker.get_mass() for walker in walker_list))
+
+    def get_total_mass(self) -> float:
+        """Gets the total mass of the population.
+
+        Returns:
+            float: The total mass.
+        """
+        return self.__total_mass
+
+    def record(self, walker: Walker, step: int, location: Types.vector3) -> None:
+        """Records the location of a walker at a step of the current repetition.
+
+        Args:
+            walker (Walker): The walker.
+            step (int): The step index.
+            location (Types.vector3): The location of the walker after the step.
+        """
+        self.__locations[self.__indices[walker], step] = location
+
+    def finish_repetition(self) -> None:
+        """Computes the center of mass of every step of the repetition,
+        called once by the barrier when all the walkers finished it."""
+        self.__center_mass = self.__locations.mean(axis=0)
+
+    def get_center_mass(self) -> np.ndarray:
+        """Gets the center of mass of the population at each step of the last finished repetition.
+
+        Returns:
+            np.ndarray: The (max_steps, 3) centers of mass.
+        """
+        return self.__center_mass
+
+    def center_mass_distances(self, walker: Walker) -> np.ndarray:
+        """Gets the distance of a walker from the center of mass at each step of the last finished repetition.
+
+        Args:
+            walker (Walker): The walker.
+
+        Returns:
+            np.ndarray: The (max_steps,) distances.
+        """
+        distances: np.ndarray = np.linalg.norm(
+            self.__locations[self.__indices[walker]] - self.__center_mass, axis=1
+        )
+        return distances
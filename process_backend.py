@@ -0,0 +1,335 @@
+from batch_simulation import BatchSimulation
+from grid import Grid
+from walker import Walker
+from running_stats import RunningStats
+from random_streams import RandomStreams
+from repetition_sums import RepetitionSums
+from profiler import Profiler
+import math
+import numpy as np
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from threading import Event
+from typing import Any, List, Dict, Callable, Optional, Set, Tuple
+
+# the per step sums, the time to leave, the statistics and the profile of a slice
+SliceResult = Tuple[
+    RepetitionSums, np.ndarray, List[Dict[str, RunningStats]], Optional[Profiler]
+]
+
+# the progress fraction of every slice, shared with the worker processes
+_slice_progress: Optional[Any] = None
+
+
+def _init_worker(slice_progress: Any) -> None:
+    """Keeps the shared progress of the slices in a worker process.
+
+    Args:
+        slice_progress (Any): The shared array with the progress fraction of every slice.
+    """
+    global _slice_progress
+    _slice_progress = slice_progress
+
+
+def _report_progress(slice_index: int, fraction: float) -> None:
+    """Publishes the progress of a slice to the parent process.
+
+    Args:
+        slice_index (int): The index of the slice.
+        fraction (float): The progress fraction of the slice.
+    """
+    if _slice_progress is not None:
+        _slice_progress[slice_index] = fraction
+
+
+def _run_slice(
+    grid: Grid,
+    walker_list: List[Walker],
+    simulation_count: int,
+    max_steps: int,
+    random_streams: RandomStreams,
+    first_repetition: int,
+    streaming_statistics: bool,
+    profiling: bool,
+    slice_index: int = 0,
+) -> SliceResult:
+    """Runs a slice of the repetitions in a worker process.
+
+    Args:
+        grid (Grid): The grid to simulate in.
+        walker_list (List[Walker]): All the walkers.
+        simulation_count (int): The amount of repetitions in the slice.
+        max_steps (int): The amount of steps in each repetition.
+        random_streams (RandomStreams): The random streams of the whole run.
+        first_repetition (int): The index of the first repetition of the slice.
+        streaming_statistics (bool): Stream the values of the slice into statistics.
+        profiling (bool): Time the phases of the slice.
+        slice_index (int, optional): The index of the slice in the shared progress. Defaults to 0.
+
+    Returns:
+        SliceResult: The per step sums over the repetitions of the slice, the time to leave of
+        every repetition, the streaming statistics of the slice for each walker and the
+        profile of the slice, None without profiling.
+    """
+    profiler = Profiler() if profiling else None
+    batch_simulation = BatchSimulation(
+        grid,
+        simulation_count,
+        max_steps,
+        random_streams,
+        first_repetition,
+        streaming_statistics,
+    )
+    batch_simulation.run(
+        walker_list,
+        progress=lambda fraction: _report_progress(slice_index, fraction),
+        profiler=profiler,
+    )
+    return (
+        batch_simulation.get_repetition_sums(),
+        batch_simulation.get_time_to_leave(),
+        batch_simulation.get_statistics(),
+        profiler,
+    )
+
+
+class ProcessBackend:
+
+    __SLICES_PER_WORKER = 4
+    __POLL_INTERVAL = 0.1
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        streaming_statistics: bool = True,
+        profiling: bool = False,
+    ) -> None:
+        """Initializes a ProcessBackend object.
+
+        The process backend splits the repetitions into slices and runs every slice
+        with the batch engine in a separate process, so a run uses all the cores.
+        Every slice simulates all the walkers, so gravity and the center of mass stay correct.
+
+        Args:
+            max_workers (Optional[int], optional): The amount of worker processes. Defaults to None, which uses all the cores.
+            streaming_statistics (bool, optional): Stream the values of every slice into statistics. Defaults to True.
+            profiling (bool, optional): Time the phases of every slice. Defaults to False.
+        """
+        self.__max_workers = max_workers or multiprocessing.cpu_count()
+        self.__streaming_statistics = streaming_statistics
+        self.__profiling = profiling
+        self.__profiler: Optional[Profiler] = None
+        self.__statistics: List[Dict[str, RunningStats]] = []
+
+    def get_max_workers(self) -> int:
+        """Gets the amount of worker processes.
+
+        Returns:
+            int: The amount of worker processes.
+        """
+        return self.__max_workers
+
+    def get_statistics(self) -> List[Dict[str, RunningStats]]:
+        """Gets the streaming statistics of the last run, merged over the finished slices.
+
+        Returns:
+            List[Dict[str, RunningStats]]: The statistics of each metric for each walker, empty if the statistics are off.
+        """
+        return self.__statistics
+
+    def get_profiler(self) -> Optional[Profiler]:
+        """Gets the profile of the last run, the phases of the finished slices added up,
+        so the phase times are the CPU time of all the workers.
+
+        Returns:
+            Optional[Profiler]: The profile, None without profiling.
+        """
+        return self.__profiler
+
+    def split(self, simulation_count: int) -> List[int]:
+        """Splits the repetitions into slices.
+
+        The slices are a power of two long, so every slice but the last is a single
+        aligned block of the pairwise sums of the repetitions.
+
+        Args:
+            simulation_count (int): The total amount of repetitions.
+
+        Returns:
+            List[int]: The amount of repetitions in each slice.
+        """
+        slice_count = min(
+            simulation_count, self.__max_workers * self.__SLICES_PER_WORKER
+        )
+        if slice_count <= 0:
+            return []
+        slice_size = 1 << (math.ceil(simulation_count / slice_count) - 1).bit_length()
+        return [
+            min(slice_size, simulation_count - start)
+            for start in range(0, simulation_count, slice_size)
+        ]
+
+    @staticmethod
+    def merge(
+        sums_list: List[RepetitionSums],
+        time_to_leave_list: List[np.ndarray],
+        count_list: List[int],
+    ) -> List[Dict[str, List[float]]]:
+        """Merges the per step sums of the slices into the log data.
+
+        The sums are added up the same pairwise tree of repetitions a single batch
+        run sums, and divided by the amount of repetitions once, so the log data is
+        bit-identical to the batch engine's however the repetitions were split.
+
+        Args:
+            sums_list (List[RepetitionSums]): The sums over the repetitions of each slice.
+            time_to_leave_list (List[np.ndarray]): The (walkers, repetitions) time to leave of each slice.
+            count_list (List[int]): The amount of repetitions in each slice.
+
+        Returns:
+            List[Dict[str, List[float]]]: The log data of each walker over all the slices.
+        """
+        if not sums_list:
+            return []
+        merged = sums_list[0]
+        for sums in sums_list[1:]:
+            merged.merge(sums)
+        # the time to leave is kept per repetition, in slice order
+        return BatchSimulation.log_data(
+            merged.total(), np.concatenate(time_to_leave_list, axis=1), sum(count_list)
+        )
+
+    @staticmethod
+    def merge_statistics(
+        partial_list: List[List[Dict[str, RunningStats]]]
+    ) -> List[Dict[str, RunningStats]]:
+        """Merges the streaming statistics of the slices into the first slice.
+
+        The moments of the slices are folded in the same pairwise tree of repetitions
+        a single batch run folds, so the statistics are bit-identical to the batch engine's.
+
+        Args:
+            partial_list (List[List[Dict[str, RunningStats]]]): The statistics of each walker for each slice.
+
+        Returns:
+            List[Dict[str, RunningStats]]: The statistics of each walker over all the slices.
+        """
+        if not partial_list:
+            return []
+        merged = partial_list[0]
+        for partial in partial_list[1:]:
+            for walker_statistics, slice_statistics in zip(merged, partial):
+                for key, statistics in walker_statistics.items():
+                    statistics.merge(slice_statistics[key])
+        return merged
+
+    def run(
+        self,
+        grid: Grid,
+        walker_list: List[Walker],
+        simulation_count: int,
+        max_steps: int,
+        stop_event: Optional[Event] = None,
+        progress: Optional[Callable[[float], None]] = None,
+        random_streams: Optional[RandomStreams] = None,
+    ) -> List[Dict[str, List[float]]]:
+        """Runs all the repetitions of all the walkers in the process pool.
+
+        Args:
+            grid (Grid): The grid to simulate in.
+            walker_list (List[Walker]): The walkers to simulate.
+            simulation_count (int): The amount of repetitions.
+            max_steps (int): The amount of steps in each repetition.
+            stop_event (Optional[Event], optional): Cancels the remaining slices when set. Defaults to None.
+            progress (Optional[Callable[[float], None]], optional): Called with the progress fraction. Defaults to None.
+            random_streams (Optional[RandomStreams], optional): The random streams of the walkers, unseeded if not provided.
+                Every repetition draws from the same stream as in a single batch run. Defaults to None.
+
+        Returns:
+            List[Dict[str, List[float]]]: The log data of each walker, in the order of walker_list.
+        """
+        # the wall time of the profile is the one of the whole run
+        profiler = Profiler() if self.__profiling else None
+        count_list = self.split(simulation_count)
+        first_repetitions = [sum(count_list[:index]) for index in range(len(count_list))]
+        random_streams = random_streams or RandomStreams()
+        partial_list: List[Optional[SliceResult]] = [None] * len(count_list)
+        stopped = False
+        # spawning so the workers don't inherit the GUI threads and the random states
+        context = multiprocessing.get_context("spawn")
+        # every slice writes only its own fraction, so the array needs no lock
+        slice_progress = context.Array("d", len(count_list), lock=False)
+        executor = ProcessPoolExecutor(
+            self.__max_workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(slice_progress,),
+        )
+        try:
+            future_dict: Dict[Future[SliceResult], int] = {
+                executor.submit(
+                    _run_slice,
+                    grid,
+                    walker_list,
+                    count,
+                    max_steps,
+                    random_streams,
+                    first_repetitions[index],
+                    self.__streaming_statistics,
+                    self.__profiling,
+                    index,
+                ): index
+                for index, count in enumerate(count_list)
+            }
+            pending: Set[Future[SliceResult]] = set(future_dict)
+            while pending:
+                if stop_event is not None and stop_event.is_set():
+                    stopped = True
+                    break
+                done, pending = wait(
+                    pending, self.__POLL_INTERVAL, return_when=FIRST_COMPLETED
+                )
+                for future in done:
+                    partial_list[future_dict[future]] = future.result()
+                # the slices report every step, not only when they finish
+                if progress is not None:
+                    done_count = sum(
+                        fraction * count
+                        for fraction, count in zip(slice_progress, count_list)
+                    )
+                    progress(done_count / max(simulation_count, 1))
+        finally:
+            # a stopped run doesn't wait for the slices that are still running
+            executor.shutdown(wait=not stopped, cancel_futures=True)
+
+        # a cancelled run only merges the slices that finished
+        finished: List[Tuple[SliceResult, int]] = [
+            (partial, count)
+            for partial, count in zip(partial_list, count_list)
+            if partial is not None
+        ]
+        self.__statistics = self.merge_statistics(
+            [statistics for (_, _, statistics, _), _ in finished]
+        )
+        for (_, _, _, slice_profiler), _ in finished:
+            if profiler is not None and slice_profiler is not None:
+                profiler.merge(slice_profiler)
+        self.__profiler = profiler
+        if not finished:
+            return [
+                {
+                    "distance": [0.0] * max_steps,
+                    "xdistance": [0.0] * max_steps,
+                    "ydistance": [0.0] * max_steps,
+                    "zdistance": [0.0] * max_steps,
+                    "cmdistance": [0.0] * max_steps,
+                    "time_to_leave": [],
+                    "y_cross_count_list": [0.0] * max_steps,
+                }
+                for _ in walker_list
+            ]
+        return self.merge(
+            [sums for (sums, _, _, _), _ in finished],
+            [time_to_leave for (_, time_to_leave, _, _), _ in finished],
+            [count for _, count in finished],
+        )
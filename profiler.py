@@ -0,0 +1,144 @@
+import json
+import time
+from typing import Any, Dict
+
+
+class Profiler:
+
+    ENVIRONMENT_VARIABLE = "WALKER_PROFILE"
+
+    def __init__(self) -> None:
+        """
+        Initializes a Profiler object.
+
+        Keeps the cumulative time and the amount of calls of every phase of a
+        walker's simulation, and counters of events like collisions. A profiler
+        belongs to a single walker thread, so it takes no locks.
+
+        A phase is timed by keeping the value of start and passing it to stop:
+            started = profiler.start()
+            ...
+            profiler.stop("phase", started)
+        """
+        self.__created = time.perf_counter()
+        self.__times: Dict[str, float] = {}
+        self.__calls: Dict[str, int] = {}
+        self.__counters: Dict[str, int] = {}
+
+    def is_enabled(self) -> bool:
+        """
+        Returns if the profiler records anything.
+
+        Returns:
+            bool: Always True.
+        """
+        return True
+
+    def start(self) -> float:
+        """
+        Starts timing a phase.
+
+        Returns:
+            float: The starting time, to pass to stop.
+        """
+        return time.perf_counter()
+
+    def stop(self, phase: str, started: float) -> None:
+        """
+        Stops timing a phase, adding the time since start to it.
+
+        Args:
+            phase (str): The phase name.
+            started (float): The value start returned.
+        """
+        elapsed = time.perf_counter() - started
+        self.__times[phase] = self.__times.get(phase, 0.0) + elapsed
+        self.__calls[phase] = self.__calls.get(phase, 0) + 1
+
+    def count(self, counter: str, amount: int = 1) -> None:
+        """
+        Adds to a counter.
+
+        Args:
+            counter (str): The counter name.
+            amount (int, optional): The amount to add. Defaults to 1.
+        """
+        self.__counters[counter] = self.__counters.get(counter, 0) + amount
+
+    def get_times(self) -> Dict[str, float]:
+        """
+        Returns the cumulative time of every phase.
+
+        Returns:
+            Dict[str, float]: The seconds by phase name.
+        """
+        return self.__times
+
+    def get_calls(self) -> Dict[str, int]:
+        """
+        Returns the amount of times every phase was timed.
+
+        Returns:
+            Dict[str, int]: The calls by phase name.
+        """
+        return self.__calls
+
+    def get_counters(self) -> Dict[str, int]:
+        """
+        Returns the counters.
+
+        Returns:
+            Dict[str, int]: The counters by name.
+        """
+        return self.__counters
+
+    def merge(self, other: "Profiler") -> None:
+        """
+        Adds the times, calls and counters of another profiler, like the profile of a
+        worker process. The wall time stays the one of this profiler.
+
+        Args:
+            other (Profiler): The other profiler.
+        """
+        for phase, seconds in other.get_times().items():
+            self.__times[phase] = self.__times.get(phase, 0.0) + seconds
+            self.__calls[phase] = self.__calls.get(phase, 0) + other.get_calls()[phase]
+        for counter, amount in other.get_counters().items():
+            self.count(counter, amount)
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summarizes the profile.
+
+        Returns:
+            Dict[str, Any]: The wall time since the profiler was created, the seconds,
+            calls, mean microseconds per call and share of the wall time of every phase,
+            slowest first, and the counters.
+        """
+        total = time.perf_counter() - self.__created
+        phases = {
+            phase: {
+                "seconds": seconds,
+                "calls": self.__calls[phase],
+                "mean_us": seconds / self.__calls[phase] * 1e6,
+                "share": seconds / total if total > 0 else 0.0,
+            }
+            for phase, seconds in sorted(
+                self.__times.items(), key=lambda item: item[1], reverse=True
+            )
+        }
+        return {
+            "total_seconds": total,
+            "phases": phases,
+            "counters": dict(self.__counters),
+        }
+
+    def write(self, path: str) -> None:
+        """
+        Writes the summary to a JSON file.
+
+        Args:
+            path (str): The path of the file.
+        """
+        with open(path, "w") as f:
+            json.dump(self.summary(), f, indent=2)
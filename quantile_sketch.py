@@ -0,0 +1,237 @@
+import math
+import numpy as np
+from typing import List, Tuple
+
+
+class QuantileSketch(object):
+
+    def __init__(
+        self,
+        length: int,
+        relative_accuracy: float = 0.02,
+        min_value: float = 0.01,
+        max_value: float = 10000,
+    ) -> None:
+        """
+        Initializes a QuantileSketch object.
+
+        A mergeable quantile sketch for every step of a repetition. Values are
+        counted in logarithmic buckets, so any quantile is returned within the
+        relative accuracy, and the memory does not grow with the amount of values.
+        Values below min_value, including negative ones, share a single zero bucket,
+        values above max_value are counted in the last bucket.
+
+        Only the buckets that hold values are kept, as sorted (step, bucket) keys
+        with their counts, so a step costs as much as its distinct buckets and not
+        every bucket of the value range. Added values are queued and compacted into
+        the keys once the queue outgrows them.
+
+        Args:
+            length (int): The amount of steps.
+            relative_accuracy (float, optional): The relative error of the quantiles. Defaults to 0.02.
+            min_value (float, optional): The smallest value told apart from zero. Defaults to 0.01.
+            max_value (float, optional): The largest value kept accurately. Defaults to 10000.
+
+        Raises:
+            ValueError: If the accuracy or the value range are not valid.
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("the relative accuracy must be between 0 and 1")
+        if not 0 < min_value < max_value:
+            raise ValueError("the value range must be positive and not empty")
+        self.__relative_accuracy = relative_accuracy
+        self.__min_value = min_value
+        self.__max_value = max_value
+        self.__gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.__log_gamma = math.log(self.__gamma)
+        self.__min_key = math.ceil(math.log(min_value) / self.__log_gamma)
+        max_key = math.ceil(math.log(max_value) / self.__log_gamma)
+        self.__length = length
+        # bucket 0 is the zero bucket, bucket i holds the key min_key + i - 1
+        self.__bucket_count = max_key - self.__min_key + 2
+        # the sorted step * bucket_count + bucket keys that hold values, and their counts
+        self.__keys = np.zeros(0, np.int64)
+        self.__counts = np.zeros(0, np.int64)
+        # the keys and counts added since the last compaction
+        self.__queued_keys: List[np.ndarray] = []
+        self.__queued_counts: List[np.ndarray] = []
+        self.__queued_size = 0
+
+    def get_length(self) -> int:
+        """
+        Returns the amount of steps.
+
+        Returns:
+            int: The amount of steps.
+        """
+        return self.__length
+
+    def get_bucket_count(self) -> int:
+        """
+        Returns the amount of buckets of a step.
+
+        Returns:
+            int: The amount of buckets, with the zero bucket.
+        """
+        return self.__bucket_count
+
+    def get_relative_accuracy(self) -> float:
+        """
+        Returns the relative accuracy of the quantiles.
+
+        Returns:
+            float: The relative accuracy.
+        """
+        return self.__relative_accuracy
+
+    def get_entries(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the buckets that hold values.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The sorted step * bucket_count + bucket keys and their counts.
+        """
+        self._compact()
+        return self.__keys, self.__counts
+
+    def get_counts(self) -> np.ndarray:
+        """
+        Returns the bucket counts of every step, as a dense array built for inspection.
+
+        Returns:
+            np.ndarray: The (length, buckets) counts.
+        """
+        keys, counts = self.get_entries()
+        dense = np.zeros(self.__length * self.__bucket_count, np.int64)
+        dense[keys] = counts
+        return dense.reshape(self.__length, self.__bucket_count)
+
+    def _queue(self, keys: np.ndarray, counts: np.ndarray) -> None:
+        """
+        Queues keys and their counts, compacting the queue once it outgrows the keys.
+
+        Args:
+            keys (np.ndarray): The (n,) keys.
+            counts (np.ndarray): The (n,) counts.
+        """
+        self.__queued_keys.append(keys)
+        self.__queued_counts.append(counts)
+        self.__queued_size += len(keys)
+        if self.__queued_size > max(len(self.__keys), self.__bucket_count):
+            self._compact()
+
+    def _compact(self) -> None:
+        """
+        Sums the queued counts into the sorted keys.
+        """
+        if not self.__queued_size:
+            return
+        keys, inverse = np.unique(
+            np.concatenate([self.__keys] + self.__queued_keys), return_inverse=True
+        )
+        self.__counts = np.bincount(
+            inverse.reshape(-1),
+            np.concatenate([self.__counts] + self.__queued_counts),
+            len(keys),
+        ).astype(np.int64)
+        self.__keys = keys
+        self.__queued_keys = []
+        self.__queued_counts = []
+        self.__queued_size = 0
+
+    def _buckets(self, values: np.ndarray) -> np.ndarray:
+        """
+        Finds the bucket of each value.
+
+        Args:
+            values (np.ndarray): The values.
+
+        Returns:
+            np.ndarray: The bucket indices, in the shape of values.
+        """
+        positive = np.maximum(values, self.__min_value)
+        keys = np.ceil(np.log(positive) / self.__log_gamma).astype(np.int64)
+        buckets = np.clip(keys - self.__min_key + 1, 1, self.__bucket_count - 1)
+        result: np.ndarray = np.where(values < self.__min_value, 0, buckets)
+        return result
+
+    def add(self, values: np.ndarray, first_step: int = 0) -> None:
+        """
+        Adds repetitions, a value for each step.
+
+        Args:
+            values (np.ndarray): The (steps,) values of a repetition, or (repetitions, steps) values.
+                A repetition that was stopped early may have less steps than the sketch.
+            first_step (int, optional): The step of the first value of a repetition, for values
+                added a block of steps at a time. Defaults to 0.
+        """
+        values = np.atleast_2d(np.asarray(values, np.float64))
+        if values.size == 0:
+            return
+        steps = first_step + np.arange(values.shape[1], dtype=np.int64)
+        keys = steps * self.__bucket_count + self._buckets(values)
+        self._queue(keys.reshape(-1), np.ones(keys.size, np.int64))
+
+    def add_step(self, step: int, values: np.ndarray) -> None:
+        """
+        Adds many values of a single step.
+
+        Args:
+            step (int): The step index.
+            values (np.ndarray): The (n,) values.
+        """
+        self.add(np.asarray(values, np.float64).reshape(-1, 1), step)
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """
+        Adds the values counted by another sketch.
+
+        Args:
+            other (QuantileSketch): A sketch with the same length and buckets.
+
+        Raises:
+            ValueError: If the sketches are not compatible.
+        """
+        if (
+            other.get_length() != self.__length
+            or other.get_bucket_count() != self.__bucket_count
+            or other.get_relative_accuracy() != self.__relative_accuracy
+        ):
+            raise ValueError("only sketches with the same steps and buckets can be merged")
+        keys, counts = other.get_entries()
+        self._queue(keys, counts)
+
+    def quantile(self, q: float) -> np.ndarray:
+        """
+        Estimates a quantile at every step.
+
+        Args:
+            q (float): The quantile, between 0 and 1.
+
+        Raises:
+            ValueError: If q is not between 0 and 1.
+
+        Returns:
+            np.ndarray: The (length,) quantiles, 0 for the steps with no values.
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("the quantile must be between 0 and 1")
+        keys, counts = self.get_entries()
+        if not len(keys):
+            return np.zeros(self.__length)
+        steps = keys // self.__bucket_count
+        total = np.bincount(steps, counts, self.__length).astype(np.int64)
+        # the rank of the quantile, counted from 1
+        rank = np.floor(q * np.maximum(total - 1, 0)).astype(np.int64) + 1
+        # the keys are sorted by step, so the counts before a step are a running sum
+        cumulative = np.cumsum(counts)
+        before = np.cumsum(total) - total
+        found = np.minimum(
+            np.searchsorted(cumulative, before + rank, side="left"), len(keys) - 1
+        )
+        buckets = keys[found] % self.__bucket_count
+        log_keys = buckets + self.__min_key - 1
+        # the middle of the bucket, within the relative accuracy of all its values
+        values = 2 * np.power(self.__gamma, log_keys) / (self.__gamma + 1)
+        result: np.ndarray = np.where((buckets == 0) | (total == 0), 0.0, values)
+        return result
@@ -1,11 +1,14 @@
-from walker import Walker
+from walker import Walker, MoveArrays
 from math_functions import MathFunctions
 from custom_types import *
-from typing import Tuple
+import numpy as np
+from typing import Tuple, List
 
 
 class RandomAngleWalker(Walker):
 
+    __slots__: List[str] = []
+
     def __init__(self, name: str, is_3d: bool, mass: float = 1) -> None:
         """
         Initialize a RandomAngleWalker object.
@@ -39,8 +42,26 @@ class RandomAngleWalker(Walker):
         """
         result = None
         if self._is_3d:
-            result = (MathFunctions.random_angle(), MathFunctions.random_angle())
+            result = (MathFunctions.random_angle(self._rng), MathFunctions.random_angle(self._rng))
         else:
-            result = (MathFunctions.random_angle(), 0)
+            result = (MathFunctions.random_angle(self._rng), 0)
 
         return result
+
+    def _generate_moves(self, steps: int, batch: int) -> MoveArrays:
+        """
+        Generates a block of moves in a single draw.
+
+        Args:
+            steps (int): The amount of steps.
+            batch (int): The amount of moves in each step.
+
+        Returns:
+            MoveArrays: The (steps, batch) yaw, radius and pitch arrays.
+        """
+        yaw = MathFunctions.random_angles((steps, batch), self._rng)
+        pitch = np.zeros((steps, batch))
+        if self._is_3d:
+            pitch = MathFunctions.random_angles((steps, batch), self._rng)
+        radius = np.ones((steps, batch))
+        return yaw, radius, pitch
@@ -0,0 +1,79 @@
+import numpy as np
+from typing import List, Optional
+
+
+class RandomStreams(object):
+
+    def __init__(self, seed: Optional[int] = None) -> None:
+        """
+        Initializes a RandomStreams object.
+
+        A tree of independent random streams, one for each walker and repetition,
+        spawned from a single SeedSequence. A stream only depends on the seed and
+        on its (walker, repetition) key, so a run gives the same draws no matter
+        how its repetitions are ordered or split between threads and processes.
+
+        Args:
+            seed (Optional[int], optional): The seed of the tree, fresh entropy if not provided. Defaults to None.
+        """
+        self.__entropy = int(np.random.SeedSequence(seed).entropy)  # type: ignore[arg-type]
+
+    def get_entropy(self) -> int:
+        """
+        Returns the entropy of the tree, the seed that reproduces it.
+
+        Returns:
+            int: The entropy.
+        """
+        return self.__entropy
+
+    def generator(self, walker_index: int, repetition: int) -> np.random.Generator:
+        """
+        Creates the random generator of a walker in a repetition.
+
+        Args:
+            walker_index (int): The index of the walker in the walker list.
+            repetition (int): The repetition index.
+
+        Returns:
+            np.random.Generator: The generator, always the same for the same key.
+        """
+        seed_sequence = np.random.SeedSequence(
+            self.__entropy, spawn_key=(walker_index, repetition)
+        )
+        return np.random.Generator(np.random.PCG64(seed_sequence))
+
+    def setup_generator(self, walker_index: int) -> np.random.Generator:
+        """
+        Creates the random generator a walker draws its settings from when it is
+        created, like the bias of a biased walker, apart from its repetition streams.
+
+        Args:
+            walker_index (int): The index of the walker in the walker list.
+
+        Returns:
+            np.random.Generator: The generator, always the same for the same walker.
+        """
+        seed_sequence = np.random.SeedSequence(
+            self.__entropy, spawn_key=(walker_index,)
+        )
+        return np.random.Generator(np.random.PCG64(seed_sequence))
+
+    def generators(
+        self, walker_index: int, first_repetition: int, count: int
+    ) -> List[np.random.Generator]:
+        """
+        Creates the random generators of a walker in a range of repetitions.
+
+        Args:
+            walker_index (int): The index of the walker in the walker list.
+            first_repetition (int): The first repetition index.
+            count (int): The amount of repetitions.
+
+        Returns:
+            List[np.random.Generator]: The generators, in repetition order.
+        """
+        return [
+            self.generator(walker_index, repetition)
+            for repetition in range(first_repetition, first_repetition + count)
+        ]
@@ -0,0 +1,127 @@
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+# the first repetition and the amount of repetitions of a block
+Block = Tuple[int, int]
+
+
+class RepetitionSums:
+
+    def __init__(
+        self, first_repetition: int, count: int, steps: int, shape: Tuple[int, ...]
+    ) -> None:
+        """
+        Initializes a RepetitionSums object, the per step sums of some metrics over
+        a range of repetitions.
+
+        The repetitions are summed in a fixed pairwise tree over their global index,
+        the sum of an aligned block of 2^k repetitions is the sum of its two halves.
+        A range keeps the sums of the largest aligned blocks it covers, so the sums
+        of the slices of a run are merged by adding the same halves in the same
+        order, and give the same bits as summing the whole run at once, however the
+        repetitions were split.
+
+        Args:
+            first_repetition (int): The global index of the first repetition.
+            count (int): The amount of repetitions.
+            steps (int): The amount of steps.
+            shape (Tuple[int, ...]): The shape of the values of a repetition at a step.
+        """
+        self.__steps = steps
+        self.__shape = shape
+        self.__blocks: Dict[Block, np.ndarray] = {
+            block: np.zeros((steps, *shape))
+            for block in self.decompose(first_repetition, first_repetition + count)
+        }
+        self.__first_repetition = first_repetition
+
+    @staticmethod
+    def decompose(start: int, stop: int) -> List[Block]:
+        """
+        Splits a range of repetitions into the largest aligned blocks it covers.
+
+        Args:
+            start (int): The first repetition.
+            stop (int): The end of the range.
+
+        Returns:
+            List[Block]: The blocks, in order.
+        """
+        blocks: List[Block] = []
+        while start < stop:
+            # the largest power of two that start is a multiple of, and that fits
+            size = start & -start if start else 1 << (stop - 1).bit_length()
+            while start + size > stop:
+                size //= 2
+            blocks.append((start, size))
+            start += size
+        return blocks
+
+    def get_blocks(self) -> Dict[Block, np.ndarray]:
+        """
+        Returns the sums of the blocks.
+
+        Returns:
+            Dict[Block, np.ndarray]: The (steps, *shape) sums of every block.
+        """
+        return self.__blocks
+
+    def add_step(self, step: int, values: np.ndarray) -> None:
+        """
+        Sums the values of a step.
+
+        Args:
+            step (int): The step index.
+            values (np.ndarray): The (*shape, count) values, the repetitions on the last axis.
+        """
+        for start, size in self.__blocks:
+            offset = start - self.__first_repetition
+            block_values = values[..., offset : offset + size]
+            while block_values.shape[-1] > 1:
+                block_values = block_values[..., 0::2] + block_values[..., 1::2]
+            self.__blocks[(start, size)][step] = block_values[..., 0]
+
+    def merge(self, other: "RepetitionSums") -> None:
+        """
+        Adds the blocks of another range of repetitions.
+
+        Args:
+            other (RepetitionSums): The sums of a range that doesn't overlap this one.
+        """
+        self.__blocks.update(other.get_blocks())
+
+    def _combine(self, start: int, size: int) -> Optional[np.ndarray]:
+        """
+        Sums an aligned block from its halves.
+
+        Args:
+            start (int): The first repetition of the block.
+            size (int): The amount of repetitions, a power of two.
+
+        Returns:
+            Optional[np.ndarray]: The (steps, *shape) sums, None if no repetition of the block is kept.
+        """
+        if (start, size) in self.__blocks:
+            return self.__blocks[(start, size)]
+        if size == 1 or not any(
+            start <= block_start < start + size for block_start, _ in self.__blocks
+        ):
+            return None
+        low = self._combine(start, size // 2)
+        high = self._combine(start + size // 2, size // 2)
+        if low is None or high is None:
+            return high if low is None else low
+        total: np.ndarray = low + high
+        return total
+
+    def total(self) -> np.ndarray:
+        """
+        Sums all the kept repetitions.
+
+        Returns:
+            np.ndarray: The (steps, *shape) sums.
+        """
+        stop = max((start + size for start, size in self.__blocks), default=0)
+        root = 1 << max(stop - 1, 0).bit_length()
+        total = self._combine(0, root)
+        return np.zeros((self.__steps, *self.__shape)) if total is None else total
@@ -2,11 +2,12 @@ from move import Move
 from walker import Walker
 from math_functions import MathFunctions
 from custom_types import *
-from typing import Tuple
-import random
+from typing import Tuple, List
 
 class ResetableWalker(Walker):
 
+    __slots__: List[str] = []
+
     __RESET_CHANCE_SCALE = 0.1
     
     def __init__(
@@ -21,7 +22,7 @@ class ResetableWalker(Walker):
         super().__init__(name, mass)
 
         self._is_3d = is_3d
-        self.__step = 1
+        self._step = 1
 
     def _generate_move_radius(self) -> float:
         """
@@ -30,7 +31,7 @@ class ResetableWalker(Walker):
         Returns:
             float: The move radius for the current step.
         """
-        self.__step = self.__step + 1
+        self._step = self._step + 1
         return 1.0
 
     def _generate_move_angle(self) -> Tuple[float, float]:
@@ -43,9 +44,9 @@ class ResetableWalker(Walker):
         """
         result = None
         if self._is_3d:
-            result = (MathFunctions.random_angle(), MathFunctions.random_angle())
+            result = (MathFunctions.random_angle(self._rng), MathFunctions.random_angle(self._rng))
         else:
-            result = (MathFunctions.random_angle(), 0.0)
+            result = (MathFunctions.random_angle(self._rng), 0.0)
 
         return result
     
@@ -55,8 +56,8 @@ class ResetableWalker(Walker):
         Args:
             move (Move): the move to make if the walker doesn't reset
         """
-        reset_chance = 1 - 1 / (self.__step * self.__RESET_CHANCE_SCALE)
-        if random.random() < reset_chance:
+        reset_chance = 1 - 1 / (self._step * self.__RESET_CHANCE_SCALE)
+        if self._rng.random() < reset_chance:
             self.reset()
         else:
             super().move(move)
@@ -65,5 +66,5 @@ class ResetableWalker(Walker):
         """
         Resets the state of the walker and sets the step count to 0.
         """
-        self.__step = 1
+        self._step = 1
         super().reset()
\ No newline at end of file
@@ -0,0 +1,378 @@
+from quantile_sketch import QuantileSketch
+from repetition_sums import Block, RepetitionSums
+from statistics import NormalDist
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# the count, mean and sum of squared differences at each step
+Moments = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+class RunningStats(object):
+
+    QUANTILES = (0.05, 0.5, 0.95)
+
+    def __init__(self, length: int, relative_accuracy: float = 0.02) -> None:
+        """
+        Initializes a RunningStats object.
+
+        Streams the value of a metric at every step of every repetition, keeping
+        the count, mean and variance with Welford's algorithm and the quantiles in a
+        QuantileSketch. The memory only depends on the amount of steps and the
+        distinct buckets of the values, and two objects can be merged, so every
+        thread or process can keep its own.
+
+        The repetitions of the batch engine are added with their global index, and
+        their moments are combined in the fixed pairwise tree of RepetitionSums: the
+        moments of every aligned block are kept, and folded together when they are
+        read, so the statistics are the same bits however the run was sliced.
+
+        Args:
+            length (int): The amount of steps.
+            relative_accuracy (float, optional): The relative error of the quantiles. Defaults to 0.02.
+        """
+        self.__count = np.zeros(length, np.int64)
+        self.__mean = np.zeros(length, np.float64)
+        self.__m2 = np.zeros(length, np.float64)
+        self.__sketch = QuantileSketch(length, relative_accuracy)
+        # the moments of the aligned blocks of repetitions added with their index
+        self.__blocks: Dict[Block, Moments] = {}
+        self.__folded = True
+
+    def get_length(self) -> int:
+        """
+        Returns the amount of steps.
+
+        Returns:
+            int: The amount of steps.
+        """
+        return len(self.__count)
+
+    def get_count(self) -> np.ndarray:
+        """
+        Returns the amount of values at each step.
+
+        Returns:
+            np.ndarray: The (length,) counts.
+        """
+        self._fold()
+        return self.__count
+
+    def get_mean(self) -> np.ndarray:
+        """
+        Returns the mean at each step.
+
+        Returns:
+            np.ndarray: The (length,) means.
+        """
+        self._fold()
+        return self.__mean
+
+    def get_m2(self) -> np.ndarray:
+        """
+        Returns the sum of squared differences from the mean at each step.
+
+        Returns:
+            np.ndarray: The (length,) sums.
+        """
+        self._fold()
+        return self.__m2
+
+    def get_sketch(self) -> QuantileSketch:
+        """
+        Returns the quantile sketch.
+
+        Returns:
+            QuantileSketch: The sketch.
+        """
+        return self.__sketch
+
+    def get_blocks(self) -> Dict[Block, Moments]:
+        """
+        Returns the moments of the blocks of repetitions added with their index.
+
+        Returns:
+            Dict[Block, Moments]: The (length,) count, mean and sum of squared differences of every block.
+        """
+        return self.__blocks
+
+    @staticmethod
+    def _pair(low: Moments, high: Moments) -> Moments:
+        """
+        Combines the moments of two groups of values (Chan et al.).
+
+        Args:
+            low (Moments): The moments of the first group.
+            high (Moments): The moments of the second group.
+
+        Returns:
+            Moments: The moments of both groups.
+        """
+        low_count, low_mean, low_m2 = low
+        high_count, high_mean, high_m2 = high
+        count = low_count + high_count
+        safe_count = np.maximum(count, 1)
+        delta = high_mean - low_mean
+        return (
+            count,
+            low_mean + delta * high_count / safe_count,
+            low_m2 + high_m2 + delta**2 * low_count * high_count / safe_count,
+        )
+
+    def _fold_block(self, start: int, size: int) -> Optional[Moments]:
+        """
+        Combines the moments of an aligned block of repetitions from its halves.
+
+        Args:
+            start (int): The first repetition of the block.
+            size (int): The amount of repetitions, a power of two.
+
+        Returns:
+            Optional[Moments]: The moments, None if no repetition of the block was added.
+        """
+        if (start, size) in self.__blocks:
+            return self.__blocks[(start, size)]
+        if size == 1 or not any(
+            start <= block_start < start + size for block_start, _ in self.__blocks
+        ):
+            return None
+        low = self._fold_block(start, size // 2)
+        high = self._fold_block(start + size // 2, size // 2)
+        if low is None or high is None:
+            return high if low is None else low
+        return self._pair(low, high)
+
+    def _fold(self) -> None:
+        """
+        Folds the moments of the blocks of repetitions into the moments of the steps.
+        """
+        if self.__folded:
+            return
+        self.__folded = True
+        stop = max(start + size for start, size in self.__blocks)
+        moments = self._fold_block(0, 1 << max(stop - 1, 0).bit_length())
+        if moments is not None:
+            count, mean, m2 = moments
+            self.__count = count.astype(np.int64)
+            self.__mean = mean.copy()
+            self.__m2 = m2.copy()
+
+    def _combine(
+        self, steps: slice, count: np.ndarray, mean: np.ndarray, m2: np.ndarray
+    ) -> None:
+        """
+        Combines the moments of a group of values into some of the steps (Chan et al.).
+
+        Args:
+            steps (slice): The steps the group covers.
+            count (np.ndarray): The amount of values in the group at each step.
+            mean (np.ndarray): The mean of the group at each step.
+            m2 (np.ndarray): The sum of squared differences of the group at each step.
+        """
+        total = self.__count[steps] + count
+        safe_total = np.maximum(total, 1)
+        delta = mean - self.__mean[steps]
+        self.__mean[steps] += delta * count / safe_total
+        self.__m2[steps] += m2 + delta**2 * self.__count[steps] * count / safe_total
+        self.__count[steps] = total
+
+    def add(
+        self,
+        values: np.ndarray,
+        first_step: int = 0,
+        first_repetition: Optional[int] = None,
+    ) -> None:
+        """
+        Adds repetitions, a value for each step.
+
+        Args:
+            values (np.ndarray): The (steps,) values of a repetition, or (repetitions, steps) values.
+                A repetition that was stopped early may have less steps.
+            first_step (int, optional): The step of the first value of a repetition, for values
+                added a block of steps at a time. Defaults to 0.
+            first_repetition (Optional[int], optional): The global index of the first repetition, which
+                sums the repetitions in the fixed pairwise tree. The steps of a repetition are added once.
+                Defaults to None, which adds the values to the moments in the order they come.
+
+        Raises:
+            ValueError: If indexed repetitions are added after repetitions without an index.
+        """
+        values = np.atleast_2d(np.asarray(values, np.float64))
+        if values.size == 0:
+            return
+        if first_repetition is not None:
+            self._add_blocks(values, first_step, first_repetition)
+            self.__sketch.add(values, first_step)
+            return
+        if self.__blocks:
+            # the blocks become the moments the next values are added to
+            self._fold()
+            self.__blocks = {}
+        mean = values.mean(axis=0)
+        self._combine(
+            slice(first_step, first_step + values.shape[1]),
+            np.full(values.shape[1], len(values)),
+            mean,
+            np.sum((values - mean) ** 2, axis=0),
+        )
+        self.__sketch.add(values, first_step)
+
+    def _add_blocks(
+        self, values: np.ndarray, first_step: int, first_repetition: int
+    ) -> None:
+        """
+        Adds the moments of the aligned blocks of some indexed repetitions, each
+        summed from its halves down to the single repetitions.
+
+        Args:
+            values (np.ndarray): The (repetitions, steps) values.
+            first_step (int): The step of the first value of a repetition.
+            first_repetition (int): The global index of the first repetition.
+
+        Raises:
+            ValueError: If repetitions without an index were added before.
+        """
+        if not self.__blocks and self.__count.any():
+            raise ValueError(
+                "indexed repetitions can't be added after repetitions without an index"
+            )
+        steps = slice(first_step, first_step + values.shape[1])
+        length = self.get_length()
+        for start, size in RepetitionSums.decompose(
+            first_repetition, first_repetition + len(values)
+        ):
+            offset = start - first_repetition
+            block_values = values[offset : offset + size].T
+            moments: Moments = (
+                np.ones_like(block_values),
+                block_values,
+                np.zeros_like(block_values),
+            )
+            while moments[0].shape[-1] > 1:
+                moments = self._pair(
+                    (moments[0][:, 0::2], moments[1][:, 0::2], moments[2][:, 0::2]),
+                    (moments[0][:, 1::2], moments[1][:, 1::2], moments[2][:, 1::2]),
+                )
+            if (start, size) not in self.__blocks:
+                self.__blocks[(start, size)] = (
+                    np.zeros(length),
+                    np.zeros(length),
+                    np.zeros(length),
+                )
+            for kept, block in zip(self.__blocks[(start, size)], moments):
+                kept[steps] = block[:, 0]
+        self.__folded = False
+
+    def add_step(self, step: int, values: np.ndarray) -> None:
+        """
+        Adds many values of a single step, like the repetitions of the batch engine.
+
+        Args:
+            step (int): The step index.
+            values (np.ndarray): The (n,) values.
+        """
+        self.add(np.asarray(values, np.float64).reshape(-1, 1), step)
+
+    def merge(self, other: "RunningStats") -> None:
+        """
+        Adds the values streamed into another object.
+
+        Args:
+            other (RunningStats): The other object, with the same length.
+
+        Raises:
+            ValueError: If the lengths are different.
+        """
+        if other.get_length() != self.get_length():
+            raise ValueError("only statistics with the same length can be merged")
+        if other.get_blocks() and (self.__blocks or not self.__count.any()):
+            # disjoint indexed repetitions are folded in the same tree as a single run
+            self.__blocks.update(other.get_blocks())
+            self.__folded = False
+            self.__sketch.merge(other.get_sketch())
+            return
+        self._fold()
+        self.__blocks = {}
+        self._combine(
+            slice(0, self.get_length()),
+            other.get_count(),
+            other.get_mean(),
+            other.get_m2(),
+        )
+        self.__sketch.merge(other.get_sketch())
+
+    def get_variance(self) -> np.ndarray:
+        """
+        Returns the sample variance at each step.
+
+        Returns:
+            np.ndarray: The (length,) variances, 0 for the steps with less than two values.
+        """
+        self._fold()
+        variance: np.ndarray = np.where(
+            self.__count > 1, self.__m2 / np.maximum(self.__count - 1, 1), 0.0
+        )
+        return variance
+
+    def get_std(self) -> np.ndarray:
+        """
+        Returns the sample standard deviation at each step.
+
+        Returns:
+            np.ndarray: The (length,) standard deviations.
+        """
+        std: np.ndarray = np.sqrt(self.get_variance())
+        return std
+
+    def confidence_interval(
+        self, confidence: float = 0.95
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the normal confidence interval of the mean at each step.
+
+        Args:
+            confidence (float, optional): The confidence level. Defaults to 0.95.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The (length,) low and high ends of the interval.
+        """
+        z = NormalDist().inv_cdf((1 + confidence) / 2)
+        self._fold()
+        half_width = z * self.get_std() / np.sqrt(np.maximum(self.__count, 1))
+        return self.__mean - half_width, self.__mean + half_width
+
+    def quantile(self, q: float) -> np.ndarray:
+        """
+        Estimates a quantile at each step.
+
+        Args:
+            q (float): The quantile, between 0 and 1.
+
+        Returns:
+            np.ndarray: The (length,) quantiles.
+        """
+        return self.__sketch.quantile(q)
+
+    def to_dict(self, quantiles: Sequence[float] = QUANTILES) -> Dict[str, List[float]]:
+        """
+        Summarizes the statistics for the log.
+
+        Args:
+            quantiles (Sequence[float], optional): The quantiles to add. Defaults to QUANTILES.
+
+        Returns:
+            Dict[str, List[float]]: The count, mean, std, 95% confidence interval
+            and quantiles (p5, p50, ...) at each step.
+        """
+        low, high = self.confidence_interval()
+        self._fold()
+        summary: Dict[str, List[float]] = {
+            "count": self.__count.astype(float).tolist(),
+            "mean": self.__mean.tolist(),
+            "std": self.get_std().tolist(),
+            "ci_low": low.tolist(),
+            "ci_high": high.tolist(),
+        }
+        for q in quantiles:
+            summary[f"p{round(q * 100):g}"] = self.quantile(q).tolist()
+        return summary
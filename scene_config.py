@@ -0,0 +1,258 @@
+from custom_types import *
+from obstacle import Obstacle
+from teleporter import Teleporter
+from speed_zone import SpeedZone
+from obstacle_store import ObstacleStore
+import json
+import numpy as np
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# a field check gets a column and returns the index of the first bad value, or -1
+FieldCheck = Callable[[np.ndarray], int]
+
+
+def _first_false(valid: np.ndarray) -> int:
+    """
+    Finds the first row with a False value.
+
+    Args:
+        valid (np.ndarray): A boolean array, one or more values per row.
+
+    Returns:
+        int: The row index, -1 if all the values are True.
+    """
+    rows = np.asarray(valid.reshape(len(valid), -1).all(axis=1))
+    return -1 if rows.all() else int(np.argmin(rows))
+
+
+class SceneConfig(object):
+
+    # the section of every obstacle type, in the order the grid keeps them
+    SECTIONS: Dict[str, int] = {
+        "teleporters": ObstacleStore.TELEPORTER,
+        "obstacles": ObstacleStore.OBSTACLE,
+        "speed zones": ObstacleStore.SPEED_ZONE,
+    }
+    # the fields of every section, with the shape of a value and its check
+    __SCHEMA: Dict[str, Tuple[Tuple[str, Tuple[int, ...], str], ...]] = {
+        "teleporters": (
+            ("location", (3,), "finite"),
+            ("radius", (), "positive"),
+            ("target", (3,), "finite"),
+        ),
+        "obstacles": (
+            ("location", (3,), "finite"),
+            ("radius", (), "positive"),
+        ),
+        "speed zones": (
+            ("location", (3,), "finite"),
+            ("radius", (), "positive"),
+            ("speed factor", (), "positive"),
+        ),
+    }
+    __CHECKS: Dict[str, Tuple[str, FieldCheck]] = {
+        "finite": ("must be finite", lambda column: _first_false(np.isfinite(column))),
+        "positive": (
+            "must be positive",
+            lambda column: _first_false(np.isfinite(column) & (column > 0)),
+        ),
+    }
+
+    def __init__(self, store: ObstacleStore) -> None:
+        """
+        Initializes a SceneConfig object, a validated scene.
+
+        A scene is read with load, which parses the config file once, checks every
+        section against the schema and builds the obstacle arrays straight from the
+        parsed columns. A file with any error raises before a scene is made, so the
+        scene in use is only ever replaced by a complete and valid one.
+
+        Args:
+            store (ObstacleStore): The obstacles of the scene.
+        """
+        self.__store = store
+
+    @staticmethod
+    def load(path: str) -> "SceneConfig":
+        """
+        Reads and validates a config file.
+
+        Args:
+            path (str): The path to the config file.
+
+        Raises:
+            OSError: If the file can not be read.
+            ValueError: If the file is not valid JSON or does not match the schema,
+                with every problem found in the file.
+
+        Returns:
+            SceneConfig: The scene.
+        """
+        with open(path, "rb") as f:
+            data = json.load(f)
+        return SceneConfig.from_dict(data)
+
+    @staticmethod
+    def from_dict(data: Any) -> "SceneConfig":
+        """
+        Validates parsed config data.
+
+        Args:
+            data (Any): The parsed config, a dictionary with a list for every section.
+
+        Raises:
+            ValueError: If the data does not match the schema, with every problem found.
+
+        Returns:
+            SceneConfig: The scene.
+        """
+        if not isinstance(data, dict):
+            raise ValueError("invalid scene config: the config must be a JSON object")
+        errors: List[str] = []
+        sections: List[Tuple[str, Dict[str, np.ndarray]]] = []
+        for section in SceneConfig.SECTIONS:
+            items = data.get(section)
+            if not isinstance(items, list):
+                errors.append(f'"{section}" must be a list')
+                continue
+            columns = {}
+            for field, shape, check in SceneConfig.__SCHEMA[section]:
+                column = SceneConfig._column(section, items, field, shape, check, errors)
+                if column is not None:
+                    columns[field] = column
+            sections.append((section, columns))
+        if errors:
+            raise ValueError("invalid scene config:\n" + "\n".join(errors))
+
+        # every section is valid, building the arrays from the columns
+        centers = np.concatenate(
+            [columns["location"] for _, columns in sections]
+        ).reshape(-1, 3)
+        radii = np.concatenate([columns["radius"] for _, columns in sections])
+        kinds = np.concatenate(
+            [
+                np.full(len(columns["radius"]), SceneConfig.SECTIONS[section], np.int8)
+                for section, columns in sections
+            ]
+        )
+        targets = np.concatenate(
+            [
+                columns.get("target", np.zeros((len(columns["radius"]), 3)))
+                for _, columns in sections
+            ]
+        ).reshape(-1, 3)
+        speed_factors = np.concatenate(
+            [
+                columns.get("speed factor", np.ones(len(columns["radius"])))
+                for _, columns in sections
+            ]
+        )
+        return SceneConfig(
+            ObstacleStore(centers, radii, kinds, targets, speed_factors)
+        )
+
+    @staticmethod
+    def _column(
+        section: str,
+        items: Sequence[Any],
+        field: str,
+        shape: Tuple[int, ...],
+        check: str,
+        errors: List[str],
+    ) -> Optional[np.ndarray]:
+        """
+        Gathers a field of all the items of a section into an array, and checks it.
+
+        The whole column is gathered and checked at once, the items are only looked
+        at one by one to find the first bad one when the column is not valid.
+
+        Args:
+            section (str): The section name.
+            items (Sequence[Any]): The items of the section.
+            field (str): The field name.
+            shape (Tuple[int, ...]): The shape of a single value.
+            check (str): The name of the check of the values.
+            errors (List[str]): The list the problems are added to.
+
+        Returns:
+            Optional[np.ndarray]: The (n, *shape) column, None if it is not valid.
+        """
+        try:
+            values = [item[field] for item in items]
+        except (KeyError, TypeError, IndexError):
+            index = next(
+                index
+                for index, item in enumerate(items)
+                if not isinstance(item, dict) or field not in item
+            )
+            errors.append(f'{section}[{index}]: missing "{field}"')
+            return None
+
+        if not values:
+            return np.zeros((0,) + shape, np.float64)
+
+        expected = "a number" if shape == () else f"{shape[0]} numbers"
+        try:
+            column = np.array(values, np.float64)
+        except (TypeError, ValueError):
+            column = None
+        if column is None or column.shape != (len(values),) + shape:
+            for index, value in enumerate(values):
+                try:
+                    if np.shape(np.array(value, np.float64)) != shape:
+                        break
+                except (TypeError, ValueError):
+                    break
+            errors.append(f'{section}[{index}]: "{field}" must be {expected}')
+            return None
+
+        message, first_bad = SceneConfig.__CHECKS[check]
+        index = first_bad(column)
+        if index != -1:
+            errors.append(f'{section}[{index}]: "{field}" {message}')
+            return None
+        return column
+
+    def __len__(self) -> int:
+        """
+        Returns the amount of obstacles in the scene.
+
+        Returns:
+            int: The amount of obstacles.
+        """
+        return len(self.__store)
+
+    def get_store(self) -> ObstacleStore:
+        """
+        Returns the obstacles of the scene as arrays.
+
+        Returns:
+            ObstacleStore: The obstacle store.
+        """
+        return self.__store
+
+    def to_obstacles(self) -> List[Obstacle]:
+        """
+        Creates the obstacle objects of the scene.
+
+        Returns:
+            List[Obstacle]: The obstacles, in the same order as the store.
+        """
+        obstacles: List[Obstacle] = []
+        for center, radius, kind, target, speed_factor in zip(
+            self.__store.get_centers().tolist(),
+            self.__store.get_radii().tolist(),
+            self.__store.get_kinds().tolist(),
+            self.__store.get_targets().tolist(),
+            self.__store.get_speed_factors().tolist(),
+        ):
+            location = Types.cast_to_vector3(center)
+            if kind == ObstacleStore.TELEPORTER:
+                obstacles.append(
+                    Teleporter(location, radius, Types.cast_to_vector3(target))
+                )
+            elif kind == ObstacleStore.SPEED_ZONE:
+                obstacles.append(SpeedZone(location, radius, speed_factor))
+            else:
+                obstacles.append(Obstacle(location, radius))
+        return obstacles
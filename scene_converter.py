@@ -0,0 +1,62 @@
+from scene_config import SceneConfig
+from typing import List, Optional
+import argparse
+import sys
+
+
+HELP_STRING = """
+Converts a JSON config file into the binary scene format, which Simulation.config
+and the headless runner load by mapping it instead of parsing it, for example
+    python scene_converter.py config.json scene.bin
+The file is validated like a JSON config, the records are sorted along x.
+"""
+
+
+def convert(input_path: str, output_path: str) -> int:
+    """
+    Converts a JSON config file into a binary scene file.
+
+    Args:
+        input_path (str): The path to the JSON config file.
+        output_path (str): The path to the binary scene file.
+
+    Raises:
+        OSError: If a file can not be read or written.
+        ValueError: If the config file is not valid.
+
+    Returns:
+        int: The amount of obstacles written.
+    """
+    scene = SceneConfig.load(input_path)
+    scene.get_store().save(output_path)
+    return len(scene)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Runs the converter.
+
+    Args:
+        argv (Optional[List[str]], optional): The command line arguments, sys.argv if not provided. Defaults to None.
+
+    Returns:
+        int: The exit code.
+    """
+    parser = argparse.ArgumentParser(
+        description=HELP_STRING, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("input", help="the JSON config file")
+    parser.add_argument("output", help="the binary scene file to write")
+    args = parser.parse_args(argv)
+
+    try:
+        count = convert(args.input, args.output)
+    except (OSError, ValueError) as error:
+        print(f"could not convert {args.input}: {error}", file=sys.stderr)
+        return 1
+    print(f"wrote {count} obstacles to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
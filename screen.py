@@ -4,8 +4,12 @@ import OpenGL.GL as GL  # type: ignore[import]
 import OpenGL.GLU as GLU  # type: ignore[import]
 from custom_types import *
 from custom_types import *
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 from walker import Walker
+from trail_buffer import TrailBuffer
+from snapshot_ring import SnapshotRing
+from obstacle_chunks import ObstacleChunks
+import numpy as np
 from obstacle import Obstacle
 from teleporter import Teleporter
 from speed_zone import SpeedZone
@@ -17,7 +21,20 @@ class Screen:
 
     __STARTING_LOCATION = (20, -20, 20)
     INF = 50000
+    # the half length of the drawn axes
+    AXIS_LENGTH = 1000.0
+    __FIELD_OF_VIEW = 45
+    __NEAR = 0.1
+    __FAR = 50000.0
+    # the size in pixels of the obstacles drawn as points
+    __POINT_SIZE = 2
     __WALKER_COLOR = (0.2, 0.6, 0.2)
+    # the bytes of a trail point, three float32
+    __POINT_BYTES = 12
+    # the most points a trail holds, the older points are decimated past it
+    TRAIL_BUDGET = 20000
+    # the slices and stacks of the sphere meshes, from the most detailed
+    SPHERE_DETAILS = [(32, 16), (16, 8), (8, 4)]
 
     def __init__(self, width: float, height: float) -> None:
         """
@@ -33,8 +50,37 @@ class Screen:
         self.__obstacles: List[Obstacle] = []
 
         self.__walkers: List[Walker] = []
-        self.__trails: Dict[Walker, List[Types.vector3]] = {}
-        self.__trails_lock = threading.Lock()
+        # the simulation threads publish their steps into the rings, and the
+        # render thread moves them into the trails, so the two never share a lock
+        self.__rings: Dict[Walker, SnapshotRing] = {}
+        self.__trail_budget: Optional[int] = self.TRAIL_BUDGET
+        # the trails, their generations, the newest locations and the vertex
+        # buffers are only touched by the render thread
+        self.__trails: Dict[Walker, TrailBuffer] = {}
+        self.__generations: Dict[Walker, int] = {}
+        self.__locations: Dict[Walker, Types.vector3] = {}
+        # the vertex buffer of every trail and the amount of points it holds
+        self.__trail_buffers: Dict[Walker, List[int]] = {}
+        # a display list of a unit sphere for every detail level, made on first use
+        self.__sphere_lists: Dict[int, int] = {}
+        # a display list drawing all the obstacles, rebuilt when they change
+        # the obstacles are grouped into chunks that are culled against the view,
+        # every chunk has a display list for every level of detail it was drawn at
+        self.__chunks: Optional[ObstacleChunks] = None
+        self.__chunk_obstacles: List[Obstacle] = []
+        self.__chunk_colors: List[Types.vector3] = []
+        self.__chunk_lists: Dict[Tuple[int, int], int] = {}
+        # the visible chunks are only found again when the camera moves
+        self.__visible_chunks: List[Tuple[int, int]] = []
+        self.__visible_view: Optional[bytes] = None
+        self.__obstacles_changed = True
+        self.__projection = ObstacleChunks.perspective(
+            self.__FIELD_OF_VIEW, width / height, self.__NEAR, self.__FAR
+        )
+        # the view matrix in the column major layout of glGetFloatv, until the screen reads it
+        self.__view_matrix = ObstacleChunks.look_at(
+            self.__STARTING_LOCATION, (0, 0, 0), (0, 0, 1)
+        ).T.astype(np.float32)
         self.__colors: Dict[Walker, Types.vector3] = {}
 
         self.__run = True
@@ -52,6 +98,8 @@ class Screen:
         GL.glEnable(GL.GL_LIGHTING)
         GL.glShadeModel(GL.GL_SMOOTH)
         GL.glEnable(GL.GL_COLOR_MATERIAL)
+        # the spheres are unit meshes scaled by their radius
+        GL.glEnable(GL.GL_RESCALE_NORMAL)
         GL.glColorMaterial(GL.GL_FRONT_AND_BACK, GL.GL_AMBIENT_AND_DIFFUSE)
         # enabling openGL lightning
         GL.glEnable(GL.GL_LIGHT0)
@@ -59,13 +107,24 @@ class Screen:
         GL.glLightfv(GL.GL_LIGHT0, GL.GL_DIFFUSE, [1.0, 1.0, 1.0, 1])
         # setting up the matrix
         GL.glMatrixMode(GL.GL_PROJECTION)
-        GLU.gluPerspective(45, (self.__display[0] / self.__display[1]), 0.1, 50000.0)
+        GLU.gluPerspective(
+            self.__FIELD_OF_VIEW,
+            (self.__display[0] / self.__display[1]),
+            self.__NEAR,
+            self.__FAR,
+        )
 
         GL.glMatrixMode(GL.GL_MODELVIEW)
         GLU.gluLookAt(*self.__STARTING_LOCATION, 0, 0, 0, 0, 0, 1)
         self.__view_matrix = GL.glGetFloatv(GL.GL_MODELVIEW_MATRIX)
         GL.glLoadIdentity()
 
+        # the display lists and buffers of an earlier context are gone
+        self.__sphere_lists = {}
+        self.__chunk_lists = {}
+        self.__obstacles_changed = True
+        self.__trail_buffers = {}
+
     def get_walkers(self) -> List[Walker]:
         """
         Returns a list of Walker objects currently on the screen.
@@ -82,9 +141,9 @@ class Screen:
         Parameters:
             walker (Walker): The walker object to be added.
         """
-        self.__walkers.append(walker)
-        self.__trails[walker] = []
         self.__colors[walker] = (random.random(), random.random(), random.random())
+        self.__rings[walker] = SnapshotRing()
+        self.__walkers.append(walker)
 
     def remove_walker(self, walker: Walker) -> None:
         """
@@ -94,9 +153,8 @@ class Screen:
             walker (Walker): The walker object to be removed.
         """
         self.__walkers.remove(walker)
-        self.__trails_lock.acquire()
-        del self.__trails[walker]
-        self.__trails_lock.release()
+        # the render thread drops the trail when the ring is gone
+        del self.__rings[walker]
 
     def reset_trail(self, walker: Walker) -> None:
         """
@@ -105,28 +163,92 @@ class Screen:
         Parameters:
             walker (Walker): The walker whose trail needs to be reset.
         """
-        self.__trails_lock.acquire()
-        self.__trails[walker] = []
-        self.__trails_lock.release()
+        if walker in self.__rings:
+            self.__rings[walker].reset()
         self.__colors[walker] = (random.random(), random.random(), random.random())
 
     def add_to_trail(self, walker: Walker, position: Types.vector3) -> None:
         """
         Adds a position to the trail of a given walker.
 
+        The position is published to the render thread without waiting for it,
+        it reaches the trail when the next frame consumes it.
+
         Args:
             walker (Walker): The walker object.
             position (Types.vector3): The position to be added to the trail.
         """
-        if walker in self.__trails:
-            self.__trails[walker].append(position)
+        ring = self.__rings.get(walker)
+        if ring is not None:
+            ring.publish(position)
+
+    def set_trail_budget(self, budget: Optional[int]) -> None:
+        """
+        Sets the most points a walker's trail holds, the recent points are kept
+        at full resolution and the older ones are decimated. The trails take the
+        budget on the next frame.
+
+        Args:
+            budget (Optional[int]): The points per walker, at least TrailBuffer.MIN_BUDGET, None to keep every point.
+
+        Raises:
+            ValueError: If the budget is smaller than TrailBuffer.MIN_BUDGET.
+        """
+        if budget is not None and budget < TrailBuffer.MIN_BUDGET:
+            raise ValueError(
+                f"the trail budget must be at least {TrailBuffer.MIN_BUDGET}"
+            )
+        self.__trail_budget = budget
 
-    def get_trails(self) -> Dict[Walker, List[Types.vector3]]:
+    def get_trail_budget(self) -> Optional[int]:
         """
-        Returns a dictionary containing the trails of each walker.
+        Returns the most points a walker's trail holds.
 
         Returns:
-            Dict[Walker, List[Types.vector3]]: A dictionary where the keys are Walker objects and the values are lists of Types.vector3 objects representing the trails.
+            Optional[int]: The points per walker, None if every point is kept.
+        """
+        return self.__trail_budget
+
+    def consume(self) -> None:
+        """
+        Moves the steps the simulation threads published since the last frame into
+        the trails, called by the render thread.
+
+        A trail is cleared when its walker reset it, and dropped with its vertex
+        buffer when its walker was removed.
+        """
+        rings = dict(self.__rings)
+        for walker in [walker for walker in self.__trails if walker not in rings]:
+            del self.__trails[walker]
+            del self.__generations[walker]
+            self.__locations.pop(walker, None)
+            if walker in self.__trail_buffers:
+                GL.glDeleteBuffers(1, [self.__trail_buffers.pop(walker)[0]])
+
+        for walker, ring in rings.items():
+            if walker not in self.__trails:
+                self.__trails[walker] = TrailBuffer(self.__trail_budget)
+                self.__generations[walker] = 0
+            trail = self.__trails[walker]
+            if trail.get_budget() != self.__trail_budget:
+                trail.set_budget(self.__trail_budget)
+            for generation, location in ring.consume():
+                if generation != self.__generations[walker]:
+                    # the walker started a new repetition, the vertex buffer is refilled
+                    trail.clear()
+                    self.__generations[walker] = generation
+                trail.append(location)
+                self.__locations[walker] = location
+            if ring.get_generation() != self.__generations[walker]:
+                trail.clear()
+                self.__generations[walker] = ring.get_generation()
+
+    def get_trails(self) -> Dict[Walker, TrailBuffer]:
+        """
+        Returns a dictionary containing the trails of each walker, as of the last frame.
+
+        Returns:
+            Dict[Walker, TrailBuffer]: A dictionary where the keys are Walker objects and the values are the buffers of the trail points.
         """
         return self.__trails
 
@@ -134,10 +256,14 @@ class Screen:
         """
         Set the obstacle list on the screen.
 
+        The render thread groups the obstacles into culled chunks on the next frame,
+        every chunk is drawn by prebuilt display lists.
+
         Args:
             obstacles (List[Obstacle]): A list of obstacles to be set on the screen.
         """
         self.__obstacles = obstacles
+        self.__obstacles_changed = True
 
     def get_obstacles(self) -> List[Obstacle]:
         """
@@ -166,7 +292,34 @@ class Screen:
         GL.glVertex3fv(final_point)
         GL.glEnd()
 
-    def render_sphere(self, location: Types.vector3, radius: float, color: Types.vector3) -> None:
+    def get_sphere_list(self, detail: int = 0) -> int:
+        """
+        Returns the display list of a unit sphere, tessellating it on the first call.
+
+        Args:
+            detail (int, optional): The index of the detail level in SPHERE_DETAILS. Defaults to 0.
+
+        Returns:
+            int: The display list.
+        """
+        if detail not in self.__sphere_lists:
+            slices, stacks = self.SPHERE_DETAILS[detail]
+            quadric = GLU.gluNewQuadric()
+            sphere_list = GL.glGenLists(1)
+            GL.glNewList(sphere_list, GL.GL_COMPILE)
+            GLU.gluSphere(quadric, 1.0, slices, stacks)
+            GL.glEndList()
+            GLU.gluDeleteQuadric(quadric)
+            self.__sphere_lists[detail] = sphere_list
+        return self.__sphere_lists[detail]
+
+    def render_sphere(
+        self,
+        location: Types.vector3,
+        radius: float,
+        color: Types.vector3,
+        detail: int = 0,
+    ) -> None:
         """
         Renders a sphere at the specified location with the given radius and color.
 
@@ -174,49 +327,187 @@ class Screen:
             location (Types.vector3): The location of the sphere.
             radius (float): The radius of the sphere.
             color (Types.vector3): The color of the sphere.
+            detail (int, optional): The index of the detail level in SPHERE_DETAILS. Defaults to 0.
         """
+        sphere_list = self.get_sphere_list(detail)
+        GL.glPushMatrix()
         GL.glTranslatef(*location)
+        GL.glScalef(radius, radius, radius)
         GL.glColor3f(*color)
-        GLU.gluSphere(GLU.gluNewQuadric(), radius, 32, 16)
-        GL.glTranslatef(-location[0], -location[1], -location[2])
+        GL.glCallList(sphere_list)
+        GL.glPopMatrix()
 
-    def render_all(self) -> None:
+    def get_obstacle_color(self, obstacle: Obstacle) -> Optional[Types.vector3]:
         """
-        Renders all the elements in the simulation.
+        Returns the color an obstacle is drawn with.
+
+        Args:
+            obstacle (Obstacle): The obstacle.
+
+        Returns:
+            Optional[Types.vector3]: The color, None for obstacles that are not drawn.
+        """
+        if type(obstacle) == Obstacle:
+            return (0.1, 0.1, 0.1)
+        elif type(obstacle) == Teleporter:
+            return (0.1, 0.1, 0.5)
+        elif type(obstacle) == SpeedZone:
+            return obstacle.get_color()
+        return None
+
+    def build_chunks(self) -> None:
         """
-        for walker in self.__walkers:
-            # render walker
-            self.render_sphere(walker.get_location(), 0.5, self.__WALKER_COLOR)
-            # render trail
-            self.__trails_lock.acquire()
-            if walker in self.__trails:
-                for step in range(len(self.__trails[walker]) - 1):
-                    self.draw_line(
-                        self.__trails[walker][step],
-                        self.__trails[walker][step + 1],
-                        self.__colors[walker],
+        Groups the obstacles into the chunks that are culled, dropping the display
+        lists of the last ones.
+        """
+        for chunk_list in self.__chunk_lists.values():
+            GL.glDeleteLists(chunk_list, 1)
+        self.__chunk_lists = {}
+        self.__chunk_obstacles = []
+        self.__chunk_colors = []
+        for obstacle in self.__obstacles:
+            color = self.get_obstacle_color(obstacle)
+            if color is not None:
+                self.__chunk_obstacles.append(obstacle)
+                self.__chunk_colors.append(color)
+        self.__chunks = ObstacleChunks(
+            np.array(
+                [obstacle.get_location() for obstacle in self.__chunk_obstacles]
+            ).reshape(-1, 3),
+            np.array([obstacle.get_radius() for obstacle in self.__chunk_obstacles]),
+            self.__projection,
+            self.__display[1],
+        )
+        self.__visible_view = None
+        self.__obstacles_changed = False
+
+    def get_chunk_list(self, chunk: int, detail: int) -> int:
+        """
+        Returns the display list drawing a chunk of obstacles, compiling it on the first call.
+
+        Args:
+            chunk (int): The chunk index.
+            detail (int): The index of the sphere detail level, or ObstacleChunks.POINTS.
+
+        Returns:
+            int: The display list.
+        """
+        key = (chunk, detail)
+        if key not in self.__chunk_lists and self.__chunks is not None:
+            members = self.__chunks.get_members(chunk).tolist()
+            if detail != ObstacleChunks.POINTS:
+                # a list can't be compiled while another one is
+                self.get_sphere_list(detail)
+            chunk_list = GL.glGenLists(1)
+            GL.glNewList(chunk_list, GL.GL_COMPILE)
+            if detail == ObstacleChunks.POINTS:
+                # a few pixels wide, the obstacles are drawn as unlit points
+                GL.glDisable(GL.GL_LIGHTING)
+                GL.glPointSize(self.__POINT_SIZE)
+                GL.glBegin(GL.GL_POINTS)
+                for index in members:
+                    GL.glColor3f(*self.__chunk_colors[index])
+                    GL.glVertex3f(*self.__chunk_obstacles[index].get_location())
+                GL.glEnd()
+                GL.glEnable(GL.GL_LIGHTING)
+            else:
+                for index in members:
+                    obstacle = self.__chunk_obstacles[index]
+                    self.render_sphere(
+                        obstacle.get_location(),
+                        obstacle.get_radius(),
+                        self.__chunk_colors[index],
+                        detail,
                     )
-            self.__trails_lock.release()
+            GL.glEndList()
+            self.__chunk_lists[key] = chunk_list
+        return self.__chunk_lists[key]
 
-        # render obstacles
-        for obstacle in self.__obstacles:
-            if type(obstacle) == Obstacle:
-                self.render_sphere(
-                    obstacle.get_location(), obstacle.get_radius(), (0.1, 0.1, 0.1)
-                )
-            elif type(obstacle) == Teleporter:
-                self.render_sphere(
-                    obstacle.get_location(), obstacle.get_radius(), (0.1, 0.1, 0.5)
-                )
-            elif type(obstacle) == SpeedZone:
-                self.render_sphere(
-                    obstacle.get_location(), obstacle.get_radius(), obstacle.get_color()
-                )
+    def draw_axes(self) -> None:
+        """
+        Draws the x, y and z axes in red, green and blue, AXIS_LENGTH to each side.
+        """
+        GL.glLineWidth(5)
+        GL.glBegin(GL.GL_LINES)
+        for axis in range(3):
+            color = [0.0, 0.0, 0.0]
+            color[axis] = 1.0
+            end = [0.0, 0.0, 0.0]
+            end[axis] = self.AXIS_LENGTH
+            GL.glColor3fv(color)
+            GL.glVertex3fv([-value for value in end])
+            GL.glVertex3fv(end)
+        GL.glEnd()
+
+    def draw_trail(self, walker: Walker, trail: TrailBuffer, color: Types.vector3) -> None:
+        """
+        Draws a walker's trail from its vertex buffer as a single line strip.
+
+        Only the points added since the last frame are uploaded. When the trail
+        outgrows the vertex buffer, the buffer is reallocated at the trail's
+        capacity and filled again.
+
+        Args:
+            walker (Walker): The walker of the trail.
+            trail (TrailBuffer): The trail points.
+            color (Types.vector3): The color of the trail.
+        """
+        start, points = trail.take_dirty()
+        if walker not in self.__trail_buffers:
+            self.__trail_buffers[walker] = [GL.glGenBuffers(1), 0]
+        vertex_buffer = self.__trail_buffers[walker]
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, vertex_buffer[0])
+        if trail.get_capacity() > vertex_buffer[1]:
+            vertex_buffer[1] = trail.get_capacity()
+            GL.glBufferData(
+                GL.GL_ARRAY_BUFFER,
+                vertex_buffer[1] * self.__POINT_BYTES,
+                None,
+                GL.GL_DYNAMIC_DRAW,
+            )
+            start, points = 0, trail.get_points()
+        if len(points):
+            GL.glBufferSubData(
+                GL.GL_ARRAY_BUFFER, start * self.__POINT_BYTES, points.nbytes, points
+            )
+        count = start + len(points)
+        if count > 1:
+            GL.glColor3fv(color)
+            GL.glVertexPointer(3, GL.GL_FLOAT, 0, None)
+            GL.glDrawArrays(GL.GL_LINE_STRIP, 0, count)
+
+    def render_all(self) -> None:
+        """
+        Renders all the elements in the simulation.
+        """
+        self.consume()
+        for walker in self.__trails:
+            # render walker, where its newest published step left it
+            location = self.__locations.get(walker)
+            if location is None:
+                location = walker.get_location()
+            self.render_sphere(location, 0.5, self.__WALKER_COLOR)
+
+        # render trails, a line strip per walker
+        GL.glLineWidth(5)
+        GL.glEnableClientState(GL.GL_VERTEX_ARRAY)
+        for walker, trail in self.__trails.items():
+            self.draw_trail(walker, trail, self.__colors[walker])
+        GL.glDisableClientState(GL.GL_VERTEX_ARRAY)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
+
+        # render obstacles, only the chunks in view, each from its prebuilt list
+        if self.__obstacles_changed:
+            self.build_chunks()
+        view = np.asarray(self.__view_matrix, np.float64).reshape(4, 4).T
+        if self.__chunks is not None and view.tobytes() != self.__visible_view:
+            self.__visible_chunks = self.__chunks.visible(view)
+            self.__visible_view = view.tobytes()
+        for chunk, detail in self.__visible_chunks:
+            GL.glCallList(self.get_chunk_list(chunk, detail))
 
         # drawing the axis
-        self.draw_line((-self.INF, 0, 0), (self.INF, 0, 0), (1, 0, 0))
-        self.draw_line((0, -self.INF, 0), (0, self.INF, 0), (0, 1, 0))
-        self.draw_line((0, 0, -self.INF), (0, 0, self.INF), (0, 0, 1))
+        self.draw_axes()
 
     def move(self, movement: Types.vector3) -> None:
         """
@@ -1,14 +1,30 @@
 import os
 from grid import Grid
+from scene_config import SceneConfig
+from obstacle_store import ObstacleStore
 from walker import Walker
+from math_functions import MathFunctions
+from batch_simulation import BatchSimulation
+from process_backend import ProcessBackend
+from null_screen import NullScreen
+from null_progress import NullProgress
 import numpy as np
-import json
-import graph
-from screen import Screen
 import time
 from threading import Event
-from customtkinter import DoubleVar  # type: ignore[import]
-from typing import List, Dict
+from simulation_barrier import SimulationBarrier
+from population_state import PopulationState
+from running_stats import RunningStats
+from random_streams import RandomStreams
+from log_store import LogStore
+from graph_pipeline import GraphPipeline
+from profiler import Profiler
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union, TYPE_CHECKING
+
+# the GUI modules are only imported for type checking, so headless runs don't load them
+if TYPE_CHECKING:
+    from screen import Screen
+    from customtkinter import DoubleVar  # type: ignore[import]
 
 
 class Simulation:
@@ -16,11 +32,16 @@ class Simulation:
     __LEAVE_DISTANCE = 10
     __EPSILON = 0.0001
     __LOGS_FOLDER = "logs/"
+    # the wait of the speed slider at full speed, the steps are not paced at all
+    __FULL_SPEED_WAIT = 0.0001
+    # the profile of a batch run, it covers all the walkers
+    __BATCH_PROFILE = "batch.profile.json"
+    BACKENDS = ["Batch", "Process"]
 
     def __init__(
         self,
         grid: Grid,
-        screen: Screen,
+        screen: Union["Screen", NullScreen],
         simulation_count: int = 10,
         max_steps: int = 10,
     ) -> None:
@@ -28,7 +49,7 @@ class Simulation:
 
         Args:
             grid (Grid): A Grid object.
-            screen (Screen): _description_
+            screen (Union[Screen, NullScreen]): The screen to draw on.
             simulation_count (int, optional): _description_. Defaults to 10.
             max_steps (int, optional): _description_. Defaults to 10.
         """
@@ -36,26 +57,43 @@ class Simulation:
         self.__screen = screen
         self.__simulation_count = simulation_count
         self.__max_steps = max_steps
-        self.__wait = 0.001
+        self.__wait = 0.0
+        self.__backend = self.BACKENDS[0]
+        self.__logs_folder = self.__LOGS_FOLDER
+        self.__seed: Optional[int] = None
+        self.__streaming_statistics = True
+        self.__log_store = LogStore()
+        self.__graph_pipeline = GraphPipeline()
+        # profiling is switched on for a run with WALKER_PROFILE=1
+        profile_variable = os.environ.get(Profiler.ENVIRONMENT_VARIABLE, "")
+        self.__profiling = profile_variable not in ["", "0"]
 
     def config(self, path: str) -> bool:
         """Configures the simulation from a config file.
 
         Args:
-            path (str): The path to the config file.
+            path (str): The path to the JSON config file, or to a binary scene file.
 
         Returns:
-            bool: Was the config succesfull.
+            bool: Was the config succesfull, if not the previous scene is kept.
         """
-        self.__grid.clear_obstacles()
-        success = (
-            self.__grid.add_teleporters(path)
-            and self.__grid.add_obstacles(path)
-            and self.__grid.add_speed_zones(path)
-        )
-        self.__screen.set_obstacles(self.__grid.get_obstacles())
-
-        return success
+        # the file is parsed and validated once, before the grid is changed
+        try:
+            if ObstacleStore.is_scene_file(path):
+                # a binary scene is mapped, without making obstacle objects
+                self.__grid.set_store(ObstacleStore.open(path))
+            else:
+                self.__grid.set_scene(SceneConfig.load(path))
+        except (OSError, ValueError):
+            return False
+        scene = self.__grid.get_scene()
+        obstacles = scene.get_obstacles()
+        if scene.is_store_only() and not isinstance(self.__screen, NullScreen):
+            # the screen draws obstacle objects, they are only made when it is shown
+            obstacles = SceneConfig(scene.get_store()).to_obstacles()
+        self.__screen.set_obstacles(obstacles)
+
+        return True
 
     def set_simulation_count(self, simulation_count: int) -> None:
         """Sets the simulation count.
@@ -89,6 +127,106 @@ class Simulation:
         """
         return self.__max_steps
 
+    def set_logs_folder(self, logs_folder: str) -> None:
+        """Sets the folder the logs are saved in.
+
+        Args:
+            logs_folder (str): The logs folder, ending with a slash.
+        """
+        self.__logs_folder = logs_folder
+
+    def get_logs_folder(self) -> str:
+        """Gets the folder the logs are saved in.
+
+        Returns:
+            str: The logs folder.
+        """
+        return self.__logs_folder
+
+    def set_seed(self, seed: Optional[int]) -> None:
+        """Sets the seed of the walkers' random streams, runs with the same seed give the same logs.
+
+        Args:
+            seed (Optional[int]): The seed, None for a different run every time.
+        """
+        self.__seed = seed
+
+    def get_seed(self) -> Optional[int]:
+        """Gets the seed of the walkers' random streams.
+
+        Returns:
+            Optional[int]: The seed, None if the runs are not seeded.
+        """
+        return self.__seed
+
+    def set_streaming_statistics(self, streaming_statistics: bool) -> None:
+        """Sets if the runs stream every repetition into statistics (std, confidence interval,
+        quantiles) saved with the logs, on by default.
+
+        Args:
+            streaming_statistics (bool): Stream the statistics.
+        """
+        self.__streaming_statistics = streaming_statistics
+
+    def has_streaming_statistics(self) -> bool:
+        """Gets if the runs stream every repetition into statistics.
+
+        Returns:
+            bool: Are the statistics streamed.
+        """
+        return self.__streaming_statistics
+
+    def set_log_format(self, log_format: str) -> None:
+        """Sets the format of the logs, JSON lists or typed npz columns.
+
+        Args:
+            log_format (str): One of LogStore.FORMATS, ignored otherwise.
+        """
+        if log_format in LogStore.FORMATS:
+            self.__log_store = LogStore(log_format)
+
+    def get_log_format(self) -> str:
+        """Gets the format of the logs.
+
+        Returns:
+            str: The format.
+        """
+        return self.__log_store.get_format()
+
+    def set_profiling(self, profiling: bool) -> None:
+        """Sets if the walker threads are profiled, each one writes a profile next to its log.
+        Defaults to the WALKER_PROFILE environment variable.
+
+        Args:
+            profiling (bool): Profile the walker threads.
+        """
+        self.__profiling = profiling
+
+    def is_profiling(self) -> bool:
+        """Gets if the walker threads are profiled.
+
+        Returns:
+            bool: Are the walker threads profiled.
+        """
+        return self.__profiling
+
+    def set_backend(self, backend: str) -> None:
+        """Sets the backend used for the non-visual runs.
+
+        Args:
+            backend (str): The backend, one of BACKENDS.
+        """
+        if backend in self.BACKENDS:
+            self.__backend = backend
+
+    def get_backend(self) -> str:
+        """Gets the backend used for the non-visual runs.
+
+        Returns:
+            str: The backend.
+        """
+        return self.__backend
+
     def _save_log_data(
         self,
         path: str,
@@ -99,6 +237,7 @@ class Simulation:
         center_mass_distance_list: List[float],
         average_time_to_leave_list: List[float],
         y_cross_count_list: List[float],
+        statistics: Optional[Dict[str, RunningStats]] = None,
     ) -> None:
         """Saves the data to
 
@@ -111,8 +250,10 @@ class Simulation:
             center_mass_distance_list (List[float]): The distance from the center mass data list.
             average_time_to_leave (float): The average time to leave.
             y_cross_count_list (List[float]): The cross count list data lis.
+            statistics (Optional[Dict[str, RunningStats]], optional): The streaming statistics of each
+                metric, saved under "statistics". Defaults to None.
         """
-        data = {
+        columns = {
             "distance": distance_list,
             "xdistance": x_distance_list,
             "ydistance": y_distance_list,
@@ -122,57 +263,25 @@ class Simulation:
             "y_cross_count_list": y_cross_count_list,
         }
         # making the logs folder if it dose not exist
-        if not os.path.isdir(self.__LOGS_FOLDER):
-            os.mkdir(self.__LOGS_FOLDER)
-
-        with open(path, "w") as f:
-            json.dump(data, f)
-
-    def wait_for_all(
-        self, simulation: int, run_event_dict: Dict[Walker, Event], walker: Walker
-    ) -> None:
-        """Waits for all walkers to finish the current simulation.
-
-        Args:
-            simulation (int): The current simulation index.
-            run_event_dict (Dict[Walker, Event]): The dict of the threads running.
-            walker (Walker): Current walker.
-        """
-        # syncing the threads, on even runs setting the events, on odd runs unsetting the events
-        if simulation % 2 == 0:
-            set_dict = {
-                walker: run_event_dict[walker].is_set()
-                for walker in run_event_dict.keys()
-            }
-            # setting the event
-            run_event_dict[walker].set()
-            # waiting for all other threads
-            while not all(set_dict.values()):
-                for walker, event in run_event_dict.items():
-                    if event.is_set():
-                        set_dict[walker] = True
-                time.sleep(0.01)
-        else:
-            set_dict = {
-                walker: run_event_dict[walker].is_set()
-                for walker in run_event_dict.keys()
-            }
-            # setting the event
-            run_event_dict[walker].clear()
-            # waiting for all other threads
-            while any(set_dict.values()):
-                for walker, event in run_event_dict.items():
-                    if not event.is_set():
-                        set_dict[walker] = False
-                time.sleep(0.01)
+        if not os.path.isdir(self.__logs_folder):
+            os.makedirs(self.__logs_folder)
+
+        self.__log_store.save(
+            path,
+            columns,
+            None
+            if statistics is None
+            else {key: value.to_dict() for key, value in statistics.items()},
+        )
 
     def simulate(
         self,
         walker: Walker,
         stop_event: Event,
-        run_event_dict: Dict[Walker, Event],
-        progress_var: DoubleVar,
-        walker_list: List[Walker],
+        barrier: SimulationBarrier,
+        population_state: PopulationState,
+        progress_var: Union["DoubleVar", NullProgress],
+        walker_list: Sequence[Walker],
         visual: bool = False,
         graph_output_path: str = "",
     ) -> None:
@@ -181,9 +290,10 @@ class Simulation:
         Args:
             walker (Walker): The walker to simulate.
             stop_event (Event): The stop event.
-            run_event_dict (Dict[Walker, Event]): The dict of the threads running.
-            progress_var (DoubleVar): The progress bar variable.
-            walker_list (List[Walker]): The list of all walkers.
+            barrier (SimulationBarrier): The barrier shared by all the walker threads.
+            population_state (PopulationState): The state shared by all the walker threads, finished by the barrier.
+            progress_var (Union[DoubleVar, NullProgress]): The progress bar variable.
+            walker_list (Sequence[Walker]): The list of all walkers, or their WalkerPopulation.
             visual (bool, optional): Add to the screen. Defaults to False.
             graph_output_path (str, optional): The output folder to save graphs. Defaults to "".
         """
@@ -192,95 +302,256 @@ class Simulation:
         x_distance_list = [0.0] * self.__max_steps
         y_distance_list = [0.0] * self.__max_steps
         z_distance_list = [0.0] * self.__max_steps
-        center_mass_distance_list = [0.0] * self.__max_steps
+        center_mass_distance_sum = np.zeros(self.__max_steps)
         average_time_to_leave_list = [0.0] * self.__simulation_count
         y_cross_count_list = [0.0] * self.__max_steps
+        statistics = {
+            key: RunningStats(self.__max_steps)
+            for key in BatchSimulation.STATISTICS_KEYS
+            if self.__streaming_statistics
+        }
+        # the values of the current repetition, streamed into the statistics when it ends
+        repetition_values = np.zeros((5, self.__max_steps))
+        # the same seed gives every thread the same tree of streams
+        random_streams = RandomStreams(self.__seed)
+        walker_index = walker_list.index(walker)
+        # checked once, without profiling the hooks are skipped entirely
+        profiler = Profiler() if self.__profiling else None
         # adds the walker to the screen
         self.__screen.add_walker(walker)
 
-        for simulation in range(self.__simulation_count):
-            if simulation >= self.__simulation_count:
-                break
-            # reseting the trail
-            self.__screen.reset_trail(walker)
-            walker.reset()
-            progress_var.set(float(simulation) / self.__simulation_count)
-            # reseting the variables
-            cross_count = 0
-            sign = 0
-            time_to_leave = -1
-
-            for step in range(self.__max_steps):
-                if stop_event.is_set() or step >= self.__max_steps:
+        # an error in a repetition must not leave the other walkers waiting at the barrier
+        try:
+            for simulation in range(self.__simulation_count):
+                if simulation >= self.__simulation_count:
                     break
-                if visual:
-                    time.sleep(self.__wait)
-
-                self.__grid.move(walker, walker.get_move(), walker_list)
-
-                location = walker.get_location()
-                distance = float(np.linalg.norm(location))  # type: ignore[no-untyped-call]
-                center_mass_distance = float(np.linalg.norm(np.subtract( # type: ignore[no-untyped-call]
-                    location, np.average([other_walker.get_location() # type: ignore[no-untyped-call]
-                                          for other_walker in walker_list], axis=0))))
-                if walker.is_3d():
-                    distance = float(np.linalg.norm(location[:2]))  # type: ignore[no-untyped-call]
-                # tracking  y axis crosses
-                if location[1] - self.__EPSILON > 0:
-                    if sign == -1:
-                        cross_count += 1
-                    sign = 1
-                if location[1] + self.__EPSILON < 0:
-                    if sign == 1:
-                        cross_count += 1
-                    sign = -1
-                y_cross_count_list[step] += cross_count / float(self.__simulation_count)
-                # tracking time to leave
-                if time_to_leave == -1 and distance > self.__LEAVE_DISTANCE:
-                    time_to_leave = step + 1
-                # tracking distances
-                distance_list[step] += distance / float(self.__simulation_count)
-                x_distance_list[step] += abs(location[0]) / float(
-                    self.__simulation_count
-                )
-                y_distance_list[step] += abs(location[1]) / float(
-                    self.__simulation_count
-                )
-                z_distance_list[step] += abs(location[2]) / float(
-                    self.__simulation_count
-                )
-                center_mass_distance_list[step] += abs(center_mass_distance) / float(
+                # reseting the trail
+                self.__screen.reset_trail(walker)
+                walker.set_rng(random_streams.generator(walker_index, simulation))
+                walker.reset()
+                progress_var.set(float(simulation) / self.__simulation_count)
+                if profiler is not None:
+                    profiler.count("repetitions")
+                # reseting the variables
+                cross_count = 0
+                sign = 0
+                time_to_leave = -1
+                step_count = 0
+
+                for step in range(self.__max_steps):
+                    if stop_event.is_set() or step >= self.__max_steps:
+                        break
+                    # the screen takes the steps without holding the walker, the wait
+                    # only paces a visual run when the speed slider is turned down
+                    if visual and self.__wait > self.__FULL_SPEED_WAIT:
+                        started = profiler.start() if profiler is not None else 0.0
+                        time.sleep(self.__wait)
+                        if profiler is not None:
+                            profiler.stop("sleep", started)
+
+                    started = profiler.start() if profiler is not None else 0.0
+                    move = walker.get_move()
+                    if profiler is not None:
+                        profiler.stop("move_generation", started)
+                    self.__grid.move(walker, move, walker_list, profiler=profiler)
+
+                    location = walker.get_location()
+                    started = profiler.start() if profiler is not None else 0.0
+                    population_state.record(walker, step, location)
+                    if profiler is not None:
+                        profiler.stop("center_of_mass", started)
+                    started = profiler.start() if profiler is not None else 0.0
+                    distance = MathFunctions.norm(location)
+                    if walker.is_3d():
+                        distance = MathFunctions.norm(location[:2])
+                    # tracking  y axis crosses
+                    if location[1] - self.__EPSILON > 0:
+                        if sign == -1:
+                            cross_count += 1
+                        sign = 1
+                    if location[1] + self.__EPSILON < 0:
+                        if sign == 1:
+                            cross_count += 1
+                        sign = -1
+                    y_cross_count_list[step] += cross_count / float(self.__simulation_count)
+                    # tracking time to leave
+                    if time_to_leave == -1 and distance > self.__LEAVE_DISTANCE:
+                        time_to_leave = step + 1
+                    # tracking distances
+                    distance_list[step] += distance / float(self.__simulation_count)
+                    x_distance_list[step] += abs(location[0]) / float(
+                        self.__simulation_count
+                    )
+                    y_distance_list[step] += abs(location[1]) / float(
+                        self.__simulation_count
+                    )
+                    z_distance_list[step] += abs(location[2]) / float(
+                        self.__simulation_count
+                    )
+                    repetition_values[:, step] = [
+                        distance,
+                        abs(location[0]),
+                        abs(location[1]),
+                        abs(location[2]),
+                        cross_count,
+                    ]
+                    step_count = step + 1
+                    if profiler is not None:
+                        profiler.stop("metrics", started)
+                        profiler.count("steps")
+
+                    started = profiler.start() if profiler is not None else 0.0
+                    self.__screen.add_to_trail(walker, walker.get_location())
+                    if profiler is not None:
+                        profiler.stop("trail", started)
+
+                started = profiler.start() if profiler is not None else 0.0
+                average_time_to_leave_list[simulation] = time_to_leave
+                if statistics:
+                    for key, values in zip(
+                        ["distance", "xdistance", "ydistance", "zdistance", "y_cross_count_list"],
+                        repetition_values,
+                    ):
+                        statistics[key].add(values[:step_count])
+                if profiler is not None:
+                    profiler.stop("metrics", started)
+
+                if stop_event.is_set():
+                    break
+
+                # waiting for all the other walkers, the last one computes the center of mass
+                started = profiler.start() if profiler is not None else 0.0
+                released = barrier.wait()
+                if profiler is not None:
+                    profiler.stop("barrier", started)
+                if not released:
+                    break
+                started = profiler.start() if profiler is not None else 0.0
+                center_mass_distances = population_state.center_mass_distances(walker)
+                center_mass_distance_sum += center_mass_distances / float(
                     self.__simulation_count
                 )
-
-                self.__screen.add_to_trail(walker, walker.get_location())
-
-            average_time_to_leave_list[simulation] = time_to_leave
-
-            if stop_event.is_set():
-                break
-
-            # waiting for all the other walkers
-            self.wait_for_all(simulation, run_event_dict, walker)
-
-        self.__screen.remove_walker(walker)
-
-        log_path = f"{self.__LOGS_FOLDER}{walker.get_name()}.json"
+                if statistics:
+                    statistics["cmdistance"].add(center_mass_distances)
+                if profiler is not None:
+                    profiler.stop("center_of_mass", started)
+        finally:
+            # letting the other walkers continue without this one
+            barrier.leave()
+            self.__screen.remove_walker(walker)
+
+        log_path = self.__log_store.path(self.__logs_folder, walker.get_name())
         # logging the data
+        started = profiler.start() if profiler is not None else 0.0
         self._save_log_data(
             log_path,
             distance_list,
             x_distance_list,
             y_distance_list,
             z_distance_list,
-            center_mass_distance_list,
+            center_mass_distance_sum.tolist(),
             average_time_to_leave_list,
             y_cross_count_list,
+            statistics or None,
         )
+        if profiler is not None:
+            profiler.stop("log", started)
 
-        # generating the graphs
+        # queuing the graphs, they are drawn in the graph processes
         if graph_output_path:
+            started = profiler.start() if profiler is not None else 0.0
             self.generate_graphs(log_path, graph_output_path, walker.is_3d())
+            if profiler is not None:
+                profiler.stop("graphs", started)
+
+        # the profile is saved next to the log
+        if profiler is not None:
+            profiler.write(f"{self.__logs_folder}{walker.get_name()}.profile.json")
+
+    def simulate_batch(
+        self,
+        walker_list: List[Walker],
+        stop_event: Event,
+        progress_var: Union["DoubleVar", NullProgress],
+        graph_output_folder: str = "",
+    ) -> None:
+        """Simulates all the walkers at once using the batch engine, in this thread
+        or split between processes depending on the backend. With profiling, a single
+        profile of the run is saved next to the logs.
+
+        Args:
+            walker_list (List[Walker]): The list of all walkers.
+            stop_event (Event): The stop event.
+            progress_var (Union[DoubleVar, NullProgress]): The progress bar variable.
+            graph_output_folder (str, optional): The output folder to save graphs. Defaults to "".
+        """
+        random_streams = RandomStreams(self.__seed)
+        profiler: Optional[Profiler] = None
+        if self.__backend == "Process":
+            process_backend = ProcessBackend(
+                streaming_statistics=self.__streaming_statistics,
+                profiling=self.__profiling,
+            )
+            log_data_list = process_backend.run(
+                self.__grid,
+                walker_list,
+                self.__simulation_count,
+                self.__max_steps,
+                stop_event,
+                progress_var.set,
+                random_streams,
+            )
+            statistics_list = process_backend.get_statistics()
+            # the phases of all the worker processes
+            profiler = process_backend.get_profiler()
+        else:
+            if self.__profiling:
+                profiler = Profiler()
+            batch_simulation = BatchSimulation(
+                self.__grid,
+                self.__simulation_count,
+                self.__max_steps,
+                random_streams,
+                streaming_statistics=self.__streaming_statistics,
+            )
+            log_data_list = batch_simulation.run(
+                walker_list, stop_event, progress_var.set, profiler
+            )
+            statistics_list = batch_simulation.get_statistics()
+
+        for walker_index, (walker, log_data) in enumerate(
+            zip(walker_list, log_data_list)
+        ):
+            log_path = self.__log_store.path(self.__logs_folder, walker.get_name())
+            # logging the data
+            started = profiler.start() if profiler is not None else 0.0
+            self._save_log_data(
+                log_path,
+                log_data["distance"],
+                log_data["xdistance"],
+                log_data["ydistance"],
+                log_data["zdistance"],
+                log_data["cmdistance"],
+                log_data["time_to_leave"],
+                log_data["y_cross_count_list"],
+                statistics_list[walker_index] if statistics_list else None,
+            )
+            if profiler is not None:
+                profiler.stop("log", started)
+
+            # queuing the graphs, the walkers are drawn in parallel in the graph processes
+            if graph_output_folder:
+                started = profiler.start() if profiler is not None else 0.0
+                self.generate_graphs(
+                    log_path,
+                    f"{graph_output_folder}/{walker.get_name()}",
+                    walker.is_3d(),
+                )
+                if profiler is not None:
+                    profiler.stop("graphs", started)
+
+        if profiler is not None:
+            profiler.write(f"{self.__logs_folder}{self.__BATCH_PROFILE}")
 
     def run_visual(self, event: Event) -> None:
         """Run the screen.
@@ -324,19 +595,56 @@ class Simulation:
         """
         return self.__screen.get_stop()
 
-    def generate_graphs(self, log_path: str, output_path: str, is_3d: bool) -> None:
-        """Generates and saves the graphs
+    def generate_graphs(
+        self, log_path: str, output_path: str, is_3d: bool
+    ) -> "Future[List[str]]":
+        """Queues the graphs of a log, they are saved by the graph processes
+        without holding the calling thread.
 
         Args:
             log_path (str): The data log path.
             output_path (str): The graph picture folder.
             is_3d (bool): is the data in 3d (should we generate a z distance graph).
+
+        Returns:
+            Future[List[str]]: The paths of the saved pictures, once they are saved.
+        """
+        return self.__graph_pipeline.submit(log_path, output_path, is_3d)
+
+    def set_graphs_callback(self, callback: Optional[Callable[[str], None]]) -> None:
+        """Sets the function called when the graphs of a walker are saved.
+
+        Args:
+            callback (Optional[Callable[[str], None]]): Called from a pool thread with the graph path prefix, None for no callback.
+        """
+        self.__graph_pipeline.set_callback(callback)
+
+    def get_pending_graphs(self) -> int:
+        """Gets the amount of walker logs whose graphs are not saved yet.
+
+        Returns:
+            int: The amount of queued and running graph renders.
+        """
+        return self.__graph_pipeline.get_pending()
+
+    def wait_for_graphs(self, timeout: Optional[float] = None) -> bool:
+        """Waits for the queued graphs.
+
+        Args:
+            timeout (Optional[float], optional): The most seconds to wait. Defaults to None, which waits for all of them.
+
+        Raises:
+            Exception: The error of the first graph render that failed.
+
+        Returns:
+            bool: True if all the graphs are saved.
+        """
+        return self.__graph_pipeline.wait(timeout)
+
+    def take_graph_failures(self) -> List[Tuple[str, BaseException]]:
+        """Takes the graph renders that failed since the last call.
+
+        Returns:
+            List[Tuple[str, BaseException]]: The graph path prefix and the error of every failed render.
         """
-        graph.distance_graph(log_path, output_path)
-        graph.distance_graph(log_path, output_path, "x")
-        graph.distance_graph(log_path, output_path, "y")
-        graph.distance_graph(log_path, output_path, "cm")
-        graph.cross_count_graph(log_path, output_path)
-        graph.time_to_leave_graph(log_path, output_path)
-        if is_3d:
-            graph.distance_graph(log_path, output_path, "z")
+        return self.__graph_pipeline.take_failures()
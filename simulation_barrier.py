@@ -0,0 +1,102 @@
+from threading import Condition, Event
+from typing import Callable, Optional
+
+
+class SimulationBarrier:
+
+    __STOP_POLL = 0.05
+
+    def __init__(
+        self,
+        parties: int,
+        stop_event: Optional[Event] = None,
+        action: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """Initializes a SimulationBarrier object.
+
+        A reusable barrier for the walker threads, released as soon as the last
+        walker arrives. Unlike threading.Barrier, walkers that finish early can
+        leave it, and setting the stop event releases everyone who is waiting.
+
+        Args:
+            parties (int): The amount of walkers that wait on the barrier.
+            stop_event (Optional[Event], optional): Releases the barrier for good when set. Defaults to None.
+            action (Optional[Callable[[], None]], optional): Called once by the last walker, before the others are released. Defaults to None.
+        """
+        self.__condition = Condition()
+        self.__parties = parties
+        self.__waiting = 0
+        self.__generation = 0
+        self.__stop_event = stop_event
+        self.__aborted = False
+        self.__action = action
+
+    def get_parties(self) -> int:
+        """Gets the amount of walkers that still take part in the barrier.
+
+        Returns:
+            int: The amount of walkers.
+        """
+        return self.__parties
+
+    def get_waiting(self) -> int:
+        """Gets the amount of walkers currently waiting.
+
+        Returns:
+            int: The amount of waiting walkers.
+        """
+        return self.__waiting
+
+    def is_aborted(self) -> bool:
+        """Returns if the barrier was aborted or stopped.
+
+        Returns:
+            bool: Is the barrier aborted.
+        """
+        return self.__aborted or (
+            self.__stop_event is not None and self.__stop_event.is_set()
+        )
+
+    def _release(self) -> None:
+        """Releases the current generation of waiting walkers, the condition must be held."""
+        if self.__action is not None:
+            self.__action()
+        self.__waiting = 0
+        self.__generation += 1
+        self.__condition.notify_all()
+
+    def wait(self) -> bool:
+        """Waits until all the walkers reach the barrier.
+
+        Returns:
+            bool: True if all the walkers arrived, False if the barrier was stopped.
+        """
+        with self.__condition:
+            if self.is_aborted():
+                return False
+            generation = self.__generation
+            self.__waiting += 1
+            if self.__waiting >= self.__parties:
+                self._release()
+                return True
+            # the last walker notifies right away, the timeout is only for noticing the stop event
+            while generation == self.__generation:
+                if self.is_aborted():
+                    self.__aborted = True
+                    self.__condition.notify_all()
+                    return False
+                self.__condition.wait(self.__STOP_POLL)
+            return True
+
+    def leave(self) -> None:
+        """Removes a walker that finished from the barrier, releasing the others if they were only waiting for it."""
+        with self.__condition:
+            self.__parties -= 1
+            if self.__waiting > 0 and self.__waiting >= self.__parties:
+                self._release()
+
+    def abort(self) -> None:
+        """Releases all the waiting walkers and makes every later wait return right away."""
+        with self.__condition:
+            self.__aborted = True
+            self.__condition.notify_all()
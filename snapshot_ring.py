@@ -0,0 +1,102 @@
+from custom_types import *
+from typing import List, Optional, Tuple
+
+# the trail generation of a snapshot and the walker's location
+Snapshot = Tuple[int, Types.vector3]
+
+
+class SnapshotRing:
+
+    def __init__(self, capacity: int = 4096) -> None:
+        """
+        Initializes a SnapshotRing object, the hand off of a walker's steps from its
+        simulation thread to the render thread.
+
+        The simulation thread publishes an immutable snapshot of every step into a
+        ring of slots, and the render thread consumes the snapshots published since
+        its last frame. Neither side waits for the other and no lock is taken: a
+        slot is written before the write counter includes it, and the consumer
+        drops the snapshots that were overwritten while it read them. A consumer
+        that falls more than the capacity behind skips to the newest snapshots.
+
+        Resetting the trail starts a new generation, every snapshot carries the
+        generation it was published in so the consumer knows when to clear.
+
+        Args:
+            capacity (int, optional): The amount of slots. Defaults to 4096.
+        """
+        self.__capacity = capacity
+        self.__slots: List[Optional[Snapshot]] = [None] * capacity
+        # written only by the producer
+        self.__written = 0
+        self.__generation = 0
+        # written only by the consumer
+        self.__read = 0
+
+    def get_capacity(self) -> int:
+        """
+        Returns the amount of slots.
+
+        Returns:
+            int: The capacity.
+        """
+        return self.__capacity
+
+    def get_generation(self) -> int:
+        """
+        Returns the generation of the trail.
+
+        Returns:
+            int: The amount of resets.
+        """
+        return self.__generation
+
+    def reset(self) -> None:
+        """
+        Starts a new trail, called by the producer.
+        """
+        self.__generation += 1
+
+    def publish(self, location: Types.vector3) -> None:
+        """
+        Publishes a step, called by the producer.
+
+        Args:
+            location (Types.vector3): The walker's location after the step.
+        """
+        written = self.__written
+        self.__slots[written % self.__capacity] = (self.__generation, location)
+        self.__written = written + 1
+
+    def latest(self) -> Optional[Snapshot]:
+        """
+        Returns the newest snapshot, without consuming anything.
+
+        Returns:
+            Optional[Snapshot]: The snapshot, None if nothing was published.
+        """
+        written = self.__written
+        if written == 0:
+            return None
+        return self.__slots[(written - 1) % self.__capacity]
+
+    def consume(self) -> List[Snapshot]:
+        """
+        Takes the snapshots published since the last call, called by the consumer.
+
+        Returns:
+            List[Snapshot]: The snapshots, oldest first.
+        """
+        written = self.__written
+        start = max(self.__read, written - self.__capacity)
+        snapshots = [
+            self.__slots[index % self.__capacity] for index in range(start, written)
+        ]
+        # the producer may have lapped the ring while the slots were read
+        overwritten = self.__written - self.__capacity - start
+        self.__read = written
+        return [
+            snapshot
+            for snapshot in snapshots[max(overwritten, 0) :]
+            if snapshot is not None
+        ]
@@ -0,0 +1,223 @@
+from custom_types import *
+import math
+from typing import Dict, Generic, Hashable, Iterator, List, Set, Tuple, TypeVar
+
+T = TypeVar("T", bound=Hashable)
+
+
+class SpatialHash(Generic[T]):
+
+    __MAX_CELLS_PER_ITEM = 64
+    __MAX_CELLS_PER_QUERY = 512
+
+    def __init__(self, cell_size: float = 4.0) -> None:
+        """
+        Initializes a uniform hash grid over spheres.
+
+        Every item is stored in all the cells its bounding box touches, so a query only
+        has to look at the cells around it. Items too big for the grid are kept in a
+        separate list that every query returns.
+
+        Args:
+            cell_size (float, optional): The side length of a cell. Defaults to 4.0.
+        """
+        self.__cell_size = cell_size
+        self.__cells: Dict[Tuple[int, int, int], List[T]] = {}
+        self.__item_cells: Dict[T, List[Tuple[int, int, int]]] = {}
+        self.__large_items: Set[T] = set()
+        # the insertion order, so the queries return the items in a stable order
+        self.__order: Dict[T, int] = {}
+        self.__counter = 0
+
+    def get_cell_size(self) -> float:
+        """
+        Returns the side length of a cell.
+
+        Returns:
+            float: The cell size.
+        """
+        return self.__cell_size
+
+    def __len__(self) -> int:
+        """
+        Returns the amount of items in the hash.
+
+        Returns:
+            int: The amount of items.
+        """
+        return len(self.__order)
+
+    def __contains__(self, item: T) -> bool:
+        """
+        Checks if an item is in the hash.
+
+        Args:
+            item (T): The item.
+
+        Returns:
+            bool: Is the item in the hash.
+        """
+        return item in self.__order
+
+    def _cell(self, point: Types.vector3) -> Tuple[int, int, int]:
+        """
+        Finds the cell containing a point.
+
+        Args:
+            point (Types.vector3): The point.
+
+        Returns:
+            Tuple[int, int, int]: The cell coordinates.
+        """
+        return (
+            math.floor(point[0] / self.__cell_size),
+            math.floor(point[1] / self.__cell_size),
+            math.floor(point[2] / self.__cell_size),
+        )
+
+    def _cells_in_box(
+        self, low: Types.vector3, high: Types.vector3
+    ) -> Iterator[Tuple[int, int, int]]:
+        """
+        Iterates over the cells touched by an axis aligned box.
+
+        Args:
+            low (Types.vector3): The minimum corner of the box.
+            high (Types.vector3): The maximum corner of the box.
+
+        Yields:
+            Tuple[int, int, int]: The cell coordinates.
+        """
+        low_cell = self._cell(low)
+        high_cell = self._cell(high)
+        for x in range(low_cell[0], high_cell[0] + 1):
+            for y in range(low_cell[1], high_cell[1] + 1):
+                for z in range(low_cell[2], high_cell[2] + 1):
+                    yield (x, y, z)
+
+    def _cell_count(self, low: Types.vector3, high: Types.vector3) -> int:
+        """
+        Counts the cells touched by an axis aligned box.
+
+        Args:
+            low (Types.vector3): The minimum corner of the box.
+            high (Types.vector3): The maximum corner of the box.
+
+        Returns:
+            int: The amount of cells.
+        """
+        low_cell = self._cell(low)
+        high_cell = self._cell(high)
+        return (
+            (high_cell[0] - low_cell[0] + 1)
+            * (high_cell[1] - low_cell[1] + 1)
+            * (high_cell[2] - low_cell[2] + 1)
+        )
+
+    def insert(self, item: T, center: Types.vector3, radius: float) -> None:
+        """
+        Inserts a sphere shaped item into the hash.
+
+        Args:
+            item (T): The item.
+            center (Types.vector3): The center of the sphere.
+            radius (float): The radius of the sphere.
+        """
+        if item in self.__order:
+            self.remove(item)
+        self.__order[item] = self.__counter
+        self.__counter += 1
+
+        low = (center[0] - radius, center[1] - radius, center[2] - radius)
+        high = (center[0] + radius, center[1] + radius, center[2] + radius)
+        if self._cell_count(low, high) > self.__MAX_CELLS_PER_ITEM:
+            self.__large_items.add(item)
+            return
+
+        cells = list(self._cells_in_box(low, high))
+        for cell in cells:
+            # the cell lists are replaced, never changed, a copy may share them
+            self.__cells[cell] = [*self.__cells.get(cell, []), item]
+        self.__item_cells[item] = cells
+
+    def remove(self, item: T) -> None:
+        """
+        Removes an item from the hash.
+
+        Args:
+            item (T): The item.
+        """
+        if item not in self.__order:
+            return
+        del self.__order[item]
+        self.__large_items.discard(item)
+        for cell in self.__item_cells.pop(item, []):
+            cell_items = [other for other in self.__cells[cell] if other != item]
+            if cell_items:
+                self.__cells[cell] = cell_items
+            else:
+                del self.__cells[cell]
+
+    def copy(self) -> "SpatialHash[T]":
+        """
+        Copies the hash, inserting into or removing from either one leaves the other as it is.
+
+        The cell lists are shared until a cell changes, so a copy only costs copying
+        the tables, not hashing the items again.
+
+        Returns:
+            SpatialHash[T]: The copy.
+        """
+        spatial_hash: SpatialHash[T] = SpatialHash(self.__cell_size)
+        spatial_hash.__cells = dict(self.__cells)
+        spatial_hash.__item_cells = dict(self.__item_cells)
+        spatial_hash.__large_items = set(self.__large_items)
+        spatial_hash.__order = dict(self.__order)
+        spatial_hash.__counter = self.__counter
+        return spatial_hash
+
+    def clear(self) -> None:
+        """
+        Removes all the items from the hash.
+        """
+        self.__cells = {}
+        self.__item_cells = {}
+        self.__large_items = set()
+        self.__order = {}
+        self.__counter = 0
+
+    def query_box(self, low: Types.vector3, high: Types.vector3) -> List[T]:
+        """
+        Finds the items that might intersect an axis aligned box.
+
+        Args:
+            low (Types.vector3): The minimum corner of the box.
+            high (Types.vector3): The maximum corner of the box.
+
+        Returns:
+            List[T]: The candidate items, in insertion order.
+        """
+        if self._cell_count(low, high) > self.__MAX_CELLS_PER_QUERY:
+            # scanning the cells would be slower than checking everything
+            return list(self.__order)
+
+        found = set(self.__large_items)
+        for cell in self._cells_in_box(low, high):
+            found.update(self.__cells.get(cell, []))
+        return sorted(found, key=self.__order.__getitem__)
+
+    def query_segment(self, start: Types.vector3, end: Types.vector3) -> List[T]:
+        """
+        Finds the items that might intersect a segment.
+
+        Args:
+            start (Types.vector3): The start of the segment.
+            end (Types.vector3): The end of the segment.
+
+        Returns:
+            List[T]: The candidate items, in insertion order.
+        """
+        return self.query_box(
+            (min(start[0], end[0]), min(start[1], end[1]), min(start[2], end[2])),
+            (max(start[0], end[0]), max(start[1], end[1]), max(start[2], end[2])),
+        )
@@ -1,6 +1,7 @@
 import customtkinter as ctk  # type: ignore[import]
 from colors import Colors
 from spinbox import Spinbox
+from simulation import Simulation
 
 
 class StartFrame(ctk.CTkFrame):  # type: ignore[misc]
@@ -77,6 +78,12 @@ class StartFrame(ctk.CTkFrame):  # type: ignore[misc]
             text="Simulation count",
             command=self.update_simulation_count,
         )
+        self.backend_dropdown = ctk.CTkOptionMenu(
+            self.horizontal_frame,
+            self.widget_width,
+            values=Simulation.BACKENDS,
+            command=self.update_backend,
+        )
         self.max_steps_widget = Spinbox(
             self.horizontal_frame,
             width=self.widget_width,
@@ -92,6 +99,9 @@ class StartFrame(ctk.CTkFrame):  # type: ignore[misc]
         self.graph_output_folder_widget.pack(
             side="right", expand=True, padx=self.padding, pady=self.padding
         )
+        self.backend_dropdown.pack(
+            side="right", expand=True, padx=self.padding, pady=self.padding
+        )
         self.max_steps_widget.pack(
             side="right", expand=True, padx=self.padding, pady=self.padding
         )
@@ -158,6 +168,15 @@ class StartFrame(ctk.CTkFrame):  # type: ignore[misc]
         """
         return int(self.master.get_simulation_count())
 
+    def update_backend(self, value: str) -> None:
+        """
+        Updates the backend used for the non-visual runs.
+
+        Args:
+            value (str): The new backend.
+        """
+        self.master.update_backend(value)
+
     def update_max_steps(self, value: int) -> None:
         """
         Updates the max steps.
@@ -7,6 +7,7 @@ import datetime
 import math
 
 class StockWalker(Walker):
+    __slots__ = ["__current_stock_data"]
     
     __DAY_COUNT = 1461
     __LIST_LENGTH = 1000
@@ -14,7 +15,7 @@ class StockWalker(Walker):
     def __init__(self, name: str, mass: float=1) -> None:
         super().__init__(name, mass)
         self.__current_stock_data = self._choose_random_stock()
-        self.__step = 1
+        self._step = 1
         
         self._is_3d = False
         
@@ -34,18 +35,18 @@ class StockWalker(Walker):
         while len(self.__current_stock_data) < self.__LIST_LENGTH:
             print(len(self.__current_stock_data))
             self.__current_stock_data = self._choose_random_stock()
-        self.__step = 1
+        self._step = 1
         self._location = (0, self.__current_stock_data[0], 0)
         super().reset()
 
     def _generate_move_angle(self) -> Tuple[float, float]:
-        stock_change = self.__current_stock_data[self.__step] - self.__current_stock_data[self.__step - 1]
+        stock_change = self.__current_stock_data[self._step] - self.__current_stock_data[self._step - 1]
         return (math.copysign(math.pi / 2, stock_change), 0)
             
     def _generate_move_radius(self) -> float:
-        stock_change = abs(self.__current_stock_data[self.__step] - self.__current_stock_data[self.__step - 1])
-        self.__step += 1
+        stock_change = abs(self.__current_stock_data[self._step] - self.__current_stock_data[self._step - 1])
+        self._step += 1
         return stock_change
     
     def get_step(self) -> int:
-        return self.__step
\ No newline at end of file
+        return self._step
\ No newline at end of file
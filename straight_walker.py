@@ -1,13 +1,15 @@
 import re
-from walker import Walker
+from walker import Walker, MoveArrays
 from custom_types import *
+import numpy as np
 import math
-import random
-from typing import Tuple
+from typing import Tuple, List
 
 
 class StraightWalker(Walker):
 
+    __slots__: List[str] = []
+
     def __init__(self, name: str, is_3d: bool, mass: float = 1) -> None:
         """
         Initialize a StraightWalker object.
@@ -41,13 +43,36 @@ class StraightWalker(Walker):
         result = (0.0, 0.0)
         if self._is_3d:
             # choosing a random yaw and pitch
-            random_int = random.randint(0, 5)
+            random_int = int(self._rng.integers(0, 6))
             if random_int >= 4:
                 result = (0, (random_int - 4.5) * math.pi)
             else:
                 result = (random_int * math.pi / 2, 0.0)
         else:
             # choosing a random yaw
-            result = (random.randint(0, 3) * math.pi / 2, 0.0)
+            result = (int(self._rng.integers(0, 4)) * math.pi / 2, 0.0)
 
         return (result[0] % (2 * math.pi), result[1] % (2 * math.pi))
+
+    def _generate_moves(self, steps: int, batch: int) -> MoveArrays:
+        """
+        Generates a block of moves in a single draw.
+
+        Args:
+            steps (int): The amount of steps.
+            batch (int): The amount of moves in each step.
+
+        Returns:
+            MoveArrays: The (steps, batch) yaw, radius and pitch arrays.
+        """
+        pitch = np.zeros((steps, batch))
+        if self._is_3d:
+            # choosing a random yaw and pitch
+            random_int = self._rng.integers(0, 6, (steps, batch))
+            up_down = random_int >= 4
+            yaw = np.where(up_down, 0.0, random_int * math.pi / 2)
+            pitch = np.where(up_down, (random_int - 4.5) * math.pi, 0.0)
+        else:
+            # choosing a random yaw
+            yaw = self._rng.integers(0, 4, (steps, batch)) * math.pi / 2
+        return yaw % (2 * math.pi), np.ones((steps, batch)), pitch % (2 * math.pi)
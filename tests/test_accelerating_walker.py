@@ -1,5 +1,6 @@
 from accelerating_walker import AcceleratingWalker
 import math
+import numpy as np
 
 
 def test_accelerating_walker_init() -> None:
@@ -39,3 +40,15 @@ def test_accelerating_walker_reset() -> None:
     first_move_size = walker.get_move().angle_and_radius()[1]
     walker.reset()
     assert walker.get_move().angle_and_radius()[1] < first_move_size
+
+
+def test_accelerating_walker_get_moves() -> None:
+    walker = AcceleratingWalker("John", False, 1, "Quadratic")
+    bulk_walker = AcceleratingWalker("John", False, 1, "Quadratic")
+    radii = [walker.get_move().angle_and_radius()[1] for _ in range(10)]
+
+    _, radius, pitch = bulk_walker.get_moves(5, 2)
+    _, second_radius, _ = bulk_walker.get_moves(5, 2)
+    # the steps continue from one block to the next
+    assert np.allclose(np.concatenate([radius, second_radius])[:, 1], radii)
+    assert np.all(pitch == 0)
@@ -0,0 +1,168 @@
+import pytest
+import math
+import numpy as np
+from batch_simulation import BatchSimulation
+from random_streams import RandomStreams
+from grid import Grid
+from obstacle import Obstacle
+from teleporter import Teleporter
+from straight_walker import StraightWalker
+from random_walker import RandomWalker
+from resetable_walker import ResetableWalker
+from profiler import Profiler
+from threading import Event
+from typing import List
+
+from walker import Walker
+
+
+@pytest.fixture
+def grid() -> Grid:
+    return Grid()
+
+
+def test_run_log_keys(grid: Grid) -> None:
+    batch_simulation = BatchSimulation(grid, 20, 15)
+    walker_list: List[Walker] = [
+        StraightWalker("Josh", False),
+        RandomWalker("Josh2", True),
+        ResetableWalker("Josh3", False),
+    ]
+    log_data_list = batch_simulation.run(walker_list)
+
+    assert len(log_data_list) == 3
+    for log_data in log_data_list:
+        assert set(log_data.keys()) == {
+            "distance",
+            "xdistance",
+            "ydistance",
+            "zdistance",
+            "cmdistance",
+            "time_to_leave",
+            "y_cross_count_list",
+        }
+        assert len(log_data["distance"]) == 15
+        assert len(log_data["time_to_leave"]) == 20
+
+
+def test_run_straight_walker(grid: Grid) -> None:
+    batch_simulation = BatchSimulation(grid, 50, 20)
+    log_data = batch_simulation.run([StraightWalker("Josh", False)])[0]
+
+    # the first step of a straight walker is always 1 unit long
+    assert math.isclose(log_data["distance"][0], 1.0)
+    # a single walker is always at the center of mass
+    assert all(math.isclose(value, 0.0) for value in log_data["cmdistance"])
+    assert all(value <= 20 for value in log_data["time_to_leave"])
+
+
+def test_statistics(grid: Grid) -> None:
+    batch_simulation = BatchSimulation(grid, 30, 10)
+    log_data = batch_simulation.run([StraightWalker("Josh", False)])[0]
+    statistics = batch_simulation.get_statistics()[0]
+
+    assert set(statistics) == set(BatchSimulation.STATISTICS_KEYS)
+    for key, running_stats in statistics.items():
+        assert list(running_stats.get_count()) == [30] * 10
+        assert np.allclose(running_stats.get_mean(), log_data[key])
+    # a straight walker always moves 1 unit on its first step
+    assert np.isclose(statistics["distance"].get_std()[0], 0)
+
+
+def test_statistics_blocks(grid: Grid) -> None:
+    # the values are streamed a block of steps at a time, the last block is partial
+    batch_simulation = BatchSimulation(grid, 8, 150, RandomStreams(4))
+    log_data = batch_simulation.run([RandomWalker("Josh", False)])[0]
+    statistics = batch_simulation.get_statistics()[0]
+
+    for key, running_stats in statistics.items():
+        assert list(running_stats.get_count()) == [8] * 150
+        assert np.allclose(running_stats.get_mean(), log_data[key])
+
+
+def test_statistics_off(grid: Grid) -> None:
+    batch_simulation = BatchSimulation(grid, 5, 10, streaming_statistics=False)
+    log_data = batch_simulation.run([StraightWalker("Josh", False)])[0]
+
+    assert not batch_simulation.has_streaming_statistics()
+    assert batch_simulation.get_statistics() == []
+    assert math.isclose(log_data["distance"][0], 1.0)
+
+
+def test_profiler(grid: Grid) -> None:
+    grid.set_obstacles([Obstacle((0, 0, 0), 5)])
+    profiler = Profiler()
+    BatchSimulation(grid, 4, 10).run(
+        [RandomWalker("Josh", False), ResetableWalker("Josh2", False)], profiler=profiler
+    )
+
+    calls = profiler.get_calls()
+    assert calls["gravity"] == 10
+    # every step, and the statistics of the last partial block
+    assert calls["metrics"] == 10 + 1
+    # the move generation of the block draws, and of every walker at every step
+    assert calls["move_generation"] == 10 + 2 * 10
+    assert calls["collision"] == 2 * 10
+    # the walkers start inside the obstacle, every move hits it
+    assert profiler.get_counters() == {"steps": 2 * 4 * 10, "collisions": 2 * 4 * 10}
+
+
+def test_seeded_run(grid: Grid) -> None:
+    walker_list: List[Walker] = [RandomWalker("Josh", False), ResetableWalker("Josh2", True)]
+    first = BatchSimulation(grid, 10, 10, RandomStreams(5)).run(walker_list)
+    second = BatchSimulation(grid, 10, 10, RandomStreams(5)).run(walker_list)
+    assert first == second
+
+
+def test_run_obstacle(grid: Grid) -> None:
+    # the walkers start inside the obstacle, so every move is blocked
+    grid.set_obstacles([Obstacle((0, 0, 0), 5)])
+    batch_simulation = BatchSimulation(grid, 10, 10)
+    log_data = batch_simulation.run([StraightWalker("Josh", False)])[0]
+
+    assert all(value == 0 for value in log_data["distance"])
+    assert all(value == -1 for value in log_data["time_to_leave"])
+
+
+def test_run_teleporter(grid: Grid) -> None:
+    grid.set_obstacles([Teleporter((0, 0, 0), 5, (100, 0, 0))])
+    batch_simulation = BatchSimulation(grid, 10, 1)
+    log_data = batch_simulation.run([StraightWalker("Josh", False)])[0]
+
+    assert math.isclose(log_data["xdistance"][0], 100)
+    assert all(value == 1 for value in log_data["time_to_leave"])
+
+
+def test_run_stop_event(grid: Grid) -> None:
+    stop_event = Event()
+    stop_event.set()
+    progress_list: List[float] = []
+    batch_simulation = BatchSimulation(grid, 10, 10)
+    log_data = batch_simulation.run(
+        [StraightWalker("Josh", False)], stop_event, progress_list.append
+    )[0]
+
+    assert all(value == 0 for value in log_data["distance"])
+    assert progress_list[-1] == 1.0
+
+
+def test_gravity_matches_grid(grid: Grid) -> None:
+    walker_list: List[Walker] = [
+        StraightWalker("Josh", False, 1),
+        StraightWalker("Josh2", False, 2),
+        StraightWalker("Josh3", False, 0),
+    ]
+    locations = [(0.0, 0.0, 0.0), (3.0, 0.0, 0.0), (0.5, 0.5, 0.0)]
+    for walker, location in zip(walker_list, locations):
+        walker.move_to(location)
+    positions = np.array(locations)[:, np.newaxis, :]
+    masses = np.array([walker.get_mass() for walker in walker_list])
+
+    effect = grid.get_gravity_solver().compute(positions, masses)
+
+    for index, walker in enumerate(walker_list):
+        before = walker.get_location()
+        walker.move(grid.get_gravity_effect(walker, walker_list))
+        expected = np.subtract(walker.get_location(), before)
+        walker.move_to(before)
+        assert np.allclose(effect[index, 0], expected)
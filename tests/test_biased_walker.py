@@ -1,6 +1,8 @@
 import pytest
 from biased_walker import BiasedWalker
+from random_streams import RandomStreams
 import math
+import numpy as np
 
 
 @pytest.fixture
@@ -34,6 +36,21 @@ def test_biased_walker_not_in_dict() -> None:
     assert walker.bias in BiasedWalker.BIAS_DICT.keys()
 
 
+def test_biased_walker_seeded_bias() -> None:
+    biases = {
+        BiasedWalker(
+            "Test Walker", True, rng=RandomStreams(seed).setup_generator(0)
+        ).bias
+        for seed in range(10)
+    }
+    assert biases <= BiasedWalker.BIAS_DICT.keys()
+    assert len(biases) > 1
+    walker = BiasedWalker("Test Walker", True, rng=RandomStreams(3).setup_generator(0))
+    assert walker.bias == BiasedWalker(
+        "Test Walker", True, rng=RandomStreams(3).setup_generator(0)
+    ).bias
+
+
 def test_biased_walker_generate_move_radius(biased_walker: BiasedWalker) -> None:
     move_radius = biased_walker._generate_move_radius()
     assert isinstance(move_radius, float)
@@ -50,3 +67,16 @@ def test_biased_walker_generate_move_angle(biased_walker: BiasedWalker) -> None:
     yaw, pitch = walker2d._generate_move_angle()
     assert pitch == 0
     assert yaw >= 0 and yaw <= 2 * math.pi
+
+
+def test_get_moves() -> None:
+    walker = BiasedWalker("John", True, bias="Up", bias_scale=1)
+    yaw, radius, pitch = walker.get_moves(20, 5)
+    assert yaw.shape == (20, 5)
+    assert np.all(radius == 1)
+    assert walker.is_vectorizable()
+
+    origin_walker = BiasedWalker("John", False, bias="Origin")
+    yaw, radius, pitch = origin_walker.get_moves(3, 2)
+    assert yaw.shape == (3, 2)
+    assert not origin_walker.is_vectorizable()
@@ -1,6 +1,7 @@
 import pytest
 import json
-from graph import read_json, distance_graph, cross_count_graph
+from graph import read_json, read_columns, render_graphs, distance_graph, cross_count_graph
+from log_store import LogStore
 import os
 
 
@@ -27,6 +28,52 @@ def test_read_json(sample_data_path: str) -> None:
     os.remove(sample_data_path)
 
 
+def test_read_columns(sample_data_path: str) -> None:
+    npz_path = sample_data_path.replace(".json", ".npz")
+    LogStore("npz").save(npz_path, read_json(sample_data_path))
+
+    # both formats give the same columns, only the asked ones
+    for path in [sample_data_path, npz_path]:
+        columns = read_columns(path, ["xdistance"])
+        assert list(columns) == ["xdistance"]
+        assert columns["xdistance"].tolist() == [1, 2, 3, 4, 5]
+
+    os.remove(npz_path)
+    os.remove(sample_data_path)
+
+
+def test_distance_graph_npz(tmp_path: str) -> None:
+    data_path = tmp_path + "sample_data.npz"
+    LogStore("npz").save(data_path, {"distance": [1.0, 2.0, 3.0]})
+    output_path = tmp_path + "distance_graph"
+    distance_graph(data_path, output_path)
+    assert os.path.exists(f"{output_path}-distance.png")
+    os.remove(f"{output_path}-distance.png")
+    os.remove(data_path)
+
+
+def test_render_graphs(tmp_path: str) -> None:
+    data_path = tmp_path + "sample_data.npz"
+    LogStore("npz").save(
+        data_path,
+        {
+            "distance": [1.0, 2.0],
+            "xdistance": [1.0, 2.0],
+            "ydistance": [0.0, 0.0],
+            "cmdistance": [0.0, 0.0],
+            "y_cross_count_list": [0.0, 1.0],
+            "time_to_leave": [-1],
+        },
+    )
+    paths = render_graphs(data_path, tmp_path, False)
+    assert len(paths) == 6
+    assert f"{tmp_path}-cmdistance.png" in paths
+    for path in paths:
+        assert os.path.exists(path)
+        os.remove(path)
+    os.remove(data_path)
+
+
 def test_distance_graph(tmp_path: str, sample_data_path: str) -> None:
     # Test generating distance graph
     output_path = str(tmp_path + "distance_graph")
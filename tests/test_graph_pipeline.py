@@ -0,0 +1,64 @@
+import pytest
+from graph_pipeline import GraphPipeline
+from log_store import LogStore
+import os
+import time
+from typing import Dict, Iterator, List
+
+COLUMNS: Dict[str, List[float]] = {
+    "distance": [1.0, 2.0],
+    "xdistance": [1.0, 2.0],
+    "ydistance": [0.0, 0.0],
+    "zdistance": [0.0, 0.5],
+    "cmdistance": [0.0, 0.0],
+    "y_cross_count_list": [0.0, 1.0],
+    "time_to_leave": [-1.0],
+}
+
+
+@pytest.fixture
+def pipeline() -> Iterator[GraphPipeline]:
+    pipeline = GraphPipeline(2)
+    yield pipeline
+    pipeline.shutdown()
+
+
+def test_submit(pipeline: GraphPipeline, tmp_path: str) -> None:
+    saved: List[str] = []
+    pipeline.set_callback(saved.append)
+    futures = []
+    for name, is_3d in [("Josh", False), ("Tom", True)]:
+        log_path = os.path.join(tmp_path, f"{name}.npz")
+        LogStore("npz").save(log_path, COLUMNS)
+        futures.append(pipeline.submit(log_path, os.path.join(tmp_path, name), is_3d))
+
+    assert pipeline.wait(60)
+    assert pipeline.get_pending() == 0
+    assert sorted(saved) == [os.path.join(tmp_path, "Josh"), os.path.join(tmp_path, "Tom")]
+    assert len(futures[0].result()) == 6
+    assert len(futures[1].result()) == 7
+    for path in futures[1].result():
+        assert os.path.exists(path)
+
+
+def test_failed_render(pipeline: GraphPipeline, tmp_path: str) -> None:
+    saved: List[str] = []
+    pipeline.set_callback(saved.append)
+    pipeline.submit(os.path.join(tmp_path, "missing.json"), "missing", False)
+
+    with pytest.raises(OSError):
+        pipeline.wait(60)
+    assert saved == []
+
+
+def test_failure_is_kept(pipeline: GraphPipeline, tmp_path: str) -> None:
+    pipeline.submit(os.path.join(tmp_path, "missing.json"), "missing", False)
+    while pipeline.get_pending():
+        time.sleep(0.05)
+
+    # the failure is kept after the render is done, until it is taken
+    failures = pipeline.take_failures()
+    assert [path for path, _ in failures] == ["missing"]
+    assert isinstance(failures[0][1], OSError)
+    assert pipeline.take_failures() == []
+    assert pipeline.wait(60)
@@ -0,0 +1,73 @@
+import pytest
+import numpy as np
+from gravity import GravitySolver, BarnesHutGravity
+
+
+@pytest.fixture
+def positions() -> np.ndarray:
+    return np.random.default_rng(3).normal(scale=20, size=(300, 3))
+
+
+@pytest.fixture
+def masses() -> np.ndarray:
+    masses = np.random.default_rng(4).uniform(0, 5, 300)
+    masses[:10] = 0
+    return masses
+
+
+def test_effect_on() -> None:
+    solver = GravitySolver()
+    effect = solver.effect_on(
+        (0, 0, 0), np.array([[2.0, 0, 0], [0, 0.5, 0]]), np.array([1.0, 1.0]), 2
+    )
+    assert np.allclose(effect, [0.25, 0.5, 0])
+    assert np.allclose(solver.effect_on((0, 0, 0), np.zeros((0, 3)), np.zeros(0), 0), 0)
+
+
+def test_compute_massless(positions: np.ndarray, masses: np.ndarray) -> None:
+    effect = GravitySolver().compute(positions, masses)
+
+    assert effect.shape == positions.shape
+    assert np.all(effect[:10] == 0)
+    assert np.all(GravitySolver().compute(positions, np.zeros(300)) == 0)
+
+
+def test_compute_matches_effect_on(positions: np.ndarray, masses: np.ndarray) -> None:
+    solver = GravitySolver(2)
+    effect = solver.compute(positions, masses)
+
+    expected = solver.effect_on(
+        (positions[12, 0], positions[12, 1], positions[12, 2]),
+        positions[np.arange(300) != 12],
+        masses[np.arange(300) != 12],
+        float(masses.sum()),
+    )
+    assert np.allclose(effect[12], expected)
+    assert solver.get_gravity_constant() == 2
+
+
+def test_barnes_hut_exact(positions: np.ndarray, masses: np.ndarray) -> None:
+    # with a zero opening angle every node is opened
+    exact = GravitySolver().compute(positions, masses)
+    approximate = BarnesHutGravity(theta=0).compute(positions, masses)
+
+    assert np.allclose(exact, approximate)
+
+
+def test_barnes_hut_approximate(positions: np.ndarray, masses: np.ndarray) -> None:
+    solver = BarnesHutGravity(theta=0.5)
+    exact = GravitySolver().compute(positions, masses)
+    approximate = solver.compute(positions, masses)
+
+    error = np.linalg.norm(exact - approximate, axis=1)
+    assert np.all(error <= 0.05 * np.linalg.norm(exact, axis=1) + 1e-9)
+    assert solver.get_theta() == 0.5
+
+
+def test_barnes_hut_repetitions(positions: np.ndarray, masses: np.ndarray) -> None:
+    batch = np.stack([positions, positions * 2], axis=1)
+    exact = GravitySolver().compute(batch, masses)
+    approximate = BarnesHutGravity(theta=0).compute(batch, masses)
+
+    assert approximate.shape == batch.shape
+    assert np.allclose(exact, approximate)
@@ -5,6 +5,10 @@ from straight_walker import StraightWalker
 from move import Move
 from teleporter import Teleporter
 from speed_zone import SpeedZone
+from profiler import Profiler
+from scene_config import SceneConfig
+from obstacle_store import ObstacleStore
+import os
 import math
 from typing import List
 from walker import Walker
@@ -72,6 +76,102 @@ def test_move(grid: Grid) -> None:
     assert walker.get_location() == (100, 0, 0)
 
 
+def test_move_keeps_obstacles(grid: Grid) -> None:
+    walker = StraightWalker("Josh", False)
+    speed_zone = SpeedZone((1, 0, 0), 0.5, 2)
+    grid.set_obstacles([speed_zone])
+
+    # the speed zone is only applied once per move
+    grid.move(walker, Move(0, 1), [])
+
+    assert walker.get_location() == (2, 0, 0)
+    assert grid.get_obstacles() == [speed_zone]
+
+
+def test_move_speed_zone_gravity(grid: Grid) -> None:
+    walker = StraightWalker("Josh", False)
+    other = StraightWalker("Tom", False)
+    other.move_to((0, 10, 0))
+    grid.set_obstacles([SpeedZone((1, 0, 0), 0.5, 2)])
+    profiler = Profiler()
+
+    # the restarted move doesn't pull the walker a second time
+    grid.move(walker, Move(0, 1), [walker, other], profiler=profiler)
+
+    probe = StraightWalker("Probe", False)
+    probe.move_to((2, 0, 0))
+    pull = grid._gravity_vector(probe, [probe, other])
+    assert walker.get_location() == pytest.approx((2 + pull[0], pull[1], 0))
+    assert profiler.get_calls()["gravity"] == 1
+
+
+def test_move_profiler(grid: Grid) -> None:
+    walker = StraightWalker("Josh", False)
+    grid.set_obstacles([Obstacle((1, 0, 0), 0.5)])
+    profiler = Profiler()
+
+    grid.move(walker, Move(0, 1), [walker], profiler=profiler)
+
+    assert profiler.get_calls() == {"collision": 1, "gravity": 1}
+    assert profiler.get_counters() == {"collisions": 1}
+
+
+def test_spatial_hash(grid: Grid) -> None:
+    obstacle1 = Obstacle((1, 1, 1), 1)
+    obstacle2 = Obstacle((50, 50, 50), 1)
+    grid.set_obstacles([obstacle1, obstacle2])
+    assert grid.get_spatial_hash().query_segment((0, 0, 0), (1, 0, 0)) == [obstacle1]
+
+    # replacing the obstacles updates the hash
+    grid.set_obstacles([obstacle2])
+    assert obstacle1 not in grid.get_spatial_hash()
+
+    grid.clear_obstacles()
+    assert grid.add_obstacles("config.json") == True
+    assert len(grid.get_spatial_hash()) == len(grid.get_obstacles())
+
+
+def test_set_scene(grid: Grid) -> None:
+    grid.set_obstacles([Obstacle((1, 1, 1), 1)])
+    scene = SceneConfig.load("config.json")
+    grid.set_scene(scene)
+
+    # the scene's arrays are used as the store
+    assert grid.get_obstacle_store() is scene.get_store()
+    assert len(grid.get_obstacles()) == len(scene)
+    assert len(grid.get_spatial_hash()) == len(scene)
+
+
+def test_set_store(grid: Grid, tmp_path: str) -> None:
+    path = os.path.join(tmp_path, "scene.bin")
+    SceneConfig.load("config.json").get_store().save(path)
+    grid.set_store(ObstacleStore.open(path))
+    scene_grid = Grid()
+    scene_grid.set_scene(SceneConfig.load("config.json"))
+
+    # the store is used without obstacle objects, and moves the same way
+    assert grid.get_obstacles() == []
+    for angle in range(0, 360, 15):
+        walker = StraightWalker("Josh", False)
+        scene_walker = StraightWalker("Josh", False)
+        for _ in range(6):
+            grid.move(walker, Move(math.radians(angle), 1), [walker])
+            scene_grid.move(scene_walker, Move(math.radians(angle), 1), [scene_walker])
+        assert walker.get_location() == scene_walker.get_location()
+
+    # setting obstacles replaces the store
+    grid.set_obstacles([Obstacle((1, 0, 0), 0.5)])
+    assert len(grid.get_obstacle_store()) == 1
+
+
+def test_get_obstacle_store(grid: Grid) -> None:
+    assert len(grid.get_obstacle_store()) == 0
+    grid.set_obstacles([Obstacle((1, 1, 1), 1), Teleporter((5, 5, 5), 1, (0, 0, 0))])
+    store = grid.get_obstacle_store()
+    assert len(store) == 2
+    assert store.get_kinds().tolist() == [0, 1]
+
+
 def test_add_teleporters(grid: Grid) -> None:
     # Add teleporters from a valid file path
     assert grid.add_teleporters("config.json") == True
@@ -124,3 +224,22 @@ def test_get_obstacles(grid: Grid) -> None:
 
     # Check that the obstacles list is returned correctly
     assert obstacles == [obstacle1, obstacle2]
+
+
+def test_scene_is_replaced(grid: Grid, tmp_path: str) -> None:
+    grid.set_obstacles([Obstacle((1, 1, 1), 1)])
+    scene = grid.get_scene()
+
+    # adding obstacles builds a new scene, the one a move read is left as it was
+    assert grid.add_obstacles("config.json") == True
+    assert grid.get_scene() is not scene
+    assert len(scene.get_obstacles()) == len(scene.get_store()) == 1
+    assert len(grid.get_obstacle_store()) == len(grid.get_obstacles())
+
+    path = os.path.join(tmp_path, "scene.bin")
+    SceneConfig.load("config.json").get_store().save(path)
+    grid.set_store(ObstacleStore.open(path))
+    assert grid.get_scene().is_store_only()
+    grid.clear_obstacles()
+    assert not grid.get_scene().is_store_only()
+    assert len(grid.get_obstacle_store()) == 0
@@ -0,0 +1,74 @@
+from grid_scene import GridScene
+from obstacle import Obstacle
+from obstacle_store import ObstacleStore
+from scene_config import SceneConfig
+from teleporter import Teleporter
+from speed_zone import SpeedZone
+
+
+def test_scene() -> None:
+    obstacles = [Obstacle((1, 1, 1), 1), Teleporter((5, 5, 5), 1, (0, 0, 0))]
+    scene = GridScene(obstacles)
+    assert scene.get_obstacles() == obstacles
+    assert scene.get_store().get_kinds().tolist() == [0, 1]
+    assert scene.get_store_indices() == {obstacles[0]: 0, obstacles[1]: 1}
+    assert scene.get_spatial_hash().query_segment((0, 0, 0), (1, 0, 0)) == [obstacles[0]]
+    assert not scene.is_store_only()
+
+    # the scene keeps its own list
+    obstacles.append(Obstacle((9, 9, 9), 1))
+    assert len(scene.get_obstacles()) == 2
+
+
+def test_store_only() -> None:
+    store = SceneConfig.load("config.json").get_store()
+    scene = GridScene([], store)
+    assert scene.get_store() is store
+    assert scene.get_obstacles() == []
+    assert scene.is_store_only()
+    assert not GridScene([], ObstacleStore.from_obstacles([])).is_store_only()
+
+
+def test_extended() -> None:
+    obstacle = Obstacle((1, 1, 1), 1)
+    scene = GridScene([obstacle])
+    teleporter = Teleporter((5, 5, 5), 1, (0, 0, 0))
+    extended = scene.extended([teleporter])
+
+    assert extended.get_obstacles() == [obstacle, teleporter]
+    assert extended.get_store().get_kinds().tolist() == [0, 1]
+    assert extended.get_store_indices() == {obstacle: 0, teleporter: 1}
+    assert teleporter in extended.get_spatial_hash()
+    # the scene a move may still be reading is left as it was
+    assert teleporter not in scene.get_spatial_hash()
+    assert len(scene.get_store()) == 1
+
+
+def test_replaced() -> None:
+    obstacle = Obstacle((1, 1, 1), 1)
+    teleporter = Teleporter((5, 5, 5), 1, (0, 0, 0))
+    scene = GridScene([obstacle, teleporter])
+    speed_zone = SpeedZone((9, 9, 9), 2, 0.5)
+    replaced = scene.replaced([teleporter, speed_zone])
+
+    assert replaced.get_obstacles() == [teleporter, speed_zone]
+    store = replaced.get_store()
+    assert store.get_kinds().tolist() == [1, 2]
+    assert store.get_radii().tolist() == [1, 2]
+    assert store.get_speed_factors().tolist() == [1, 0.5]
+    assert replaced.get_store_indices() == {teleporter: 0, speed_zone: 1}
+    assert obstacle not in replaced.get_spatial_hash()
+    assert speed_zone in replaced.get_spatial_hash()
+    assert obstacle in scene.get_spatial_hash()
+    assert speed_zone not in scene.get_spatial_hash()
+
+
+def test_extended_store_only() -> None:
+    scene = GridScene([], SceneConfig.load("config.json").get_store())
+    obstacle = Obstacle((1, 1, 1), 1)
+
+    # the records of a store without obstacle objects are not kept
+    extended = scene.extended([obstacle])
+    assert extended.get_obstacles() == [obstacle]
+    assert len(extended.get_store()) == 1
+    assert not extended.is_store_only()
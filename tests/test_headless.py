@@ -0,0 +1,114 @@
+import pytest
+import json
+import os
+import subprocess
+import sys
+from headless import main, parse_walker
+from biased_walker import BiasedWalker
+from random_streams import RandomStreams
+from straight_walker import StraightWalker
+from typing import List
+
+
+def test_parse_walker() -> None:
+    walker = parse_walker("straight", 0)
+    assert isinstance(walker, StraightWalker)
+    assert walker.get_name() == "straight0"
+    assert not walker.is_3d()
+
+    walker = parse_walker("biased:name=Josh,3d=true,mass=2,bias=Up", 1)
+    assert isinstance(walker, BiasedWalker)
+    assert walker.get_name() == "Josh"
+    assert walker.is_3d()
+    assert walker.get_mass() == 2
+    assert walker.bias == "Up"
+
+    # a random bias is drawn from the walker's setup stream
+    random_streams = RandomStreams(5)
+    walker = parse_walker("biased", 2, random_streams)
+    assert isinstance(walker, BiasedWalker)
+    expected = BiasedWalker("b", False, rng=random_streams.setup_generator(2))
+    assert walker.bias == expected.bias
+
+    with pytest.raises(ValueError):
+        parse_walker("flying", 0)
+    with pytest.raises(ValueError):
+        parse_walker("straight:speed=2", 0)
+    with pytest.raises(ValueError):
+        parse_walker("straight:3d=maybe", 0)
+
+
+def test_main(tmp_path: str) -> None:
+    output = os.path.join(tmp_path, "output")
+    progress_list: List[float] = []
+    exit_code = main(
+        [
+            "-w",
+            "straight",
+            "-w",
+            "random:name=Josh",
+            "-n",
+            "5",
+            "-s",
+            "7",
+            "-o",
+            output,
+            "--no-graphs",
+        ],
+        progress_list.append,
+    )
+
+    assert exit_code == 0
+    assert progress_list[-1] == 1.0
+    assert not os.path.exists(os.path.join(output, "graphs"))
+    with open(os.path.join(output, "logs", "Josh.json")) as file:
+        log_data = json.load(file)
+    assert len(log_data["distance"]) == 7
+    assert len(log_data["time_to_leave"]) == 5
+
+
+def test_main_seed(tmp_path: str) -> None:
+    log_list = []
+    for run in ["first", "second"]:
+        output = os.path.join(tmp_path, run)
+        main(["-w", "random:name=Josh", "-o", output, "--seed", "3", "--no-graphs"])
+        with open(os.path.join(output, "logs", "Josh.json")) as file:
+            log_list.append(file.read())
+
+    assert log_list[0] == log_list[1]
+
+
+def test_main_no_statistics(tmp_path: str) -> None:
+    output = os.path.join(tmp_path, "output")
+    main(["-w", "straight:name=Josh", "-o", output, "--no-graphs", "--no-statistics"])
+
+    with open(os.path.join(output, "logs", "Josh.json")) as file:
+        log_data = json.load(file)
+    assert "statistics" not in log_data
+    assert len(log_data["distance"]) == 10
+
+
+def test_main_bad_config(tmp_path: str) -> None:
+    exit_code = main(
+        ["-w", "straight", "-c", "bad config.json", "-o", str(tmp_path), "--no-graphs"]
+    )
+    assert exit_code == 1
+
+
+def test_main_invalid_arguments() -> None:
+    with pytest.raises(SystemExit):
+        main(["-w", "straight", "-n", "0"])
+    with pytest.raises(SystemExit):
+        main(["-w", "straight:name=a", "-w", "random:name=a"])
+
+
+def test_no_gui_imports() -> None:
+    code = (
+        "import sys, headless\n"
+        "gui = {'pygame', 'OpenGL', 'customtkinter', 'tkinter', 'matplotlib'}\n"
+        "print(sorted(gui & set(sys.modules)))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,54 @@
+import pytest
+from log_store import LogStore
+import numpy as np
+import json
+import os
+
+COLUMNS = {
+    "distance": [1.0, 2.0, 3.0],
+    "time_to_leave": [2.0, -1.0],
+}
+STATISTICS = {"distance": {"mean": [1.0, 2.0, 3.0], "std": [0.0, 0.5, 1.0]}}
+
+
+@pytest.mark.parametrize("log_format", LogStore.FORMATS)
+def test_save_and_load(log_format: str, tmp_path: str) -> None:
+    log_store = LogStore(log_format)
+    path = log_store.path(f"{tmp_path}/", "Josh")
+    assert path.endswith(f"Josh.{log_format}")
+    log_store.save(path, COLUMNS, STATISTICS)
+
+    columns = LogStore.load(path)
+    assert sorted(columns) == ["distance", "time_to_leave"]
+    assert columns["distance"].tolist() == COLUMNS["distance"]
+    assert columns["time_to_leave"].tolist() == COLUMNS["time_to_leave"]
+    assert list(LogStore.load(path, ["distance"])) == ["distance"]
+    with pytest.raises(KeyError):
+        LogStore.load(path, ["xdistance"])
+
+    statistics = LogStore.load_statistics(path)
+    assert statistics["distance"]["std"].tolist() == STATISTICS["distance"]["std"]
+
+
+def test_npz_columns_are_typed(tmp_path: str) -> None:
+    path = os.path.join(tmp_path, "Josh.npz")
+    LogStore("npz").save(path, COLUMNS)
+
+    columns = LogStore.load(path)
+    assert columns["distance"].dtype == np.float64
+    assert columns["time_to_leave"].dtype == np.int64
+    assert LogStore.load_statistics(path) == {}
+
+
+def test_json_format(tmp_path: str) -> None:
+    path = os.path.join(tmp_path, "Josh.json")
+    LogStore("json").save(path, COLUMNS, STATISTICS)
+
+    # the JSON logs keep their layout
+    with open(path) as file:
+        assert json.load(file) == {**COLUMNS, "statistics": STATISTICS}
+
+
+def test_bad_format() -> None:
+    with pytest.raises(ValueError):
+        LogStore("csv")
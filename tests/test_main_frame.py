@@ -74,6 +74,13 @@ def test_update_max_steps(main_frame: MainFrame) -> None:
     assert main_frame.simulation.get_max_steps() == value
 
 
+def test_update_backend(main_frame: MainFrame) -> None:
+    # Test update_backend method
+    main_frame.update_backend("Process")
+
+    assert main_frame.get_backend() == "Process"
+
+
 def test_parse_config(main_frame: MainFrame) -> None:
     # Test parse_config method
 
@@ -2,6 +2,7 @@ from math_functions import MathFunctions
 import math
 from move import Move
 from custom_types import *
+import numpy as np
 
 
 def test_random_angle() -> None:
@@ -53,3 +54,38 @@ def test_dist() -> None:
     assert distance == math.sqrt(
         (vec2[0] - vec1[0]) ** 2 + (vec2[1] - vec1[1]) ** 2 + (vec2[2] - vec1[2]) ** 2
     )
+
+
+def test_norm() -> None:
+    assert MathFunctions.norm((3.0, 4.0, 12.0)) == 13.0
+    assert MathFunctions.norm((3.0, 4.0)) == 5.0
+
+
+def test_subtract_and_dot() -> None:
+    assert MathFunctions.subtract((4.0, 5.0, 6.0), (1.0, 2.0, 3.0)) == (3.0, 3.0, 3.0)
+    assert MathFunctions.dot((1.0, 2.0, 3.0), (4.0, 5.0, 6.0)) == 32.0
+
+
+def test_normalize_zero() -> None:
+    assert MathFunctions.normalize((0.0, 0.0, 0.0)) == (0.0, 0.0, 0.0)
+
+
+def test_array_functions_match_scalar() -> None:
+    vectors = np.random.default_rng(1).normal(size=(50, 3))
+    vectors[0] = 0
+    others = np.random.default_rng(2).normal(size=(50, 3))
+
+    norms = MathFunctions.norms(vectors)
+    dists = MathFunctions.dists(vectors, others)
+    normalized = MathFunctions.normalize_vectors(vectors)
+    angles_and_radii = MathFunctions.angles_and_radii_from_vectors(vectors)
+    for index, vector in enumerate(vectors):
+        vec = Types.cast_to_vector3(tuple(vector))
+        assert math.isclose(norms[index], MathFunctions.norm(vec))
+        assert math.isclose(
+            dists[index], MathFunctions.dist(vec, Types.cast_to_vector3(tuple(others[index])))
+        )
+        assert np.allclose(normalized[index], MathFunctions.normalize(vec))
+        assert np.allclose(
+            angles_and_radii[index], MathFunctions.angle_and_radius_from_vector(vec)
+        )
@@ -0,0 +1,68 @@
+import pytest
+from obstacle_chunks import ObstacleChunks
+import numpy as np
+from typing import Dict, Sequence
+
+PROJECTION = ObstacleChunks.perspective(45, 800 / 600, 0.1, 50000.0)
+# looking from (0, 0, 100) down at the origin
+VIEW = ObstacleChunks.look_at((0, 0, 100), (0, 0, 0), (0, 1, 0))
+
+
+def make_chunks(
+    centers: Sequence[Sequence[float]], radii: Sequence[float]
+) -> ObstacleChunks:
+    return ObstacleChunks(
+        np.array(centers, float), np.array(radii, float), PROJECTION, 600, chunk_size=32
+    )
+
+
+def visible_obstacles(chunks: ObstacleChunks) -> Dict[int, int]:
+    return {
+        int(index): detail
+        for chunk, detail in chunks.visible(VIEW)
+        for index in chunks.get_members(chunk)
+    }
+
+
+def test_look_at() -> None:
+    # the camera sits at the origin of the view space, looking down -z
+    assert np.allclose(VIEW @ [0, 0, 100, 1], [0, 0, 0, 1])
+    assert np.allclose(VIEW @ [0, 0, 0, 1], [0, 0, -100, 1])
+
+
+def test_chunks() -> None:
+    chunks = ObstacleChunks(
+        np.array([[0, 0, 0], [1, 0, 0], [500, 0, 0]], float),
+        np.array([1, 1, 1], float),
+        PROJECTION,
+        600,
+        chunk_size=32,
+    )
+    assert len(chunks) == 2
+    assert sorted(chunks.get_members(0).tolist() + chunks.get_members(1).tolist()) == [0, 1, 2]
+    assert len(make_chunks([], [])) == 0
+    assert make_chunks([], []).visible(VIEW) == []
+
+
+def test_frustum_culling() -> None:
+    chunks = make_chunks(
+        [[0, 0, 0], [0, 0, 200], [300, 0, 0], [0, 30, 0]], [5, 5, 5, 5]
+    )
+    visible = visible_obstacles(chunks)
+    # in front of the camera, behind it, and far out of the side of the view
+    assert 0 in visible
+    assert 1 not in visible
+    assert 2 not in visible
+    assert 3 in visible
+
+
+def test_level_of_detail() -> None:
+    chunks = make_chunks(
+        [[0, 0, 80], [0, 0, -500], [0, 0, -100000]], [10, 1, 1]
+    )
+    visible = visible_obstacles(chunks)
+    # close and big, far and a few pixels, too far to see
+    assert visible[0] == 0
+    assert visible[1] == ObstacleChunks.POINTS
+    assert 2 not in visible
+    assert chunks.get_reach() < 100000
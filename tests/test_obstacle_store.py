@@ -0,0 +1,209 @@
+import pytest
+import random
+import numpy as np
+from obstacle_store import ObstacleStore
+from obstacle import Obstacle
+from teleporter import Teleporter
+from speed_zone import SpeedZone
+from grid import Grid
+from custom_types import Types
+from typing import List
+import os
+import pickle
+
+
+@pytest.fixture
+def obstacles() -> List[Obstacle]:
+    return [
+        Obstacle((2, 0, 0), 0.5),
+        Teleporter((0, 5, 0), 1, (10, 0, 0)),
+        SpeedZone((0, -3, 0), 1, 2.5),
+    ]
+
+
+def test_from_obstacles(obstacles: List[Obstacle]) -> None:
+    store = ObstacleStore.from_obstacles(obstacles)
+
+    assert len(store) == 3
+    assert store.get_kinds().tolist() == [
+        ObstacleStore.OBSTACLE,
+        ObstacleStore.TELEPORTER,
+        ObstacleStore.SPEED_ZONE,
+    ]
+    assert store.get_centers()[1].tolist() == [0, 5, 0]
+    assert store.get_radii().tolist() == [0.5, 1, 1]
+    assert store.get_targets()[1].tolist() == [10, 0, 0]
+    assert store.get_speed_factors().tolist() == [1, 1, 2.5]
+
+
+def test_concatenate_and_take(obstacles: List[Obstacle]) -> None:
+    store = ObstacleStore.concatenate(
+        [
+            ObstacleStore.from_obstacles(obstacles[:1]),
+            ObstacleStore.from_obstacles(obstacles[1:]),
+        ]
+    )
+    full = ObstacleStore.from_obstacles(obstacles)
+    assert store.get_kinds().tolist() == full.get_kinds().tolist()
+    assert store.get_centers().tolist() == full.get_centers().tolist()
+
+    taken = store.take(np.array([2, 0]))
+    assert taken.get_kinds().tolist() == [
+        ObstacleStore.SPEED_ZONE,
+        ObstacleStore.OBSTACLE,
+    ]
+    assert taken.get_speed_factors().tolist() == [2.5, 1]
+
+
+def test_first_hit(obstacles: List[Obstacle]) -> None:
+    store = ObstacleStore.from_obstacles(obstacles)
+
+    assert store.first_hit((0, 0, 0), (3, 0, 0)) == 0
+    assert store.first_hit((0, 0, 0), (0, 4.5, 0)) == 1
+    assert store.first_hit((0, 0, 0), (0, 1, 0)) == ObstacleStore.NO_HIT
+    assert store.first_hit((0, 0, 0), (3, 0, 0), [1, 2]) == ObstacleStore.NO_HIT
+    assert ObstacleStore.from_obstacles([]).first_hit((0, 0, 0), (1, 0, 0)) == -1
+
+
+def test_first_hits_matches_detect_colision() -> None:
+    random.seed(5)
+    obstacles = [
+        Obstacle(
+            (random.uniform(-5, 5), random.uniform(-5, 5), random.uniform(-5, 5)),
+            random.uniform(0.2, 2),
+        )
+        for _ in range(30)
+    ]
+    store = ObstacleStore.from_obstacles(obstacles)
+    starts = np.random.default_rng(5).uniform(-6, 6, (200, 3))
+    ends = starts + np.random.default_rng(6).uniform(-2, 2, (200, 3))
+
+    hits = store.first_hits(starts, ends)
+
+    grid = Grid()
+    for row in range(len(starts)):
+        start = Types.cast_to_vector3(starts[row])
+        end = Types.cast_to_vector3(ends[row])
+        hit_obstacles = [
+            obstacle for obstacle in obstacles if obstacle.detect_colision(start, end)
+        ]
+        closest = grid.find_closest(hit_obstacles, start)
+        expected = obstacles.index(closest) if closest else ObstacleStore.NO_HIT
+        assert hits[row] == expected
+
+
+def test_first_hits_in_cells_matches_dense() -> None:
+    rng = np.random.default_rng(7)
+    radii = rng.uniform(0.2, 1.5, 2000)
+    # a few obstacles far bigger than the rest are paired with every segment
+    radii[:5] = 30
+    store = ObstacleStore(
+        rng.uniform(-100, 100, (2000, 3)),
+        radii,
+        np.zeros(2000, np.int8),
+        np.zeros((2000, 3)),
+        np.ones(2000),
+    )
+    starts = rng.uniform(-110, 110, (3000, 3))
+    ends = starts + rng.uniform(-2, 2, (3000, 3))
+    exclude = rng.random((3000, 2000)) < 0.1
+
+    # the repetitions spread over the whole scene only check the nearby cells
+    for segment_exclude in [None, exclude]:
+        hits = store.first_hits(starts, ends, segment_exclude)
+        dense_hits = store._first_hits_dense(starts, ends, segment_exclude)
+        assert np.array_equal(hits, dense_hits)
+        assert (hits != ObstacleStore.NO_HIT).any()
+
+    # long segments check every pair
+    long_ends = starts + 100
+    assert np.array_equal(
+        store.first_hits(starts, long_ends),
+        store._first_hits_dense(starts, long_ends, None),
+    )
+
+
+def test_first_hits_exclude(obstacles: List[Obstacle]) -> None:
+    store = ObstacleStore.from_obstacles(obstacles)
+    starts = np.zeros((2, 3))
+    ends = np.array([[3.0, 0, 0], [3.0, 0, 0]])
+    exclude = np.array([[False, False, False], [True, False, False]])
+
+    assert store.first_hits(starts, ends, exclude).tolist() == [0, ObstacleStore.NO_HIT]
+
+
+def test_save_and_open(obstacles: List[Obstacle], tmp_path: str) -> None:
+    path = os.path.join(tmp_path, "scene.bin")
+    ObstacleStore.from_obstacles(obstacles).save(path)
+    store = ObstacleStore.open(path)
+
+    assert ObstacleStore.is_scene_file(path) == True
+    assert ObstacleStore.is_scene_file("config.json") == False
+    assert store.get_source() == path
+    # the records are sorted along x, keeping the order of equal ones
+    assert store.is_sorted() == True
+    assert store.get_kinds().tolist() == [
+        ObstacleStore.TELEPORTER,
+        ObstacleStore.SPEED_ZONE,
+        ObstacleStore.OBSTACLE,
+    ]
+    assert store.get_centers().tolist() == [[0, 5, 0], [0, -3, 0], [2, 0, 0]]
+    assert store.get_targets()[0].tolist() == [10, 0, 0]
+    assert store.get_speed_factors().tolist() == [1, 2.5, 1]
+    assert store.first_hit((0, 0, 0), (3, 0, 0)) == 2
+
+    # a mapped store is pickled as its path
+    copy = pickle.loads(pickle.dumps(store))
+    assert copy.get_source() == path
+    assert copy.get_centers().tolist() == store.get_centers().tolist()
+    copy = pickle.loads(pickle.dumps(ObstacleStore.from_obstacles(obstacles)))
+    assert copy.get_source() is None
+    assert len(copy) == 3
+
+    ObstacleStore.from_obstacles([]).save(path)
+    assert len(ObstacleStore.open(path)) == 0
+
+
+def test_open_bad_file(obstacles: List[Obstacle], tmp_path: str) -> None:
+    with pytest.raises(ValueError):
+        ObstacleStore.open("config.json")
+
+    path = os.path.join(tmp_path, "scene.bin")
+    ObstacleStore.from_obstacles(obstacles).save(path)
+    with open(path, "ab") as file:
+        file.write(b"\0")
+    with pytest.raises(ValueError):
+        ObstacleStore.open(path)
+
+
+def test_query_segment(tmp_path: str) -> None:
+    rng = np.random.default_rng(3)
+    obstacles = [
+        Obstacle(Types.cast_to_vector3(center), radius)
+        for center, radius in zip(rng.uniform(-20, 20, (300, 3)), rng.uniform(0.2, 2, 300))
+    ]
+    store = ObstacleStore.from_obstacles(obstacles)
+    path = os.path.join(tmp_path, "scene.bin")
+    store.save(path)
+    sorted_store = ObstacleStore.open(path)
+
+    assert store.is_sorted() == False
+    for start, end in zip(rng.uniform(-20, 20, (50, 3)), rng.uniform(-20, 20, (50, 3))):
+        start_vector = Types.cast_to_vector3(start)
+        end_vector = Types.cast_to_vector3(end)
+        # every obstacle that can be hit is a candidate
+        hit = {
+            obstacles[index].get_location()
+            for index in range(len(obstacles))
+            if obstacles[index].detect_colision(start_vector, end_vector)
+        }
+        candidates = {
+            obstacles[index].get_location()
+            for index in store.query_segment(start_vector, end_vector)
+        }
+        sorted_candidates = {
+            Types.cast_to_vector3(sorted_store.get_centers()[index])
+            for index in sorted_store.query_segment(start_vector, end_vector)
+        }
+        assert hit <= candidates
+        assert candidates == sorted_candidates
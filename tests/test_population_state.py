@@ -0,0 +1,31 @@
+import pytest
+import numpy as np
+from population_state import PopulationState
+from straight_walker import StraightWalker
+from typing import List
+
+from walker import Walker
+
+
+@pytest.fixture
+def walker_list() -> List[Walker]:
+    return [StraightWalker("Josh", False, 1), StraightWalker("Josh2", False, 2)]
+
+
+def test_total_mass(walker_list: List[Walker]) -> None:
+    population_state = PopulationState(walker_list, 3)
+    assert population_state.get_total_mass() == 3
+
+
+def test_finish_repetition(walker_list: List[Walker]) -> None:
+    population_state = PopulationState(walker_list, 2)
+    population_state.record(walker_list[0], 0, (2, 0, 0))
+    population_state.record(walker_list[1], 0, (0, 0, 0))
+    population_state.record(walker_list[0], 1, (0, 4, 0))
+    population_state.record(walker_list[1], 1, (0, 0, 0))
+
+    population_state.finish_repetition()
+
+    assert np.allclose(population_state.get_center_mass(), [[1, 0, 0], [0, 2, 0]])
+    assert np.allclose(population_state.center_mass_distances(walker_list[0]), [1, 2])
+    assert np.allclose(population_state.center_mass_distances(walker_list[1]), [1, 2])
@@ -0,0 +1,125 @@
+import pytest
+import math
+import numpy as np
+import multiprocessing
+import process_backend as process_backend_module
+from process_backend import ProcessBackend
+from batch_simulation import BatchSimulation
+from random_streams import RandomStreams
+from repetition_sums import RepetitionSums
+from grid import Grid
+from straight_walker import StraightWalker
+from random_walker import RandomWalker
+from threading import Event
+from typing import List
+
+from walker import Walker
+
+
+@pytest.fixture
+def process_backend() -> ProcessBackend:
+    return ProcessBackend(2)
+
+
+def test_split(process_backend: ProcessBackend) -> None:
+    assert process_backend.split(3) == [1, 1, 1]
+    assert sum(process_backend.split(101)) == 101
+    assert len(process_backend.split(101)) <= process_backend.get_max_workers() * 4
+    assert process_backend.split(0) == []
+    # the slices are aligned blocks of repetitions
+    assert process_backend.split(24) == [4, 4, 4, 4, 4, 4]
+
+
+def test_merge() -> None:
+    values = np.random.default_rng(6).exponential(3, (10, 1, 6, 10))
+    sums_list = []
+    for start, stop in [(0, 3), (3, 4), (4, 10)]:
+        sums = RepetitionSums(start, stop - start, 10, (1, 6))
+        for step in range(10):
+            sums.add_step(step, values[step, ..., start:stop])
+        sums_list.append(sums)
+    time_to_leave_list = [np.array([[1, 2, -1]]), np.array([[3]]), np.array([[4] * 6])]
+    merged = ProcessBackend.merge(sums_list, time_to_leave_list, [3, 1, 6])
+
+    full = RepetitionSums(0, 10, 10, (1, 6))
+    for step in range(10):
+        full.add_step(step, values[step])
+    assert merged[0]["distance"] == (full.total()[:, 0, 0] / 10).tolist()
+    assert merged[0]["time_to_leave"] == [1.0, 2.0, -1.0, 3.0] + [4.0] * 6
+
+
+def test_run(process_backend: ProcessBackend) -> None:
+    walker_list: List[Walker] = [
+        StraightWalker("Josh", False, 0),
+        RandomWalker("Josh2", True, 0),
+    ]
+    progress_list: List[float] = []
+    log_data_list = process_backend.run(
+        Grid(), walker_list, 10, 5, Event(), progress_list.append
+    )
+
+    assert len(log_data_list) == 2
+    assert len(log_data_list[0]["distance"]) == 5
+    assert len(log_data_list[0]["time_to_leave"]) == 10
+    assert math.isclose(log_data_list[0]["distance"][0], 1.0)
+    assert math.isclose(progress_list[-1], 1.0)
+    # the statistics of all the slices are merged
+    statistics = process_backend.get_statistics()[0]["distance"]
+    assert list(statistics.get_count()) == [10] * 5
+    assert np.allclose(statistics.get_mean(), log_data_list[0]["distance"])
+
+
+def test_slice_progress() -> None:
+    slice_progress = multiprocessing.Array("d", 2, lock=False)
+    process_backend_module._init_worker(slice_progress)
+    try:
+        process_backend_module._run_slice(
+            Grid(),
+            [StraightWalker("Josh", False, 0)],
+            2,
+            5,
+            RandomStreams(1),
+            2,
+            False,
+            False,
+            1,
+        )
+    finally:
+        process_backend_module._init_worker(None)
+    # the slice reports its own progress, the others are left as they are
+    assert list(slice_progress) == [0.0, 1.0]
+
+
+def test_run_stopped(process_backend: ProcessBackend) -> None:
+    stop_event = Event()
+    stop_event.set()
+    log_data_list = process_backend.run(
+        Grid(), [StraightWalker("Josh", False)], 10, 5, stop_event
+    )
+
+    assert log_data_list[0]["distance"] == [0.0] * 5
+
+
+def test_run_matches_batch(process_backend: ProcessBackend) -> None:
+    walker_list: List[Walker] = [
+        RandomWalker("Josh", False, 0),
+        RandomWalker("Josh2", True, 0),
+    ]
+    log_data_list = process_backend.run(
+        Grid(), walker_list, 13, 20, random_streams=RandomStreams(11)
+    )
+    batch_simulation = BatchSimulation(Grid(), 13, 20, RandomStreams(11))
+    batch_log_data_list = batch_simulation.run(walker_list)
+
+    # every repetition draws the same moves and is summed in the same order,
+    # however the repetitions are split
+    assert log_data_list == batch_log_data_list
+    for statistics, batch_statistics in zip(
+        process_backend.get_statistics(), batch_simulation.get_statistics()
+    ):
+        assert np.array_equal(
+            statistics["distance"].get_sketch().get_counts(),
+            batch_statistics["distance"].get_sketch().get_counts(),
+        )
+        for key, running_stats in statistics.items():
+            assert running_stats.to_dict() == batch_statistics[key].to_dict()
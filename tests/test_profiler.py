@@ -0,0 +1,76 @@
+import pytest
+from profiler import Profiler
+from null_profiler import NullProfiler
+import json
+import os
+import time
+
+
+@pytest.fixture
+def profiler() -> Profiler:
+    return Profiler()
+
+
+def test_stop(profiler: Profiler) -> None:
+    started = profiler.start()
+    time.sleep(0.01)
+    profiler.stop("phase", started)
+    profiler.stop("phase", profiler.start())
+
+    assert profiler.get_calls() == {"phase": 2}
+    assert profiler.get_times()["phase"] >= 0.01
+
+
+def test_count(profiler: Profiler) -> None:
+    profiler.count("steps")
+    profiler.count("steps", 4)
+    assert profiler.get_counters() == {"steps": 5}
+
+
+def test_summary(profiler: Profiler) -> None:
+    profiler.stop("fast", profiler.start())
+    started = profiler.start()
+    time.sleep(0.01)
+    profiler.stop("slow", started)
+    profiler.count("steps")
+    summary = profiler.summary()
+
+    # the slowest phase is first
+    assert list(summary["phases"]) == ["slow", "fast"]
+    assert 0 < summary["phases"]["slow"]["share"] <= 1
+    assert summary["phases"]["fast"]["calls"] == 1
+    assert summary["counters"] == {"steps": 1}
+    assert summary["total_seconds"] >= summary["phases"]["slow"]["seconds"]
+
+
+def test_merge(profiler: Profiler) -> None:
+    profiler.stop("phase", profiler.start())
+    profiler.count("steps", 2)
+    other = Profiler()
+    other.stop("phase", other.start())
+    other.stop("other", other.start())
+    other.count("steps", 3)
+    profiler.merge(other)
+
+    assert profiler.get_calls() == {"phase": 2, "other": 1}
+    assert profiler.get_counters() == {"steps": 5}
+
+
+def test_write(profiler: Profiler) -> None:
+    profiler.stop("phase", profiler.start())
+    profiler.write("profile.json")
+    with open("profile.json") as file:
+        assert json.load(file)["phases"]["phase"]["calls"] == 1
+
+    os.remove("profile.json")
+
+
+def test_null_profiler() -> None:
+    profiler = NullProfiler()
+    profiler.stop("phase", profiler.start())
+    profiler.count("steps")
+    profiler.write("profile.json")
+
+    assert profiler.is_enabled() == False
+    assert profiler.summary() == {}
+    assert not os.path.exists("profile.json")
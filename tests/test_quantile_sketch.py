@@ -0,0 +1,70 @@
+import pytest
+import numpy as np
+from quantile_sketch import QuantileSketch
+
+
+def test_quantile_accuracy() -> None:
+    rng = np.random.default_rng(1)
+    values = rng.exponential(5, (2000, 3))
+    sketch = QuantileSketch(3, 0.02)
+    sketch.add(values)
+
+    for q in [0.05, 0.5, 0.95]:
+        expected = np.quantile(values, q, axis=0, method="lower")
+        assert np.allclose(sketch.quantile(q), expected, rtol=0.021)
+
+
+def test_add_step_matches_add() -> None:
+    values = np.arange(1, 31, dtype=float).reshape(10, 3)
+    sketch = QuantileSketch(3)
+    sketch.add(values)
+    step_sketch = QuantileSketch(3)
+    for step in range(3):
+        step_sketch.add_step(step, values[:, step])
+
+    assert np.array_equal(sketch.get_counts(), step_sketch.get_counts())
+
+
+def test_only_used_buckets_are_kept() -> None:
+    values = np.random.default_rng(3).exponential(5, (10, 1000))
+    sketch = QuantileSketch(1000)
+    sketch.add(values[:5])
+    sketch.add(values[5:])
+    keys, counts = sketch.get_entries()
+
+    # at most a bucket for every value, and not every bucket of every step
+    assert len(keys) <= values.size
+    assert np.all(np.diff(keys) > 0)
+    assert counts.sum() == values.size
+    assert np.array_equal(sketch.get_counts().sum(axis=1), [10] * 1000)
+
+
+def test_zero_and_empty_steps() -> None:
+    sketch = QuantileSketch(3)
+    sketch.add(np.array([0.0, -1.0]))
+
+    assert np.array_equal(sketch.quantile(0.5), [0, 0, 0])
+
+
+def test_merge() -> None:
+    values = np.linspace(0.5, 50, 200).reshape(100, 2)
+    sketch = QuantileSketch(2)
+    sketch.add(values[:40])
+    other = QuantileSketch(2)
+    other.add(values[40:])
+    sketch.merge(other)
+    full = QuantileSketch(2)
+    full.add(values)
+
+    assert np.array_equal(sketch.get_counts(), full.get_counts())
+    with pytest.raises(ValueError):
+        sketch.merge(QuantileSketch(3))
+
+
+def test_invalid_arguments() -> None:
+    with pytest.raises(ValueError):
+        QuantileSketch(3, 1.5)
+    with pytest.raises(ValueError):
+        QuantileSketch(3, min_value=10, max_value=1)
+    with pytest.raises(ValueError):
+        QuantileSketch(3).quantile(2)
@@ -1,5 +1,6 @@
 from random_angle_walker import RandomAngleWalker
 import math
+import numpy as np
 
 
 def test_init() -> None:
@@ -27,3 +28,11 @@ def test_generate_move_angle() -> None:
     yaw, pitch = walker2d._generate_move_angle()
     assert pitch == 0
     assert yaw >= 0 and yaw <= 2 * math.pi
+
+
+def test_get_moves() -> None:
+    walker = RandomAngleWalker("John", True)
+    yaw, radius, pitch = walker.get_moves(100, 3)
+    assert np.all(radius == 1)
+    assert np.all((pitch >= 0) & (pitch < 2 * math.pi))
+    assert len(np.unique(yaw)) == 300
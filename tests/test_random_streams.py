@@ -0,0 +1,48 @@
+import numpy as np
+from random_streams import RandomStreams
+from random_walker import RandomWalker
+
+
+def test_seeded_streams() -> None:
+    first = RandomStreams(7).generator(1, 2).random(5)
+    second = RandomStreams(7).generator(1, 2).random(5)
+    assert np.array_equal(first, second)
+    assert RandomStreams(7).get_entropy() == 7
+
+
+def test_independent_streams() -> None:
+    random_streams = RandomStreams(7)
+    draws = [
+        random_streams.generator(walker_index, repetition).random()
+        for walker_index in range(3)
+        for repetition in range(3)
+    ]
+    assert len(set(draws)) == 9
+
+
+def test_generators() -> None:
+    random_streams = RandomStreams(7)
+    generators = random_streams.generators(0, 3, 2)
+    assert len(generators) == 2
+    assert generators[1].random() == random_streams.generator(0, 4).random()
+
+
+def test_setup_generator() -> None:
+    random_streams = RandomStreams(7)
+    first = random_streams.setup_generator(1).random()
+    assert first == RandomStreams(7).setup_generator(1).random()
+    # apart from the other walkers and from the repetition streams
+    assert first != random_streams.setup_generator(0).random()
+    assert first != random_streams.generator(1, 0).random()
+
+
+def test_unseeded_streams() -> None:
+    assert RandomStreams().get_entropy() != RandomStreams().get_entropy()
+
+
+def test_walker_rng() -> None:
+    walker = RandomWalker("Josh", True)
+    walker.set_rng(RandomStreams(3).generator(0, 0))
+    moves = [walker.get_move().angle_and_radius() for _ in range(5)]
+    walker.set_rng(RandomStreams(3).generator(0, 0))
+    assert moves == [walker.get_move().angle_and_radius() for _ in range(5)]
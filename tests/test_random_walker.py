@@ -1,6 +1,7 @@
 import pytest
 from random_walker import RandomWalker
 import math
+import numpy as np
 
 
 @pytest.fixture
@@ -32,3 +33,24 @@ def test_generate_move_angle(random_walker: RandomWalker) -> None:
     yaw, pitch = walker2d._generate_move_angle()
     assert pitch == 0
     assert yaw >= 0 and yaw <= 2 * math.pi
+
+
+def test_get_moves(random_walker: RandomWalker) -> None:
+    yaw, radius, pitch = random_walker.get_moves(100, 3)
+    assert yaw.shape == (100, 3)
+    assert np.all((radius >= 0.5) & (radius < 1.5))
+    assert np.all((yaw >= 0) & (yaw < 2 * math.pi))
+    if not random_walker.is_3d():
+        assert np.all(pitch == 0)
+
+
+def test_get_move_draws_blocks(random_walker: RandomWalker) -> None:
+    random_walker.set_rng(np.random.default_rng(7))
+    moves = [random_walker.get_move().angle_and_radius() for _ in range(100)]
+
+    # get_move draws whole blocks, like the batch engine
+    other = RandomWalker("Josh", random_walker.is_3d())
+    other.set_rng(np.random.default_rng(7))
+    blocks = [other.get_moves(RandomWalker.MOVE_BLOCK) for _ in range(2)]
+    yaw, radius, pitch = (np.concatenate(arrays)[:100, 0] for arrays in zip(*blocks))
+    assert np.array_equal(moves, np.stack([yaw, radius, pitch], axis=1))
@@ -0,0 +1,45 @@
+import numpy as np
+from repetition_sums import RepetitionSums
+
+
+def test_decompose() -> None:
+    assert RepetitionSums.decompose(0, 12) == [(0, 8), (8, 4)]
+    assert RepetitionSums.decompose(3, 10) == [(3, 1), (4, 4), (8, 2)]
+    assert RepetitionSums.decompose(5, 5) == []
+
+
+def test_total() -> None:
+    values = np.random.default_rng(1).normal(5, 2, (4, 3, 11))
+    sums = RepetitionSums(0, 11, 4, (3,))
+    for step in range(4):
+        sums.add_step(step, values[step])
+
+    assert np.allclose(sums.total(), values.sum(axis=-1))
+
+
+def test_merge_is_bit_identical() -> None:
+    values = np.random.default_rng(2).exponential(3, (5, 2, 37))
+    full = RepetitionSums(0, 37, 5, (2,))
+    for step in range(5):
+        full.add_step(step, values[step])
+
+    # any split, merged in any order, gives the same bits
+    for bounds in [[0, 1, 2, 37], [0, 20, 37], [0, 5, 13, 30, 37]]:
+        slices = []
+        for start, stop in zip(bounds, bounds[1:]):
+            sums = RepetitionSums(start, stop - start, 5, (2,))
+            for step in range(5):
+                sums.add_step(step, values[step, :, start:stop])
+            slices.append(sums)
+        merged = slices.pop()
+        for sums in slices:
+            merged.merge(sums)
+        assert np.array_equal(merged.total(), full.total())
+
+
+def test_missing_repetitions() -> None:
+    sums = RepetitionSums(4, 2, 1, ())
+    sums.add_step(0, np.array([1.0, 2.0]))
+
+    assert sums.total().tolist() == [3.0]
+    assert RepetitionSums(0, 0, 2, ()).total().tolist() == [0.0, 0.0]
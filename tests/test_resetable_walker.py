@@ -1,5 +1,6 @@
 from resetable_walker import ResetableWalker
 import math
+import numpy as np
 
 
 def test_init() -> None:
@@ -27,3 +28,13 @@ def test_generate_move_angle() -> None:
     yaw, pitch = walker2d._generate_move_angle()
     assert pitch == 0
     assert yaw >= 0 and yaw <= 2 * math.pi
+
+
+def test_get_moves() -> None:
+    # the generic version builds the block from get_move
+    walker = ResetableWalker("John", False)
+    yaw, radius, pitch = walker.get_moves(4, 3)
+    assert yaw.shape == (4, 3)
+    assert np.all(radius == 1)
+    assert np.all(pitch == 0)
+    assert not walker.is_vectorizable()
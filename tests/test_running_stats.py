@@ -0,0 +1,112 @@
+import pytest
+import numpy as np
+from running_stats import RunningStats
+
+
+@pytest.fixture
+def values() -> np.ndarray:
+    return np.random.default_rng(2).normal(10, 2, (500, 4))
+
+
+def test_add(values: np.ndarray) -> None:
+    running_stats = RunningStats(4)
+    for repetition in values:
+        running_stats.add(repetition)
+
+    assert np.array_equal(running_stats.get_count(), [500] * 4)
+    assert np.allclose(running_stats.get_mean(), values.mean(axis=0))
+    assert np.allclose(running_stats.get_variance(), values.var(axis=0, ddof=1))
+
+
+def test_add_step(values: np.ndarray) -> None:
+    running_stats = RunningStats(4)
+    for step in range(4):
+        running_stats.add_step(step, values[:250, step])
+        running_stats.add_step(step, values[250:, step])
+
+    assert np.allclose(running_stats.get_mean(), values.mean(axis=0))
+    assert np.allclose(running_stats.get_std(), values.std(axis=0, ddof=1))
+
+
+def test_add_first_step(values: np.ndarray) -> None:
+    running_stats = RunningStats(4)
+    running_stats.add(values[:, :2])
+    running_stats.add(values[:, 2:], 2)
+    full = RunningStats(4)
+    full.add(values)
+
+    assert np.allclose(running_stats.get_mean(), full.get_mean())
+    assert np.allclose(running_stats.get_m2(), full.get_m2())
+    assert np.array_equal(running_stats.quantile(0.5), full.quantile(0.5))
+
+
+def test_stopped_repetition() -> None:
+    running_stats = RunningStats(3)
+    running_stats.add(np.array([1.0, 2.0, 3.0]))
+    running_stats.add(np.array([3.0]))
+
+    assert np.array_equal(running_stats.get_count(), [2, 1, 1])
+    assert np.allclose(running_stats.get_mean(), [2, 2, 3])
+    assert np.allclose(running_stats.get_variance(), [2, 0, 0])
+
+
+def test_merge(values: np.ndarray) -> None:
+    running_stats = RunningStats(4)
+    running_stats.add(values[:100])
+    other = RunningStats(4)
+    other.add(values[100:])
+    running_stats.merge(other)
+
+    assert np.allclose(running_stats.get_mean(), values.mean(axis=0))
+    assert np.allclose(running_stats.get_variance(), values.var(axis=0, ddof=1))
+    with pytest.raises(ValueError):
+        running_stats.merge(RunningStats(5))
+
+
+def test_confidence_interval(values: np.ndarray) -> None:
+    running_stats = RunningStats(4)
+    running_stats.add(values)
+    low, high = running_stats.confidence_interval(0.95)
+
+    half_width = 1.959964 * values.std(axis=0, ddof=1) / np.sqrt(500)
+    assert np.allclose(high - low, 2 * half_width)
+    assert np.allclose((low + high) / 2, values.mean(axis=0))
+
+
+def test_to_dict(values: np.ndarray) -> None:
+    running_stats = RunningStats(4)
+    running_stats.add(values)
+    summary = running_stats.to_dict()
+
+    assert set(summary) == {"count", "mean", "std", "ci_low", "ci_high", "p5", "p50", "p95"}
+    assert all(len(value) == 4 for value in summary.values())
+    assert np.allclose(summary["p50"], np.median(values, axis=0), rtol=0.05)
+
+
+def test_add_indexed_repetitions(values: np.ndarray) -> None:
+    full = RunningStats(4)
+    full.add(values[:, :3], 0, 0)
+    full.add(values[:, 3:], 3, 0)
+    assert np.allclose(full.get_mean(), values.mean(axis=0))
+    assert np.allclose(full.get_variance(), values.var(axis=0, ddof=1))
+
+    # the same repetitions split into other slices fold into the same bits
+    for sizes in [[128, 128, 244], [7, 300, 193]]:
+        merged = RunningStats(4)
+        first = 0
+        for size in sizes:
+            part = RunningStats(4)
+            part.add(values[first : first + size], 0, first)
+            merged.merge(part)
+            first += size
+        assert merged.to_dict() == full.to_dict()
+
+
+def test_add_after_indexed_repetitions(values: np.ndarray) -> None:
+    running_stats = RunningStats(4)
+    running_stats.add(values[:250], 0, 0)
+    running_stats.add(values[250:])
+    assert np.allclose(running_stats.get_mean(), values.mean(axis=0))
+
+    with pytest.raises(ValueError):
+        running_stats.add(values[:10], 0, 0)
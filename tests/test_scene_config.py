@@ -0,0 +1,97 @@
+import pytest
+from scene_config import SceneConfig
+from obstacle_store import ObstacleStore
+from obstacle import Obstacle
+from teleporter import Teleporter
+from speed_zone import SpeedZone
+import json
+from typing import Any, Dict
+
+
+@pytest.fixture
+def data() -> Dict[str, Any]:
+    return {
+        "obstacles": [{"location": [2, 0, 0], "radius": 0.5}],
+        "teleporters": [{"location": [0, 5, 0], "radius": 1, "target": [10, 0, 0]}],
+        "speed zones": [
+            {"location": [0, 0, 3], "radius": 2, "speed factor": 1.5},
+            {"location": [0, 0, 9], "radius": 1, "speed factor": 0.5},
+        ],
+    }
+
+
+def test_load() -> None:
+    scene = SceneConfig.load("config.json")
+    with open("config.json") as file:
+        data = json.load(file)
+
+    assert len(scene) == sum(len(data[section]) for section in SceneConfig.SECTIONS)
+
+
+def test_load_bad_config() -> None:
+    # every problem in the file is reported at once
+    with pytest.raises(ValueError) as error:
+        SceneConfig.load("bad config.json")
+    assert 'teleporters[0]: missing "location"' in str(error.value)
+    assert '"obstacles" must be a list' in str(error.value)
+
+    with pytest.raises(OSError):
+        SceneConfig.load("missing config.json")
+
+
+def test_from_dict(data: Dict[str, Any]) -> None:
+    store = SceneConfig.from_dict(data).get_store()
+
+    # the teleporters come first, then the obstacles and the speed zones
+    assert store.get_kinds().tolist() == [
+        ObstacleStore.TELEPORTER,
+        ObstacleStore.OBSTACLE,
+        ObstacleStore.SPEED_ZONE,
+        ObstacleStore.SPEED_ZONE,
+    ]
+    assert store.get_centers().tolist() == [[0, 5, 0], [2, 0, 0], [0, 0, 3], [0, 0, 9]]
+    assert store.get_radii().tolist() == [1, 0.5, 2, 1]
+    assert store.get_targets()[0].tolist() == [10, 0, 0]
+    assert store.get_speed_factors().tolist() == [1, 1, 1.5, 0.5]
+
+
+def test_from_dict_errors(data: Dict[str, Any]) -> None:
+    data["obstacles"].append({"location": [1, 2], "radius": 1})
+    data["teleporters"][0]["radius"] = -1
+    data["speed zones"][1]["location"] = [0, 0, float("inf")]
+    del data["speed zones"][0]["speed factor"]
+
+    with pytest.raises(ValueError) as error:
+        SceneConfig.from_dict(data)
+    message = str(error.value)
+    assert 'teleporters[0]: "radius" must be positive' in message
+    assert 'obstacles[1]: "location" must be 3 numbers' in message
+    assert 'speed zones[1]: "location" must be finite' in message
+    assert 'speed zones[0]: missing "speed factor"' in message
+
+    with pytest.raises(ValueError):
+        SceneConfig.from_dict([])
+
+
+def test_empty_sections() -> None:
+    scene = SceneConfig.from_dict({"obstacles": [], "teleporters": [], "speed zones": []})
+    assert len(scene) == 0
+    assert scene.get_store().get_centers().shape == (0, 3)
+
+
+def test_to_obstacles(data: Dict[str, Any]) -> None:
+    obstacles = SceneConfig.from_dict(data).to_obstacles()
+
+    assert [type(obstacle) for obstacle in obstacles] == [
+        Teleporter,
+        Obstacle,
+        SpeedZone,
+        SpeedZone,
+    ]
+    teleporter = obstacles[0]
+    assert isinstance(teleporter, Teleporter)
+    assert teleporter.get_location() == (0, 5, 0)
+    assert teleporter.get_target() == (10, 0, 0)
+    speed_zone = obstacles[3]
+    assert isinstance(speed_zone, SpeedZone)
+    assert speed_zone.get_speed_factor() == 0.5
@@ -0,0 +1,21 @@
+from scene_converter import convert, main
+from obstacle_store import ObstacleStore
+from scene_config import SceneConfig
+import os
+
+
+def test_convert(tmp_path: str) -> None:
+    path = os.path.join(tmp_path, "scene.bin")
+    count = convert("config.json", path)
+
+    assert count == len(SceneConfig.load("config.json"))
+    assert len(ObstacleStore.open(path)) == count
+
+
+def test_main(tmp_path: str) -> None:
+    path = os.path.join(tmp_path, "scene.bin")
+    assert main(["config.json", path]) == 0
+    assert ObstacleStore.is_scene_file(path) == True
+
+    assert main(["bad config.json", os.path.join(tmp_path, "bad.bin")]) == 1
+    assert not os.path.exists(os.path.join(tmp_path, "bad.bin"))
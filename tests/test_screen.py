@@ -34,8 +34,11 @@ def test_add_and_remove_walker(screen: Screen) -> None:
 def test_reset_trail(screen: Screen) -> None:
     walker = ResetableWalker("Josh", False)
     screen.add_walker(walker)
+    screen.add_to_trail(walker, (1, 2, 3))
+    screen.consume()
     screen.reset_trail(walker)
-    assert screen.get_trails()[walker] == []
+    screen.consume()
+    assert len(screen.get_trails()[walker]) == 0
 
 
 def test_add_to_trail(screen: Screen) -> None:
@@ -43,7 +46,25 @@ def test_add_to_trail(screen: Screen) -> None:
     screen.add_walker(walker)
     position = (1, 2, 3)
     screen.add_to_trail(walker, position)
-    assert screen.get_trails()[walker] == [position]
+    # the steps reach the trails when the render thread consumes them
+    screen.consume()
+    assert screen.get_trails()[walker].get_points().tolist() == [[1, 2, 3]]
+    screen.remove_walker(walker)
+    screen.consume()
+    assert walker not in screen.get_trails()
+
+
+def test_trail_budget(screen: Screen) -> None:
+    assert screen.get_trail_budget() == Screen.TRAIL_BUDGET
+    walker = StraightWalker("Josh", False)
+    screen.add_walker(walker)
+    screen.set_trail_budget(100)
+    for step in range(1000):
+        screen.add_to_trail(walker, (step, 0, 0))
+    screen.consume()
+    assert len(screen.get_trails()[walker]) <= 100
+    with pytest.raises(ValueError):
+        screen.set_trail_budget(1)
 
 
 def test_set_obstacles(screen: Screen) -> None:
@@ -73,6 +94,24 @@ def test_render_sphere(screen: Screen) -> None:
     screen.close()
 
 
+def test_sphere_list(screen: Screen) -> None:
+    screen.initialize()
+    # every detail level is tessellated once
+    assert screen.get_sphere_list(0) == screen.get_sphere_list(0)
+    assert screen.get_sphere_list(1) != screen.get_sphere_list(0)
+    screen.close()
+
+
+def test_render_culled(screen: Screen) -> None:
+    screen.set_obstacles([Obstacle((0, 0, 0), 1), Obstacle((-1000, 1000, -1000), 1)])
+    screen.initialize()
+    screen.render_all()
+    # changing the obstacles rebuilds the chunks on the next frame
+    screen.set_obstacles([])
+    screen.render_all()
+    screen.close()
+
+
 def test_render_all(screen: Screen) -> None:
     walker = StraightWalker("Josh", False)
     screen.add_walker(walker)
@@ -1,14 +1,28 @@
 import time
 import pytest
 from simulation import Simulation
+from simulation_barrier import SimulationBarrier
+from population_state import PopulationState
 from grid import Grid
 from screen import Screen
 from straight_walker import StraightWalker
+from random_walker import RandomWalker
+from obstacle import Obstacle
+from teleporter import Teleporter
+from speed_zone import SpeedZone
+from move import Move
 from threading import Event
 from customtkinter import DoubleVar  # type: ignore[import]
+from null_progress import NullProgress
+from null_screen import NullScreen
+from scene_config import SceneConfig
+from log_store import LogStore
 import os
+import json
+import numpy as np
+import shutil
 import threading
-from typing import List, Dict
+from typing import Any, List, Sequence
 
 from walker import Walker
 
@@ -30,11 +44,61 @@ def test_set_max_steps(simulation: Simulation) -> None:
     assert simulation.get_max_steps() == 5000
 
 
+def test_set_backend(simulation: Simulation) -> None:
+    simulation.set_backend("Process")
+    assert simulation.get_backend() == "Process"
+    simulation.set_backend("invalid")
+    assert simulation.get_backend() == "Process"
+
+
 def test_config(simulation: Simulation) -> None:
     assert simulation.config("config.json") == True
 
 
-def test_save_log_data(simulation: Simulation) -> None:
+def test_config_keeps_scene() -> None:
+    grid = Grid()
+    simulation = Simulation(grid, NullScreen())
+    simulation.config("config.json")
+    obstacles = grid.get_obstacles()
+
+    # a bad file leaves the previous scene untouched
+    assert simulation.config("bad config.json") == False
+    assert simulation.config("missing config.json") == False
+    assert grid.get_obstacles() is obstacles
+
+
+def test_config_scene_file(tmp_path: str) -> None:
+    path = os.path.join(tmp_path, "scene.bin")
+    SceneConfig.load("config.json").get_store().save(path)
+    grid = Grid()
+    simulation = Simulation(grid, NullScreen())
+
+    assert simulation.config(path) == True
+    assert grid.get_obstacle_store().get_source() == path
+    assert len(grid.get_obstacle_store()) == len(SceneConfig.load("config.json"))
+
+
+def test_config_scene_file_screen(tmp_path: str) -> None:
+    path = os.path.join(tmp_path, "scene.bin")
+    SceneConfig.load("config.json").get_store().save(path)
+    grid = Grid()
+    screen = Screen(800, 600)
+    simulation = Simulation(grid, screen)
+
+    # the screen gets obstacles made from the mapped store, the grid keeps none
+    assert simulation.config(path) == True
+    assert grid.get_obstacles() == []
+    store = grid.get_obstacle_store()
+    obstacles = screen.get_obstacles()
+    assert len(obstacles) == len(store)
+    assert [list(obstacle.get_location()) for obstacle in obstacles] == (
+        store.get_centers().tolist()
+    )
+    assert [obstacle.get_radius() for obstacle in obstacles] == store.get_radii().tolist()
+
+
+def test_save_log_data(simulation: Simulation, tmp_path: str) -> None:
+    log_path = os.path.join(tmp_path, "log.txt")
     distance_list = [1.0, 2.0, 3.0]
     x_distance_list = [0.5, 1.0, 1.5]
     y_distance_list = [0.2, 0.4, 0.6]
@@ -43,7 +107,7 @@ def test_save_log_data(simulation: Simulation) -> None:
     average_time_to_leave = [10.0, 3.0, 3.0]
     y_cross_count_list = [5.0, 10.0, 15.0]
     simulation._save_log_data(
-        "log.txt",
+        log_path,
         distance_list,
         x_distance_list,
         y_distance_list,
@@ -53,19 +117,28 @@ def test_save_log_data(simulation: Simulation) -> None:
         y_cross_count_list,
     )
 
-    assert os.path.exists("log.txt")
+    assert os.path.exists(log_path)
 
 
 def test_simulate(simulation: Simulation) -> None:
     walker = StraightWalker("Josh", False)
     stop_event = Event()
-    run_event_dict: Dict[Walker, Event] = {walker: Event()}
+    population_state = PopulationState([walker], simulation.get_max_steps())
+    barrier = SimulationBarrier(1, stop_event, population_state.finish_repetition)
     progress_var = DoubleVar()
     walker_list: List[Walker] = [walker]
     simulation.simulate(
-        walker, stop_event, run_event_dict, progress_var, walker_list, True, "test"
+        walker,
+        stop_event,
+        barrier,
+        population_state,
+        progress_var,
+        walker_list,
+        True,
+        "test",
     )
     simulation.close()
+    assert simulation.wait_for_graphs()
 
     assert os.path.exists("test-xdistance.png")
     assert os.path.exists("test-ydistance.png")
@@ -74,6 +147,226 @@ def test_simulate(simulation: Simulation) -> None:
     os.remove("test-ydistance.png")
 
 
+def test_simulate_batch(simulation: Simulation) -> None:
+    walker_list: List[Walker] = [StraightWalker("Josh", False), StraightWalker("Josh2", True)]
+    os.makedirs("test", exist_ok=True)
+    simulation.simulate_batch(walker_list, Event(), NullProgress(), "test")
+    # the graphs are saved by the graph processes after the run returns
+    assert simulation.wait_for_graphs()
+
+    assert os.path.exists("logs/Josh.json")
+    assert os.path.exists("test/Josh-xdistance.png")
+    assert os.path.exists("test/Josh2-zdistance.png")
+
+    shutil.rmtree("test")
+
+
+class AnchorWalker(RandomWalker):
+    """A walker that never steps, so a threaded run can leave it out and still
+    have the same pull on the other walkers as a batch run."""
+
+    def _generate_move_radius(self) -> float:
+        return 0.0
+
+    def is_vectorizable(self) -> bool:
+        return False
+
+
+def assert_batch_matches_simulate(
+    simulation: Simulation,
+    walker: Walker,
+    folder: str,
+    anchors: Sequence[Walker] = (),
+) -> None:
+    simulation.set_logs_folder(f"{folder}/batch/")
+    simulation.simulate_batch([walker, *anchors], Event(), NullProgress())
+
+    stop_event = Event()
+    population_state = PopulationState([walker], simulation.get_max_steps())
+    barrier = SimulationBarrier(1, stop_event, population_state.finish_repetition)
+    simulation.set_logs_folder(f"{folder}/threads/")
+    simulation.simulate(
+        walker,
+        stop_event,
+        barrier,
+        population_state,
+        NullProgress(),
+        [walker, *anchors],
+    )
+
+    # every repetition draws the same moves from its stream in both engines
+    batch_log = LogStore.load(f"{folder}/batch/{walker.get_name()}.json")
+    thread_log = LogStore.load(f"{folder}/threads/{walker.get_name()}.json")
+    assert np.array_equal(batch_log["time_to_leave"], thread_log["time_to_leave"])
+    for key in ["distance", "xdistance", "ydistance", "zdistance", "y_cross_count_list"]:
+        assert np.allclose(batch_log[key], thread_log[key])
+
+
+def test_seeded_batch_matches_simulate(tmp_path: str) -> None:
+    simulation = Simulation(Grid(), NullScreen(), 4, 150)
+    simulation.set_seed(9)
+    assert_batch_matches_simulate(simulation, RandomWalker("Josh", True), str(tmp_path))
+
+
+def test_seeded_batch_matches_simulate_obstacles(
+    tmp_path: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    grid = Grid()
+    grid.set_obstacles(
+        [
+            Obstacle((2.5, 0, 0), 1),
+            Teleporter((-2.5, 0, 0), 1, (0, 6, 0)),
+            SpeedZone((0, -2.5, 0), 1.5, 0.5),
+        ]
+    )
+    # the batch engine hands the moves into speed zones to the grid, without the other walkers
+    fallback_moves: List[Walker] = []
+    grid_move = grid.move
+
+    def spy_move(
+        walker: Walker, move: Move, walker_list: Sequence[Walker], *args: Any, **kwargs: Any
+    ) -> None:
+        if not walker_list:
+            fallback_moves.append(walker)
+        grid_move(walker, move, walker_list, *args, **kwargs)
+
+    monkeypatch.setattr(grid, "move", spy_move)
+    simulation = Simulation(grid, NullScreen(), 6, 120)
+    simulation.set_seed(4)
+    assert_batch_matches_simulate(simulation, RandomWalker("Josh", False), str(tmp_path))
+
+    assert fallback_moves
+
+
+def test_seeded_batch_matches_simulate_gravity_speed_zone(
+    tmp_path: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    grid = Grid()
+    grid.set_obstacles(
+        [SpeedZone((0, -2.5, 0), 1.5, 0.5), SpeedZone((2.5, 0, 0), 1, 2)]
+    )
+    fallback_moves: List[Walker] = []
+    grid_move = grid.move
+
+    def spy_move(
+        walker: Walker, move: Move, walker_list: Sequence[Walker], *args: Any, **kwargs: Any
+    ) -> None:
+        if not walker_list:
+            fallback_moves.append(walker)
+        grid_move(walker, move, walker_list, *args, **kwargs)
+
+    monkeypatch.setattr(grid, "move", spy_move)
+    simulation = Simulation(grid, NullScreen(), 6, 120)
+    simulation.set_seed(4)
+    # the walker is pulled towards the anchor at the origin, and hardly pulls it back
+    assert_batch_matches_simulate(
+        simulation,
+        RandomWalker("Josh", False, 1e-300),
+        str(tmp_path),
+        [AnchorWalker("anchor", False, 5)],
+    )
+
+    # the speed zones were hit with gravity on, which is applied once per step in both engines
+    assert fallback_moves
+
+
+def test_set_logs_folder(simulation: Simulation) -> None:
+    simulation.set_logs_folder("test/logs/")
+    assert simulation.get_logs_folder() == "test/logs/"
+    simulation.simulate_batch([StraightWalker("Josh", False)], Event(), NullProgress())
+
+    assert os.path.exists("test/logs/Josh.json")
+    with open("test/logs/Josh.json") as file:
+        statistics = json.load(file)["statistics"]
+    assert statistics["distance"]["mean"][0] == 1.0
+    assert statistics["distance"]["std"][0] == 0.0
+
+    shutil.rmtree("test")
+
+
+def test_set_log_format(simulation: Simulation) -> None:
+    assert simulation.get_log_format() == "json"
+    simulation.set_log_format("csv")
+    assert simulation.get_log_format() == "json"
+    simulation.set_log_format("npz")
+    assert simulation.get_log_format() == "npz"
+
+    simulation.set_logs_folder("test/logs/")
+    simulation.simulate_batch([StraightWalker("Josh", False)], Event(), NullProgress())
+    assert os.path.exists("test/logs/Josh.npz")
+    assert LogStore.load_statistics("test/logs/Josh.npz")["distance"]["mean"][0] == 1.0
+
+    shutil.rmtree("test")
+
+
+def test_profiling(simulation: Simulation) -> None:
+    simulation.set_logs_folder("test/logs/")
+    simulation.set_profiling(True)
+    assert simulation.is_profiling() == True
+    walker = StraightWalker("Josh", False)
+    stop_event = Event()
+    population_state = PopulationState([walker], simulation.get_max_steps())
+    barrier = SimulationBarrier(1, stop_event, population_state.finish_repetition)
+    simulation.simulate(
+        walker, stop_event, barrier, population_state, NullProgress(), [walker]
+    )
+
+    # the profile is saved next to the log
+    assert os.path.exists("test/logs/Josh.json")
+    with open("test/logs/Josh.profile.json") as file:
+        profile = json.load(file)
+    steps = simulation.get_simulation_count() * simulation.get_max_steps()
+    assert profile["counters"]["steps"] == steps
+    assert profile["phases"]["move_generation"]["calls"] == steps
+    assert profile["phases"]["collision"]["calls"] == steps
+    assert profile["phases"]["barrier"]["calls"] == simulation.get_simulation_count()
+    assert profile["phases"]["log"]["calls"] == 1
+
+    shutil.rmtree("test")
+
+
+@pytest.mark.parametrize("backend", Simulation.BACKENDS)
+def test_profiling_batch(tmp_path: str, backend: str) -> None:
+    simulation = Simulation(Grid(), NullScreen(), 4, 10)
+    simulation.set_logs_folder(f"{tmp_path}/logs/")
+    simulation.set_backend(backend)
+    simulation.set_profiling(True)
+    walker_list: List[Walker] = [StraightWalker("Josh", False), RandomWalker("Josh2", False)]
+    simulation.simulate_batch(walker_list, Event(), NullProgress())
+
+    # a single profile of the run is saved next to the logs
+    with open(f"{tmp_path}/logs/batch.profile.json") as file:
+        profile = json.load(file)
+    assert profile["counters"]["steps"] == 2 * 4 * 10
+    assert profile["phases"]["collision"]["calls"] >= 2 * 10
+    assert {"move_generation", "gravity", "metrics"} <= set(profile["phases"])
+    assert profile["phases"]["log"]["calls"] == 2
+
+
+class FailingWalker(StraightWalker):
+    def get_move(self):  # type: ignore[no-untyped-def]
+        raise RuntimeError("broken walker")
+
+
+def test_simulate_error_leaves_barrier() -> None:
+    simulation = Simulation(Grid(), NullScreen(), 3, 10)
+    walker_list: List[Walker] = [StraightWalker("Josh", False), FailingWalker("Tom", False)]
+    stop_event = Event()
+    population_state = PopulationState(walker_list, simulation.get_max_steps())
+    barrier = SimulationBarrier(2, stop_event, population_state.finish_repetition)
+    args = [stop_event, barrier, population_state, NullProgress(), walker_list]
+
+    with pytest.raises(RuntimeError):
+        simulation.simulate(walker_list[1], *args)  # type: ignore[arg-type]
+    # the other walker is not left waiting for the broken one
+    thread = threading.Thread(target=simulation.simulate, args=[walker_list[0], *args])
+    thread.start()
+    thread.join(10)
+    assert not thread.is_alive()
+
+    shutil.rmtree("logs")
+
+
 def test_update_speed(simulation: Simulation) -> None:
     value = 1.5
     simulation.update_speed(value)
@@ -86,20 +379,44 @@ def test_stop(simulation: Simulation) -> None:
     assert simulation.get_stop() == True
 
 
-def test_generate_graphs(simulation: Simulation) -> None:
-    simulation.generate_graphs("log.txt", "test", True)
+def test_generate_graphs(simulation: Simulation, tmp_path: str) -> None:
+    log_path = os.path.join(tmp_path, "log.txt")
+    simulation._save_log_data(
+        log_path,
+        [1.0, 2.0],
+        [0.5, 1.0],
+        [0.2, 0.4],
+        [0.1, 0.2],
+        [0.1, 0.2],
+        [10.0],
+        [5.0, 10.0],
+    )
+    output_path = os.path.join(tmp_path, "test")
+    paths = simulation.generate_graphs(log_path, output_path, True).result()
+    assert simulation.wait_for_graphs()
 
-    assert os.path.exists("test-xdistance.png")
-    assert os.path.exists("test-ydistance.png")
-    assert os.path.exists("test-zdistance.png")
-    assert os.path.exists("test-distance.png")
-    assert os.path.exists("test-cross-count.png")
-    assert os.path.exists("test-time-to-leave.png")
+    assert sorted(paths) == sorted(
+        f"{output_path}-{name}.png"
+        for name in [
+            "xdistance",
+            "ydistance",
+            "zdistance",
+            "distance",
+            "cmdistance",
+            "cross-count",
+            "time-to-leave",
+        ]
+    )
+    for path in paths:
+        assert os.path.exists(path)
 
-    os.remove("test-xdistance.png")
-    os.remove("test-ydistance.png")
-    os.remove("test-zdistance.png")
-    os.remove("test-cross-count.png")
-    os.remove("test-distance.png")
-    os.remove("test-time-to-leave.png")
-    os.remove("log.txt")
+
+def test_generate_graphs_failure(simulation: Simulation, tmp_path: str) -> None:
+    simulation.generate_graphs(os.path.join(tmp_path, "missing.txt"), "missing", True)
+
+    # a render that failed before the wait is still reported
+    while simulation.get_pending_graphs():
+        time.sleep(0.05)
+    with pytest.raises(OSError):
+        simulation.wait_for_graphs()
+    assert simulation.take_graph_failures() == []
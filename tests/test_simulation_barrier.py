@@ -0,0 +1,82 @@
+import pytest
+import threading
+import time
+from simulation_barrier import SimulationBarrier
+from threading import Event
+from typing import List
+
+
+def test_wait_single() -> None:
+    barrier = SimulationBarrier(1)
+    assert barrier.wait() == True
+    assert barrier.get_waiting() == 0
+
+
+def test_wait_keeps_threads_in_sync() -> None:
+    barrier = SimulationBarrier(3)
+    rounds: List[int] = []
+    lock = threading.Lock()
+
+    def run() -> None:
+        for simulation in range(5):
+            with lock:
+                rounds.append(simulation)
+            barrier.wait()
+
+    thread_list = [threading.Thread(target=run) for _ in range(3)]
+    for thread in thread_list:
+        thread.start()
+    for thread in thread_list:
+        thread.join(5)
+
+    # no thread starts a round before all threads finished the previous one
+    assert rounds == sorted(rounds)
+    assert len(rounds) == 15
+
+
+def test_action() -> None:
+    actions: List[int] = []
+    barrier = SimulationBarrier(2, action=lambda: actions.append(barrier.get_waiting()))
+    thread = threading.Thread(target=barrier.wait)
+    thread.start()
+    barrier.wait()
+    thread.join(5)
+
+    # the action runs once, when everyone arrived
+    assert actions == [2]
+
+
+def test_leave_releases_waiting() -> None:
+    barrier = SimulationBarrier(2)
+    result: List[bool] = []
+    thread = threading.Thread(target=lambda: result.append(barrier.wait()))
+    thread.start()
+    while barrier.get_waiting() == 0:
+        time.sleep(0.001)
+
+    barrier.leave()
+    thread.join(5)
+
+    assert result == [True]
+    assert barrier.get_parties() == 1
+
+
+def test_stop_event_releases_waiting() -> None:
+    stop_event = Event()
+    barrier = SimulationBarrier(2, stop_event)
+    result: List[bool] = []
+    thread = threading.Thread(target=lambda: result.append(barrier.wait()))
+    thread.start()
+
+    stop_event.set()
+    thread.join(5)
+
+    assert result == [False]
+    assert barrier.is_aborted()
+    assert barrier.wait() == False
+
+
+def test_abort() -> None:
+    barrier = SimulationBarrier(2)
+    barrier.abort()
+    assert barrier.wait() == False
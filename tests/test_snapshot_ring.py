@@ -0,0 +1,61 @@
+import pytest
+from snapshot_ring import SnapshotRing
+import threading
+
+
+@pytest.fixture
+def ring() -> SnapshotRing:
+    return SnapshotRing(8)
+
+
+def test_publish_and_consume(ring: SnapshotRing) -> None:
+    assert ring.latest() is None
+    assert ring.consume() == []
+    ring.publish((1, 0, 0))
+    ring.publish((2, 0, 0))
+
+    assert ring.latest() == (0, (2, 0, 0))
+    assert ring.consume() == [(0, (1, 0, 0)), (0, (2, 0, 0))]
+    # every snapshot is consumed once
+    assert ring.consume() == []
+
+
+def test_reset(ring: SnapshotRing) -> None:
+    ring.publish((1, 0, 0))
+    ring.reset()
+    ring.publish((2, 0, 0))
+
+    assert ring.get_generation() == 1
+    assert ring.consume() == [(0, (1, 0, 0)), (1, (2, 0, 0))]
+
+
+def test_overrun(ring: SnapshotRing) -> None:
+    for step in range(20):
+        ring.publish((step, 0, 0))
+
+    # a consumer that fell behind skips to the newest snapshots
+    snapshots = ring.consume()
+    assert len(snapshots) == ring.get_capacity()
+    assert [location[0] for _, location in snapshots] == list(range(12, 20))
+
+
+def test_concurrent_consume() -> None:
+    ring = SnapshotRing(64)
+    steps = 20000
+    consumed = []
+
+    def produce() -> None:
+        for step in range(steps):
+            ring.publish((step, 0, 0))
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    while producer.is_alive():
+        consumed += [location[0] for _, location in ring.consume()]
+    producer.join()
+    consumed += [location[0] for _, location in ring.consume()]
+
+    # the snapshots arrive in order, the newest one always does
+    assert consumed == sorted(consumed)
+    assert len(set(consumed)) == len(consumed)
+    assert consumed[-1] == steps - 1
@@ -0,0 +1,59 @@
+import pytest
+from spatial_hash import SpatialHash
+
+
+@pytest.fixture
+def spatial_hash() -> SpatialHash[int]:
+    spatial_hash: SpatialHash[int] = SpatialHash(1.0)
+    spatial_hash.insert(0, (0, 0, 0), 0.5)
+    spatial_hash.insert(1, (10, 0, 0), 0.5)
+    spatial_hash.insert(2, (0, 10, 0), 1)
+    return spatial_hash
+
+
+def test_insert(spatial_hash: SpatialHash[int]) -> None:
+    assert len(spatial_hash) == 3
+    assert 1 in spatial_hash
+    assert 3 not in spatial_hash
+    assert spatial_hash.get_cell_size() == 1.0
+
+
+def test_query_segment(spatial_hash: SpatialHash[int]) -> None:
+    assert spatial_hash.query_segment((-1, 0, 0), (1, 0, 0)) == [0]
+    assert spatial_hash.query_segment((9, 0, 0), (9.6, 0, 0)) == [1]
+    assert spatial_hash.query_segment((5, 5, 5), (5.5, 5, 5)) == []
+
+
+def test_query_box(spatial_hash: SpatialHash[int]) -> None:
+    assert spatial_hash.query_box((-1, -1, -1), (1, 11, 1)) == [0, 2]
+    # huge queries return everything
+    assert spatial_hash.query_box((-100, -100, -100), (100, 100, 100)) == [0, 1, 2]
+
+
+def test_large_items(spatial_hash: SpatialHash[int]) -> None:
+    spatial_hash.insert(3, (100, 100, 100), 50)
+    assert 3 in spatial_hash.query_segment((-1, 0, 0), (1, 0, 0))
+
+
+def test_remove_and_clear(spatial_hash: SpatialHash[int]) -> None:
+    spatial_hash.remove(0)
+    spatial_hash.remove(7)
+    assert spatial_hash.query_segment((-1, 0, 0), (1, 0, 0)) == []
+    assert len(spatial_hash) == 2
+
+    spatial_hash.clear()
+    assert len(spatial_hash) == 0
+    assert spatial_hash.query_segment((9, 0, 0), (11, 0, 0)) == []
+
+
+def test_copy(spatial_hash: SpatialHash[int]) -> None:
+    copy = spatial_hash.copy()
+    copy.insert(3, (0, 0, 0), 0.5)
+    copy.remove(2)
+
+    # changing the copy leaves the original as it is
+    assert copy.query_segment((-1, 0, 0), (1, 0, 0)) == [0, 3]
+    assert spatial_hash.query_segment((-1, 0, 0), (1, 0, 0)) == [0]
+    assert 2 in spatial_hash and 2 not in copy
+    spatial_hash.remove(0)
+    assert copy.query_segment((-1, 0, 0), (1, 0, 0)) == [0, 3]
@@ -1,6 +1,8 @@
 import pytest
 from straight_walker import StraightWalker
 import math
+import numpy as np
+from math_functions import MathFunctions
 
 
 @pytest.fixture
@@ -31,3 +33,15 @@ def test_generate_move_angle(straight_walker: StraightWalker) -> None:
     yaw, pitch = walker2d._generate_move_angle()
     assert pitch == 0.0
     assert yaw >= 0 and yaw <= 2 * math.pi
+
+
+def test_get_moves() -> None:
+    for is_3d in [False, True]:
+        walker = StraightWalker("Test Walker", is_3d)
+        yaw, radius, pitch = walker.get_moves(50, 4)
+        assert yaw.shape == radius.shape == pitch.shape == (50, 4)
+        assert np.all(radius == 1)
+        # every move is along one of the axes
+        vectors = MathFunctions.vectors_from_angles_and_radii(yaw, radius, pitch)
+        assert np.allclose(np.sort(np.abs(vectors), axis=-1), [0, 0, 1])
+        assert walker.is_vectorizable()
@@ -0,0 +1,109 @@
+import pytest
+from trail_buffer import TrailBuffer
+import numpy as np
+
+
+@pytest.fixture
+def trail() -> TrailBuffer:
+    trail = TrailBuffer()
+    trail.append((0, 0, 0))
+    trail.append((1, 2, 3))
+    return trail
+
+
+def test_append(trail: TrailBuffer) -> None:
+    assert len(trail) == 2
+    assert trail.get_points().dtype == np.float32
+    assert trail.get_points().tolist() == [[0, 0, 0], [1, 2, 3]]
+
+
+def test_grow(trail: TrailBuffer) -> None:
+    capacity = trail.get_capacity()
+    for step in range(capacity):
+        trail.append((step, 0, 0))
+
+    assert trail.get_capacity() == 2 * capacity
+    assert len(trail) == capacity + 2
+    assert trail.get_points()[1].tolist() == [1, 2, 3]
+    assert trail.get_points()[-1].tolist() == [capacity - 1, 0, 0]
+
+
+def test_take_dirty(trail: TrailBuffer) -> None:
+    start, points = trail.take_dirty()
+    assert start == 0
+    assert len(points) == 2
+    # only the new points are uploaded
+    trail.append((4, 5, 6))
+    start, points = trail.take_dirty()
+    assert start == 2
+    assert points.tolist() == [[4, 5, 6]]
+    start, points = trail.take_dirty()
+    assert (start, len(points)) == (3, 0)
+
+
+def test_clear(trail: TrailBuffer) -> None:
+    capacity = trail.get_capacity()
+    trail.take_dirty()
+    trail.clear()
+    assert len(trail) == 0
+    assert trail.get_capacity() == capacity
+    trail.append((7, 8, 9))
+    start, points = trail.take_dirty()
+    assert start == 0
+    assert points.tolist() == [[7, 8, 9]]
+
+
+def test_budget() -> None:
+    with pytest.raises(ValueError):
+        TrailBuffer(TrailBuffer.MIN_BUDGET - 1)
+    trail = TrailBuffer(100)
+    assert trail.get_budget() == 100
+    for step in range(10000):
+        trail.append((step, 0, 0))
+        assert len(trail) <= 100
+
+    points = trail.get_points()
+    # the first point stays, and the newest points are kept at full resolution
+    assert points[0].tolist() == [0, 0, 0]
+    assert points[-40:, 0].tolist() == list(range(9960, 10000))
+    # the trail stays in order, coarser with age
+    assert np.all(np.diff(points[:, 0]) > 0)
+    assert trail.get_capacity() <= 100
+
+
+def test_decimate_keeps_shape() -> None:
+    walk = np.cumsum(np.random.default_rng(0).normal(size=(50000, 3)), axis=0)
+    trail = TrailBuffer(2000)
+    for position in walk:
+        trail.append(position)
+
+    points = trail.get_points()
+    extent = np.max(walk.max(axis=0) - walk.min(axis=0))
+    assert np.max(np.abs(points.min(axis=0) - walk.min(axis=0))) < 0.02 * extent
+    assert np.max(np.abs(points.max(axis=0) - walk.max(axis=0))) < 0.02 * extent
+    # the history is covered evenly, the first half of the walk keeps its share
+    assert np.sum(np.isin(points[:, 0], walk[:25000, 0].astype(np.float32))) > 300
+
+
+def test_decimate_keeps_corners() -> None:
+    trail = TrailBuffer(32)
+    # a straight line with a single spike
+    for step in range(32):
+        trail.append((step, 10 if step == 7 else 0, 0))
+    trail.take_dirty()
+    trail.append((32, 0, 0))
+
+    assert [7, 10, 0] in trail.get_points().tolist()
+    # the decimation moved the points, the whole trail is uploaded again
+    start, points = trail.take_dirty()
+    assert start == 0
+    assert len(points) == len(trail)
+
+
+def test_set_budget(trail: TrailBuffer) -> None:
+    for step in range(200):
+        trail.append((step, 0, 0))
+    trail.set_budget(50)
+    assert len(trail) < 50
+    trail.set_budget(None)
+    assert trail.get_budget() is None
@@ -0,0 +1,74 @@
+import pytest
+import copy
+import pickle
+import numpy as np
+from walker_population import WalkerPopulation
+from accelerating_walker import AcceleratingWalker
+from straight_walker import StraightWalker
+from grid import Grid
+from move import Move
+from typing import List
+
+from walker import Walker
+
+
+@pytest.fixture
+def walker_list() -> List[Walker]:
+    walker = StraightWalker("Josh", False, 1)
+    walker.move_to((1, 2, 3))
+    return [walker, StraightWalker("Josh2", False, 2), AcceleratingWalker("Josh3", True, 0)]
+
+
+def test_bind(walker_list: List[Walker]) -> None:
+    walker_population = WalkerPopulation(walker_list)
+
+    assert len(walker_population) == 3
+    assert list(walker_population) == walker_list
+    assert walker_population[1] is walker_list[1]
+    assert walker_population.index_of(walker_list[2]) == 2
+    # the state the walkers had is kept
+    assert np.array_equal(walker_population.get_positions()[0], [1, 2, 3])
+    assert np.array_equal(walker_population.get_masses(), [1, 2, 0])
+    assert walker_population.get_total_mass() == 3
+
+
+def test_moves_write_in_place(walker_list: List[Walker]) -> None:
+    walker_population = WalkerPopulation(walker_list)
+    walker_list[1].move(Move(0, 2))
+    walker_list[0].translate((1, 1, 1))
+    walker_list[2].get_move()
+
+    assert np.allclose(walker_population.get_positions()[:2], [[2, 3, 4], [2, 0, 0]])
+    assert walker_list[1].get_location() == (2.0, 0.0, 0.0)
+    assert walker_population.get_steps()[2] == 1
+
+    walker_list[0].reset()
+    assert np.array_equal(walker_population.get_positions()[0], [0, 0, 0])
+
+
+def test_copies_are_unbound(walker_list: List[Walker]) -> None:
+    walker_population = WalkerPopulation(walker_list)
+    for walker_copy in [copy.deepcopy(walker_list[0]), pickle.loads(pickle.dumps(walker_list[0]))]:
+        walker_copy.move(Move(0, 5))
+        assert walker_copy.get_location() == (6.0, 2.0, 3.0)
+        assert np.array_equal(walker_population.get_positions()[0], [1, 2, 3])
+
+
+def test_gravity_matches_list(walker_list: List[Walker]) -> None:
+    grid = Grid()
+    expected = [
+        grid.get_gravity_effect(walker, walker_list).angle_and_radius()
+        for walker in walker_list
+    ]
+    walker_population = WalkerPopulation(walker_list)
+
+    for walker, angle_and_radius in zip(walker_list, expected):
+        assert np.allclose(
+            grid.get_gravity_effect(walker, walker_population).angle_and_radius(),
+            angle_and_radius,
+        )
+
+
+def test_slots(walker_list: List[Walker]) -> None:
+    with pytest.raises(AttributeError):
+        walker_list[0].extra = 1  # type: ignore[attr-defined]
@@ -0,0 +1,204 @@
+from custom_types import *
+import numpy as np
+from typing import Optional, Tuple
+
+
+class TrailBuffer:
+
+    __INITIAL_CAPACITY = 256
+    # the smallest budget, below it there is nothing left to decimate
+    MIN_BUDGET = 16
+
+    def __init__(self, budget: Optional[int] = None) -> None:
+        """
+        Initializes a TrailBuffer object, the points of a walker's trail.
+
+        The points are kept in a growable float32 array in the layout of an OpenGL
+        vertex buffer, so the screen uploads them as they are. The buffer remembers
+        which points were not uploaded yet, appending only adds to that range, so
+        every frame uploads the new points and not the whole trail. Growing doubles
+        the capacity, the screen reallocates its vertex buffer when it does.
+
+        With a budget the trail never holds more points than it. The recent points
+        are kept at full resolution, and the older ones are thinned to one point per
+        stride, keeping the point of every stride that strays the most so the
+        corners and the extent of the trail stay. When the old part fills half the
+        budget its stride doubles, so the whole history stays evenly covered.
+
+        A trail belongs to the render thread, the simulation threads hand their
+        steps over through a SnapshotRing.
+
+        Args:
+            budget (Optional[int], optional): The most points the trail holds, at least MIN_BUDGET. Defaults to None, which keeps every point.
+
+        Raises:
+            ValueError: If the budget is smaller than MIN_BUDGET.
+        """
+        if budget is not None and budget < self.MIN_BUDGET:
+            raise ValueError(f"the trail budget must be at least {self.MIN_BUDGET}")
+        self.__budget = budget
+        capacity = self.__INITIAL_CAPACITY if budget is None else min(
+            self.__INITIAL_CAPACITY, budget
+        )
+        self.__points = np.zeros((capacity, 3), np.float32)
+        self.__count = 0
+        # the first point that is not in the vertex buffer yet
+        self.__dirty_start = 0
+        # the points before old_count are decimated, each stands for about stride points
+        self.__old_count = 0
+        self.__stride = 1
+
+    def __len__(self) -> int:
+        """
+        Returns the amount of points in the trail.
+
+        Returns:
+            int: The amount of points.
+        """
+        return self.__count
+
+    def get_capacity(self) -> int:
+        """
+        Returns the amount of points the buffer holds before it grows.
+
+        Returns:
+            int: The capacity.
+        """
+        return len(self.__points)
+
+    def get_budget(self) -> Optional[int]:
+        """
+        Returns the most points the trail holds.
+
+        Returns:
+            Optional[int]: The budget, None if every point is kept.
+        """
+        return self.__budget
+
+    def set_budget(self, budget: Optional[int]) -> None:
+        """
+        Sets the most points the trail holds, decimating it at once if it holds more.
+
+        Args:
+            budget (Optional[int]): The budget, at least MIN_BUDGET, None to keep every point.
+
+        Raises:
+            ValueError: If the budget is smaller than MIN_BUDGET.
+        """
+        if budget is not None and budget < self.MIN_BUDGET:
+            raise ValueError(f"the trail budget must be at least {self.MIN_BUDGET}")
+        self.__budget = budget
+        while budget is not None and self.__count >= budget:
+            self.decimate()
+
+    def append(self, position: Types.vector3) -> None:
+        """
+        Adds a point to the end of the trail.
+
+        Args:
+            position (Types.vector3): The point.
+        """
+        if self.__budget is not None and self.__count >= self.__budget:
+            self.decimate()
+        elif self.__count == len(self.__points):
+            capacity = 2 * len(self.__points)
+            if self.__budget is not None:
+                capacity = min(capacity, self.__budget)
+            points = np.zeros((capacity, 3), np.float32)
+            points[: self.__count] = self.__points
+            self.__points = points
+        self.__points[self.__count] = position
+        self.__count += 1
+
+    def decimate(self) -> None:
+        """
+        Frees room in the trail by coarsening its older points.
+
+        The older half of the recent points joins the old part of the trail,
+        thinned to the stride of the old part. When the old part holds more than
+        half the budget, or the trail is still full, the old part is halved and
+        its stride doubles. The first point of the trail is always kept.
+        """
+        count = self.__count
+        points = self.__points[:count]
+        recent_count = count - self.__old_count
+        bucket = max(1, min(self.__stride, recent_count // 2))
+        moved_stop = self.__old_count + recent_count // 2 // bucket * bucket
+        old = np.concatenate(
+            [
+                points[: self.__old_count],
+                points[self._select(points, self.__old_count, moved_stop, bucket)],
+            ]
+        )
+        rest = points[moved_stop:]
+        budget = self.__budget if self.__budget is not None else count
+        while len(old) > 1 and (
+            len(old) > budget // 2 or len(old) + len(rest) >= budget
+        ):
+            paired = len(old) - len(old) % 2
+            kept = self._select(old, 0, paired, 2)
+            kept[0] = 0
+            old = np.concatenate([old[kept], old[paired:]])
+            self.__stride *= 2
+
+        decimated = np.zeros_like(self.__points)
+        decimated[: len(old)] = old
+        decimated[len(old) : len(old) + len(rest)] = rest
+        self.__points = decimated
+        self.__old_count = len(old)
+        self.__count = len(old) + len(rest)
+        # every point moved, the whole trail is uploaded again
+        self.__dirty_start = 0
+
+    @staticmethod
+    def _select(points: np.ndarray, start: int, stop: int, size: int) -> np.ndarray:
+        """
+        Picks a point of every bucket of consecutive points, the one farthest from
+        the middle of the points around the bucket, so the corners of the trail stay.
+
+        Args:
+            points (np.ndarray): The (n, 3) points.
+            start (int): The first point of the buckets.
+            stop (int): The end of the buckets, start plus a multiple of size.
+            size (int): The points in a bucket.
+
+        Returns:
+            np.ndarray: The index of the picked point of every bucket.
+        """
+        bucket_count = (stop - start) // size
+        indices = start + np.arange(bucket_count * size).reshape(bucket_count, size)
+        before = np.maximum(indices[:, 0] - 1, 0)
+        after = np.minimum(indices[:, -1] + 1, len(points) - 1)
+        middle = (points[before] + points[after]) / 2
+        deviation = np.linalg.norm(points[indices] - middle[:, np.newaxis], axis=2)
+        picked: np.ndarray = indices[np.arange(bucket_count), np.argmax(deviation, axis=1)]
+        return picked
+
+    def clear(self) -> None:
+        """
+        Removes all the points, keeping the capacity.
+        """
+        self.__count = 0
+        self.__dirty_start = 0
+        self.__old_count = 0
+        self.__stride = 1
+
+    def get_points(self) -> np.ndarray:
+        """
+        Returns the points of the trail.
+
+        Returns:
+            np.ndarray: A (len, 3) float32 view of the points.
+        """
+        return self.__points[: self.__count]
+
+    def take_dirty(self) -> Tuple[int, np.ndarray]:
+        """
+        Returns the points that were added since the last call, and marks them as uploaded.
+
+        Returns:
+            Tuple[int, np.ndarray]: The index of the first new point and a view of the new points.
+        """
+        start = min(self.__dirty_start, self.__count)
+        self.__dirty_start = self.__count
+        return start, self.__points[start : self.__count]
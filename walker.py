@@ -2,15 +2,36 @@ from abc import ABC, abstractmethod
 from move import Move
 from custom_types import *
 from math_functions import MathFunctions
-from typing import Tuple
+import numpy as np
+from typing import List, Tuple, Union
+
+# the (yaw, radius, pitch) arrays of a block of moves
+MoveArrays = Tuple[np.ndarray, np.ndarray, np.ndarray]
 
 
 class Walker(ABC):
 
+    __slots__ = [
+        "_name",
+        "_is_3d",
+        "_rng",
+        "_position",
+        "_mass_cell",
+        "_step_cell",
+        "_planned_moves",
+    ]
+
+    # the amount of moves a vectorizable walker draws at once
+    MOVE_BLOCK = 64
+
     def __init__(self, name: str, mass: float = 1) -> None:
         """
         Initialize a Walker object.
 
+        The position, mass and step counter live in small arrays, which a
+        WalkerPopulation replaces with views into its own arrays, so moves are
+        written in place.
+
         Args:
             name (str): The name of the walker.
             mass (float, optional): The mass of the walker. Defaults to 1.
@@ -18,10 +39,60 @@ class Walker(ABC):
         super().__init__()
 
         self._name = name
-        self._mass = mass
-
-        self._location = (0.0, 0.0, 0.0)
+        self._position = np.zeros(3, np.float64)
+        self._mass_cell = np.array([mass], np.float64)
+        self._step_cell = np.zeros(1, np.int64)
         self._is_3d: bool
+        # the walker's own random stream, replaced per repetition by the simulation
+        self._rng = np.random.default_rng()
+        # the moves drawn ahead by get_move and the step counter after each, the next one last
+        self._planned_moves: List[Tuple[float, float, float, int]] = []
+
+    @property
+    def _location(self) -> Types.vector3:
+        """
+        The location of the walker as a tuple.
+
+        Returns:
+            Types.vector3: The location.
+        """
+        return Types.cast_to_vector3(tuple(self._position.tolist()))
+
+    @_location.setter
+    def _location(self, location: Types.vector3) -> None:
+        self._position[:] = location
+
+    @property
+    def _step(self) -> int:
+        """
+        The step counter of the walkers that track their steps.
+
+        Returns:
+            int: The step.
+        """
+        return int(self._step_cell[0])
+
+    @_step.setter
+    def _step(self, step: int) -> None:
+        self._step_cell[0] = step
+
+    def bind(
+        self, position: np.ndarray, mass_cell: np.ndarray, step_cell: np.ndarray
+    ) -> None:
+        """
+        Moves the walker's state into the given array views.
+
+        Args:
+            position (np.ndarray): A (3,) view for the position.
+            mass_cell (np.ndarray): A (1,) view for the mass.
+            step_cell (np.ndarray): A (1,) view for the step counter.
+        """
+        position[:] = self._position
+        mass_cell[:] = self._mass_cell
+        step_cell[:] = self._step_cell
+        self._position = position
+        self._mass_cell = mass_cell
+        self._step_cell = step_cell
 
     @abstractmethod
     def _generate_move_radius(self) -> float:
@@ -47,12 +118,96 @@ class Walker(ABC):
         """
         Generates a random move for the walker.
 
+        A vectorizable walker draws its moves MOVE_BLOCK at a time with get_moves,
+        like the batch engine does, so a seeded stream gives the same moves in both.
+
         Returns:
             Move: A Move object representing the generated move.
         """
+        if self.is_vectorizable():
+            if not self._planned_moves:
+                first_step = self._step
+                yaw, radius, pitch = self.get_moves(self.MOVE_BLOCK)
+                # the step counter advances with the moves that are taken
+                steps = np.linspace(first_step, self._step, self.MOVE_BLOCK + 1)[1:]
+                self._planned_moves = list(
+                    zip(
+                        yaw[::-1, 0].tolist(),
+                        radius[::-1, 0].tolist(),
+                        pitch[::-1, 0].tolist(),
+                        steps[::-1].astype(np.int64).tolist(),
+                    )
+                )
+            move = self._planned_moves.pop()
+            self._step = move[3]
+            return Move(move[0], move[1], move[2])
         angle = self._generate_move_angle()
         return Move(angle[0], self._generate_move_radius(), angle[1])
 
+    def _generate_moves(self, steps: int, batch: int) -> MoveArrays:
+        """
+        Generates a block of moves, one get_move call at a time.
+
+        Subclasses override it with a vectorized version.
+
+        Args:
+            steps (int): The amount of steps.
+            batch (int): The amount of moves in each step.
+
+        Returns:
+            MoveArrays: The (steps, batch) yaw, radius and pitch arrays.
+        """
+        moves = np.empty((3, steps, batch), np.float64)
+        for step in range(steps):
+            for index in range(batch):
+                moves[:, step, index] = self.get_move().angle_and_radius()
+        return moves[0], moves[1], moves[2]
+
+    def get_moves(self, steps: int, batch: int = 1) -> MoveArrays:
+        """
+        Generates the moves of many steps at once.
+
+        The walker's step state advances by steps, every column of a step is an
+        independent draw of the same step. The streams are only reproduced by
+        drawing the same blocks, get_move and the batch engine draw MOVE_BLOCK steps.
+
+        Args:
+            steps (int): The amount of steps.
+            batch (int, optional): The amount of moves in each step. Defaults to 1.
+
+        Returns:
+            MoveArrays: The (steps, batch) yaw, radius and pitch arrays, in the order of Move.angle_and_radius.
+        """
+        return self._generate_moves(steps, batch)
+
+    def is_vectorizable(self) -> bool:
+        """
+        Returns True if the walker generates its moves in bulk and they don't depend on its location.
+
+        Returns:
+            bool: Can the moves be generated ahead of time.
+        """
+        return type(self)._generate_moves is not Walker._generate_moves
+
+    def set_rng(self, rng: np.random.Generator) -> None:
+        """
+        Sets the random generator the walker draws its moves from.
+
+        Args:
+            rng (np.random.Generator): The generator.
+        """
+        self._rng = rng
+        self._planned_moves = []
+
+    def get_rng(self) -> np.random.Generator:
+        """
+        Returns the random generator the walker draws its moves from.
+
+        Returns:
+            np.random.Generator: The generator.
+        """
+        return self._rng
+
     def get_name(self) -> str:
         """
         Returns the name of the walker.
@@ -69,7 +224,7 @@ class Walker(ABC):
         Returns:
             float: The mass of the walker.
         """
-        return self._mass
+        return float(self._mass_cell[0])
 
     def is_3d(self) -> bool:
         """
@@ -83,11 +238,32 @@ class Walker(ABC):
     def get_location(self) -> Types.vector3:
         return self._location
 
+    def get_position(self) -> np.ndarray:
+        """
+        Returns the array holding the walker's position, written in place by the moves.
+
+        Returns:
+            np.ndarray: The (3,) position.
+        """
+        return self._position
+
     def move(self, move: Move) -> None:
-        self._location = MathFunctions.add_move(self._location, move)
+        self._position += MathFunctions.vector_from_angle_and_radius(
+            *move.angle_and_radius()
+        )
+
+    def translate(self, vector: Union[Types.vector3, np.ndarray]) -> None:
+        """
+        Moves the walker by a vector, in place.
+
+        Args:
+            vector (Union[Types.vector3, np.ndarray]): The (3,) vector.
+        """
+        self._position += vector
 
-    def move_to(self, location: Types.vector3) -> None:
-        self._location = location
+    def move_to(self, location: Union[Types.vector3, np.ndarray]) -> None:
+        self._position[:] = location
 
     def reset(self) -> None:
-        self._location = (0, 0, 0)
+        self._position[:] = 0
+        self._planned_moves = []
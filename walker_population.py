@@ -0,0 +1,120 @@
+from walker import Walker
+import numpy as np
+from typing import Dict, Iterator, List, Sequence, overload
+
+
+class WalkerPopulation(Sequence[Walker]):
+
+    def __init__(self, walker_list: Sequence[Walker]) -> None:
+        """
+        Initializes a WalkerPopulation object.
+
+        Keeps the positions, masses and step counters of a group of walkers in
+        preallocated arrays. Every walker is bound to its row, so the walkers only
+        hold views and their moves are written straight into the arrays, and the
+        population's gravity reads them without gathering the locations.
+
+        A population is a sequence of its walkers, so it can be passed anywhere a
+        walker list is expected.
+
+        Args:
+            walker_list (Sequence[Walker]): The walkers, each can only be in one population.
+        """
+        self.__walkers: List[Walker] = list(walker_list)
+        self.__indices: Dict[Walker, int] = {
+            walker: index for index, walker in enumerate(self.__walkers)
+        }
+        count = len(self.__walkers)
+        self.__positions = np.zeros((count, 3), np.float64)
+        self.__masses = np.zeros(count, np.float64)
+        self.__steps = np.zeros(count, np.int64)
+        for index, walker in enumerate(self.__walkers):
+            walker.bind(
+                self.__positions[index],
+                self.__masses[index : index + 1],
+                self.__steps[index : index + 1],
+            )
+
+    @overload
+    def __getitem__(self, index: int) -> Walker: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[Walker]: ...
+
+    def __getitem__(self, index):  # type: ignore[no-untyped-def]
+        """
+        Returns a walker, or a list of walkers for a slice.
+
+        Args:
+            index (Union[int, slice]): The index.
+
+        Returns:
+            Union[Walker, Sequence[Walker]]: The walker or walkers.
+        """
+        return self.__walkers[index]
+
+    def __len__(self) -> int:
+        """
+        Returns the amount of walkers.
+
+        Returns:
+            int: The amount of walkers.
+        """
+        return len(self.__walkers)
+
+    def __iter__(self) -> Iterator[Walker]:
+        """
+        Iterates over the walkers.
+
+        Returns:
+            Iterator[Walker]: The walkers, in order.
+        """
+        return iter(self.__walkers)
+
+    def index_of(self, walker: Walker) -> int:
+        """
+        Returns the row of a walker in the arrays.
+
+        Args:
+            walker (Walker): The walker.
+
+        Returns:
+            int: The row.
+        """
+        return self.__indices[walker]
+
+    def get_positions(self) -> np.ndarray:
+        """
+        Returns the positions of the walkers.
+
+        Returns:
+            np.ndarray: The (n, 3) positions, shared with the walkers.
+        """
+        return self.__positions
+
+    def get_masses(self) -> np.ndarray:
+        """
+        Returns the masses of the walkers.
+
+        Returns:
+            np.ndarray: The (n,) masses, shared with the walkers.
+        """
+        return self.__masses
+
+    def get_steps(self) -> np.ndarray:
+        """
+        Returns the step counters of the walkers.
+
+        Returns:
+            np.ndarray: The (n,) step counters, shared with the walkers.
+        """
+        return self.__steps
+
+    def get_total_mass(self) -> float:
+        """
+        Returns the total mass of the walkers.
+
+        Returns:
+            float: The total mass.
+        """
+        return float(self.__masses.sum())